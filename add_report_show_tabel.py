@@ -20,6 +20,7 @@ from qgis.PyQt import QtWidgets
 from qgis.gui import QgsFileWidget
 import pandas as pd
 import numpy as np
+import codecs
 import os
 
 swmm_layer = QgsProject.instance().mapLayer('[% @layer_id %]')
@@ -370,25 +371,61 @@ def get_rpt_df(topic, readfile):
         return(pd.DataFrame())
 
 
-def get_rpt_txt(readfile):
-    # open file with different encodings
-    encodings = [
-        'utf-8',
-        'windows-1250',
-        'windows-1252'
-    ]  # add more?
-    for e in encodings:
+# candidate encodings in the order of preference
+def_encodings = ('utf-8', 'windows-1250', 'windows-1252')
+
+
+def get_file_encoding(file_path, encodings=def_encodings, sample_size=2**16):
+    """
+    detects the encoding of a text file from a sample at the beginning
+    of the file; the first candidate which decodes the sample is returned
+    (same as get_file_encoding in g_s_inp_sections.py)
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size)
+    # a character may be cut at the end of the sample
+    is_whole_file = os.path.getsize(file_path) <= sample_size
+    for encoding in encodings:
         try:
-            with open(readfile, 'r', encoding=e) as f:
-                rpt_text = f.readlines()
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=is_whole_file)
         except UnicodeDecodeError:
-            pass
-        else:
-            break
-    rpt_text = [x for x in rpt_text if x != '\n']
-    rpt_text = [x for x in rpt_text if x != '\r']
-    rpt_text = [x.strip() for x in rpt_text]
-    rpt_text = [x for x in rpt_text if len(x)>0]
+            continue
+        return encoding
+    return None
+
+
+def get_next_encoding(encoding, encodings=def_encodings):
+    """
+    returns the candidate after encoding or None
+    (same as get_next_encoding in g_s_inp_sections.py)
+    """
+    if encoding not in encodings:
+        return None
+    encoding_pos = encodings.index(encoding)
+    if encoding_pos + 1 == len(encodings):
+        return None
+    return encodings[encoding_pos + 1]
+
+
+def get_rpt_txt(readfile):
+    # the encoding is detected from the beginning of the file; if a later
+    # line can not be decoded, the next candidate is used from there on
+    rpt_encoding = get_file_encoding(readfile)
+    if rpt_encoding is None:
+        raise ValueError('The encoding of the report file could not be detected')
+    rpt_text = []
+    with open(readfile, 'rb') as f:
+        for rpt_line in f:
+            while True:
+                try:
+                    rpt_line_text = rpt_line.decode(rpt_encoding).strip()
+                    break
+                except UnicodeDecodeError:
+                    rpt_encoding = get_next_encoding(rpt_encoding)
+                    if rpt_encoding is None:
+                        raise
+            if len(rpt_line_text) > 0:
+                rpt_text.append(rpt_line_text)
     # delete last three lines of the file (information on start and end time)
     rpt_text = rpt_text[:-3]
     return rpt_text
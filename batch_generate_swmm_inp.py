@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ GenerateSwmmInp
+                                 A QGIS plugin
+ This plugin generates SWMM Input files
+ Generated by Plugin Builder: http://g-sherman.github.io/Qgis-Plugin-Builder/
+                              -------------------
+        begin                : 2021-07-09
+        copyright            : (C) 2023 by Jannik Schilling
+        email                : jannik.schilling@posteo.de
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+
+Generates several swmm input files without the QGIS user interface.
+The layers and tables of every model variant are listed in a json manifest
+(paths relative to the manifest file):
+{
+    "defaults": {
+        "FILE_OPTIONS": "tables/gen_swmm_options.xlsx"
+    },
+    "variants": [
+        {
+            "name": "scenario_1",
+            "QGIS_OUT_INP_FILE": "out/scenario_1.inp",
+            "FILE_CONDUITS": "layers/conduits.gpkg|layername=conduits",
+            "FILE_JUNCTIONS": "layers/junctions.shp"
+        }
+    ]
+}
+The keys are the parameter names of GenerateSwmmInpFile. Usage (from the
+QGIS plugins directory, with the QGIS python paths set):
+    python -m generate_swmm_inp.batch_generate_swmm_inp manifest.json --workers 8
+"""
+
+__author__ = 'Jannik Schilling'
+__date__ = '2023-05-09'
+__copyright__ = '(C) 2023 by Jannik Schilling'
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from qgis.core import (
+    QgsApplication,
+    QgsProcessingContext,
+    QgsProcessingFeedback
+)
+from .generate_swmm_inp_file import GenerateSwmmInpFile
+
+# parameters of GenerateSwmmInpFile which are paths
+def_path_params = [
+    v for k, v in vars(GenerateSwmmInpFile).items()
+    if k.startswith('FILE_') or k == 'QGIS_OUT_INP_FILE'
+]
+def_other_params = [
+    GenerateSwmmInpFile.LOAD_CONCURRENTLY,
+    GenerateSwmmInpFile.USE_SECTION_CACHE
+]
+
+# QgsApplication of the worker process
+qgis_app = None
+
+
+class BatchFeedback(QgsProcessingFeedback):
+    """
+    collects warnings and errors of a variant
+    """
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def pushWarning(self, warning):
+        self.messages.append(warning)
+
+    def reportError(self, error, fatalError=False):
+        self.messages.append(error)
+
+
+def init_qgis_worker(prefix_path):
+    """
+    initializes QGIS without user interface in a worker process
+    :param str prefix_path: QGIS installation path
+    """
+    global qgis_app
+    if prefix_path:
+        QgsApplication.setPrefixPath(prefix_path, True)
+    qgis_app = QgsApplication([], False)
+    qgis_app.initQgis()
+
+
+def resolve_path(path_str, base_dir):
+    """
+    makes a path relative to the manifest absolute; layer options
+    like '|layername=...' are kept
+    :param str path_str
+    :param str base_dir
+    :return: str
+    """
+    path_parts = path_str.split('|', 1)
+    path_parts[0] = os.path.join(base_dir, os.path.expanduser(path_parts[0]))
+    return '|'.join(path_parts)
+
+
+def read_manifest(manifest_file):
+    """
+    reads the variants from the manifest and checks the parameter names
+    :param str manifest_file
+    :return: list of dicts {'name': str, 'parameters': dict}
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_file))
+    with open(manifest_file, encoding='utf-8') as f:
+        manifest = json.load(f)
+    defaults = manifest.get('defaults', {})
+    variants_list = []
+    for v_i, variant in enumerate(manifest.get('variants', [])):
+        variant_params = dict(defaults)
+        variant_params.update(variant)
+        variant_name = str(variant_params.pop('name', 'variant_' + str(v_i + 1)))
+        unknown_params = [
+            p for p in variant_params.keys()
+            if p not in def_path_params + def_other_params
+        ]
+        if len(unknown_params) > 0:
+            raise ValueError(
+                'Unknown parameters in variant ' + variant_name
+                + ': ' + ', '.join(unknown_params)
+            )
+        if GenerateSwmmInpFile.QGIS_OUT_INP_FILE not in variant_params.keys():
+            raise ValueError(
+                'No ' + GenerateSwmmInpFile.QGIS_OUT_INP_FILE
+                + ' in variant ' + variant_name
+            )
+        variant_params = {
+            p: resolve_path(v, base_dir) if p in def_path_params and v else v
+            for p, v in variant_params.items()
+        }
+        variants_list.append({'name': variant_name, 'parameters': variant_params})
+    return variants_list
+
+
+def run_variant(variant_name, variant_params):
+    """
+    writes the inp file of one variant
+    :param str variant_name
+    :param dict variant_params
+    :return: dict
+    """
+    start_time = time.perf_counter()
+    out_dir = os.path.dirname(variant_params[GenerateSwmmInpFile.QGIS_OUT_INP_FILE])
+    if out_dir != '':
+        os.makedirs(out_dir, exist_ok=True)
+    alg = GenerateSwmmInpFile().create()
+    context = QgsProcessingContext()
+    feedback = BatchFeedback()
+    try:
+        results, success = alg.run(variant_params, context, feedback)
+    except Exception as e:
+        success = False
+        feedback.messages.append(str(e))
+    return {
+        'name': variant_name,
+        'success': bool(success),
+        'inp_file': variant_params[GenerateSwmmInpFile.QGIS_OUT_INP_FILE],
+        'seconds': round(time.perf_counter() - start_time, 3),
+        'messages': feedback.messages
+    }
+
+
+def run_batch(variants_list, n_workers, prefix_path=None):
+    """
+    writes the inp files of all variants in a process pool;
+    every worker initializes its own QGIS application
+    :param list variants_list
+    :param int n_workers
+    :param str prefix_path
+    :return: list of dicts
+    """
+    results_list = []
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=init_qgis_worker,
+        initargs=(prefix_path,)
+    ) as executor:
+        futures_list = [
+            executor.submit(run_variant, v['name'], v['parameters'])
+            for v in variants_list
+        ]
+        for future in as_completed(futures_list):
+            variant_result = future.result()
+            print(
+                ('OK     ' if variant_result['success'] else 'FAILED ')
+                + variant_result['name'] + ' ('
+                + str(variant_result['seconds']) + ' s)'
+            )
+            for msg in variant_result['messages']:
+                print('    ' + msg)
+            results_list.append(variant_result)
+    return results_list
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Generates swmm input files for all variants in a manifest'
+    )
+    parser.add_argument('manifest', help='json file with the model variants')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='number of worker processes'
+    )
+    parser.add_argument(
+        '--qgis-prefix',
+        default=os.environ.get('QGIS_PREFIX_PATH', ''),
+        help='QGIS installation path (default: $QGIS_PREFIX_PATH)'
+    )
+    parser.add_argument(
+        '--summary',
+        default='',
+        help='optional json file for the results of all variants'
+    )
+    args = parser.parse_args(argv)
+    variants_list = read_manifest(args.manifest)
+    if len(variants_list) == 0:
+        print('No variants in ' + args.manifest)
+        return 0
+    results_list = run_batch(
+        variants_list,
+        max(1, min(args.workers, len(variants_list))),
+        args.qgis_prefix
+    )
+    if args.summary != '':
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(results_list, f, indent=2)
+    n_failed = len([r for r in results_list if not r['success']])
+    print(str(len(results_list) - n_failed) + ' of ' + str(len(results_list)) + ' inp files written')
+    return 1 if n_failed > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
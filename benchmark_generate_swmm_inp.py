@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ GenerateSwmmInp
+                                 A QGIS plugin
+ This plugin generates SWMM Input files
+ Generated by Plugin Builder: http://g-sherman.github.io/Qgis-Plugin-Builder/
+                              -------------------
+        begin                : 2021-07-09
+        copyright            : (C) 2023 by Jannik Schilling
+        email                : jannik.schilling@posteo.de
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+
+Measures how GenerateSwmmInpFile scales with the network size.
+Synthetic networks (a chain of junctions with one conduit and one
+subcatchment per junction, an outfall, a rain gage and a rain time series)
+are written as geopackages and tables into a temporary folder. Every run
+is timed per stage (reading layers, reading tables, preparing sections,
+writing the inp file) and per section; the results are saved as json.
+Usage (from the QGIS plugins directory, with the QGIS python paths set):
+    python -m generate_swmm_inp.benchmark_generate_swmm_inp --junctions 1000 10000 --output results.json
+"""
+
+__author__ = 'Jannik Schilling'
+__date__ = '2023-05-09'
+__copyright__ = '(C) 2023 by Jannik Schilling'
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from qgis.core import (
+    Qgis,
+    QgsGeometry,
+    QgsPointXY,
+    QgsProcessingContext
+)
+from .batch_generate_swmm_inp import BatchFeedback, init_qgis_worker
+from .g_s_defaults import (
+    def_layer_names_dict,
+    def_ogr_driver_names,
+    def_qgis_fields_dict,
+    def_tables_dict
+)
+from .g_s_read_write_data import create_layer_from_df, dict_to_excel
+from .generate_swmm_inp_file import GenerateSwmmInpFile
+
+# progress values of GenerateSwmmInpFile at the end of each stage
+def_stage_progress = {
+    'read_layers': 12,
+    'read_tables': 20,
+    'build_sections': 80,
+    'write_inp': 98
+}
+
+# layer parameters of GenerateSwmmInpFile
+def_layer_params = {
+    'RAINGAGES': GenerateSwmmInpFile.FILE_RAINGAGES,
+    'SUBCATCHMENTS': GenerateSwmmInpFile.FILE_SUBCATCHMENTS,
+    'JUNCTIONS': GenerateSwmmInpFile.FILE_JUNCTIONS,
+    'OUTFALLS': GenerateSwmmInpFile.FILE_OUTFALLS,
+    'CONDUITS': GenerateSwmmInpFile.FILE_CONDUITS
+}
+
+
+class TimingFeedback(BatchFeedback):
+    """
+    records the time of every progress step and progress text
+    """
+    def __init__(self):
+        super().__init__()
+        self.start_time = time.perf_counter()
+        self.progress_times = {0: self.start_time}
+        self.text_times = []
+
+    def setProgress(self, progress):
+        self.progress_times[int(progress)] = time.perf_counter()
+        super().setProgress(progress)
+
+    def setProgressText(self, text):
+        self.text_times.append((text, time.perf_counter()))
+        super().setProgressText(text)
+
+    def get_stage_times(self):
+        """
+        :return: dict {stage: seconds}
+        """
+        stage_times = {}
+        last_time = self.start_time
+        for stage, progress in def_stage_progress.items():
+            stage_end = self.progress_times.get(progress, np.nan)
+            stage_times[stage] = round(stage_end - last_time, 4)
+            last_time = stage_end
+        return stage_times
+
+    def get_text_times(self):
+        """
+        time from one progress text to the next one, e.g. for sections
+        :return: dict {text: seconds}
+        """
+        text_times = {}
+        for (text, t_start), (_, t_end) in zip(self.text_times[:-1], self.text_times[1:]):
+            if text.startswith('[') or text.startswith('writing'):
+                text_times[text] = round(t_end - t_start, 4)
+        return text_times
+
+
+def create_synthetic_network(
+    n_junctions,
+    n_ts_rows,
+    n_vertices=3,
+    spacing=50.0
+):
+    """
+    creates the data of a synthetic network: a chain of junctions on a
+    grid, one conduit and one subcatchment per junction, one outfall and a
+    rain gage with a rain time series
+    :param int n_junctions
+    :param int n_ts_rows: number of rows in the time series table
+    :param int n_vertices: inner vertices per conduit
+    :param float spacing: distance between junctions
+    :return: tuple (dict of layer data, dict of table data)
+    """
+    def get_section_df(section_name, data_dict):
+        """
+        adds all missing fields of the section (NULL)
+        :param str section_name
+        :param dict data_dict
+        """
+        section_df = pd.DataFrame(data_dict)
+        for col in def_qgis_fields_dict[section_name].keys():
+            if col not in section_df.columns:
+                section_df[col] = None
+        return section_df[list(def_qgis_fields_dict[section_name].keys()) + ['geometry']]
+
+    grid_width = int(np.ceil(np.sqrt(n_junctions)))
+    j_idx = np.arange(n_junctions)
+    j_row = j_idx // grid_width
+    # snake pattern: every second row in reverse direction
+    j_col = np.where(j_row % 2 == 0, j_idx % grid_width, grid_width - 1 - j_idx % grid_width)
+    j_x = j_col * spacing
+    j_y = j_row * spacing
+    j_names = ['J' + str(i) for i in j_idx]
+    j_elev = 100.0 - j_idx * 0.01
+    o_x = j_x[-1] + spacing
+    o_y = j_y[-1]
+    layers_dict = {}
+    layers_dict['JUNCTIONS'] = get_section_df('JUNCTIONS', {
+        'Name': j_names,
+        'Elevation': j_elev,
+        'MaxDepth': 3.0,
+        'InitDepth': 0.0,
+        'SurDepth': 0.0,
+        'Aponded': 0.0,
+        'geometry': [QgsGeometry.fromPointXY(QgsPointXY(x, y)) for x, y in zip(j_x, j_y)]
+    })
+    layers_dict['OUTFALLS'] = get_section_df('OUTFALLS', {
+        'Name': ['Out1'],
+        'Elevation': [j_elev[-1] - 0.5],
+        'Type': ['FREE'],
+        'FlapGate': ['NO'],
+        'geometry': [QgsGeometry.fromPointXY(QgsPointXY(o_x, o_y))]
+    })
+    to_nodes = j_names[1:] + ['Out1']
+    to_x = np.append(j_x[1:], o_x)
+    to_y = np.append(j_y[1:], o_y)
+    vert_shares = np.arange(1, n_vertices + 1) / (n_vertices + 1)
+    layers_dict['CONDUITS'] = get_section_df('CONDUITS', {
+        'Name': ['C' + str(i) for i in j_idx],
+        'FromNode': j_names,
+        'ToNode': to_nodes,
+        'Length': spacing,
+        'Roughness': 0.013,
+        'InOffset': 0.0,
+        'OutOffset': 0.0,
+        'InitFlow': 0.0,
+        'MaxFlow': 0.0,
+        'Shape': 'CIRCULAR',
+        'Geom1': 0.5,
+        'Geom2': 0.0,
+        'Geom3': 0.0,
+        'Geom4': 0.0,
+        'Barrels': 1,
+        'Kentry': 0.0,
+        'Kexit': 0.0,
+        'Kavg': 0.0,
+        'FlapGate': 'NO',
+        'Seepage': 0.0,
+        'geometry': [
+            QgsGeometry.fromPolylineXY(
+                [QgsPointXY(x0, y0)]
+                + [QgsPointXY(x0 + (x1 - x0) * s, y0 + (y1 - y0) * s + 1.0) for s in vert_shares]
+                + [QgsPointXY(x1, y1)]
+            ) for x0, y0, x1, y1 in zip(j_x, j_y, to_x, to_y)
+        ]
+    })
+    half_size = spacing * 0.4
+    layers_dict['SUBCATCHMENTS'] = get_section_df('SUBCATCHMENTS', {
+        'Name': ['S' + str(i) for i in j_idx],
+        'RainGage': 'RG1',
+        'Outlet': j_names,
+        'Area': (2 * half_size) ** 2 / 10000,
+        'Imperv': 50.0,
+        'Width': 2 * half_size,
+        'Slope': 0.5,
+        'CurbLen': 0.0,
+        'N_Imperv': 0.01,
+        'N_Perv': 0.1,
+        'S_Imperv': 0.05,
+        'S_Perv': 0.05,
+        'PctZero': 25.0,
+        'RouteTo': 'OUTLET',
+        'PctRouted': 100.0,
+        'InfMethod': 'HORTON',
+        'MaxRate': 3.0,
+        'MinRate': 0.5,
+        'Decay': 4.0,
+        'DryTime': 7.0,
+        'MaxInf': 0.0,
+        'geometry': [
+            QgsGeometry.fromPolygonXY([[
+                QgsPointXY(x + half_size, y + half_size),
+                QgsPointXY(x + 3 * half_size, y + half_size),
+                QgsPointXY(x + 3 * half_size, y + 3 * half_size),
+                QgsPointXY(x + half_size, y + 3 * half_size),
+                QgsPointXY(x + half_size, y + half_size)
+            ]]) for x, y in zip(j_x, j_y)
+        ]
+    })
+    layers_dict['RAINGAGES'] = get_section_df('RAINGAGES', {
+        'Name': ['RG1'],
+        'Format': ['INTENSITY'],
+        'Interval': ['0:05'],
+        'SCF': [1.0],
+        'DataSource': ['TIMESERIES'],
+        'SeriesName': ['TS1'],
+        'geometry': [QgsGeometry.fromPointXY(QgsPointXY(-spacing, -spacing))]
+    })
+
+    # tables
+    ts_times = pd.Timestamp('2023-01-01') + pd.to_timedelta(np.arange(n_ts_rows) * 5, unit='min')
+    tables_dict = {
+        'OPTIONS': {
+            'OPTIONS': pd.DataFrame({
+                'Option': ['FLOW_UNITS', 'INFILTRATION', 'FLOW_ROUTING'],
+                'Value': ['CMS', 'HORTON', 'DYNWAVE']
+            })
+        },
+        'TIMESERIES': {
+            'TIMESERIES': pd.DataFrame({
+                'Name': 'TS1',
+                'Date': ts_times.strftime('%Y-%m-%d'),
+                'Time': ts_times.strftime('%H:%M'),
+                'Value': np.round(np.abs(np.sin(np.arange(n_ts_rows) / 50.0)) * 20, 3),
+                'File_Name': None
+            })
+        }
+    }
+    return layers_dict, tables_dict
+
+
+def write_synthetic_network(layers_dict, tables_dict, folder_save, feedback):
+    """
+    writes the synthetic layers (geopackage) and tables (xlsx) into folder_save
+    :param dict layers_dict
+    :param dict tables_dict
+    :param str folder_save
+    :param QgsProcessingFeedback feedback
+    :return: dict of parameters for GenerateSwmmInpFile
+    """
+    gpkg_driver_num = def_ogr_driver_names.index('GPKG')
+    params_dict = {}
+    for section_name, section_df in layers_dict.items():
+        create_layer_from_df(
+            {'data': section_df, 'layer_name': def_layer_names_dict[section_name]},
+            section_name,
+            'EPSG:25833',
+            folder_save,
+            gpkg_driver_num,
+            feedback
+        )
+        params_dict[def_layer_params[section_name]] = os.path.join(
+            folder_save,
+            def_layer_names_dict[section_name] + '.gpkg'
+        )
+    for file_key, table_dict in tables_dict.items():
+        dict_to_excel(table_dict, file_key, folder_save, feedback, desired_format='.xlsx')
+        params_dict['FILE_' + file_key] = os.path.join(
+            folder_save,
+            def_tables_dict[file_key]['filename'] + '.xlsx'
+        )
+    return params_dict
+
+
+def run_benchmark(
+    junctions_list,
+    n_ts_rows,
+    n_vertices,
+    n_repeats
+):
+    """
+    times GenerateSwmmInpFile for synthetic networks of different sizes
+    :param list junctions_list: number of junctions per network
+    :param int n_ts_rows
+    :param int n_vertices
+    :param int n_repeats
+    :return: list of dicts
+    """
+    results_list = []
+    for n_junctions in junctions_list:
+        with tempfile.TemporaryDirectory() as folder_save:
+            feedback = BatchFeedback()
+            layers_dict, tables_dict = create_synthetic_network(
+                n_junctions,
+                n_ts_rows,
+                n_vertices
+            )
+            params_dict = write_synthetic_network(
+                layers_dict,
+                tables_dict,
+                folder_save,
+                feedback
+            )
+            inp_file = os.path.join(folder_save, 'benchmark.inp')
+            params_dict[GenerateSwmmInpFile.QGIS_OUT_INP_FILE] = inp_file
+            for repeat in range(n_repeats):
+                alg = GenerateSwmmInpFile().create()
+                timing_feedback = TimingFeedback()
+                results, success = alg.run(
+                    params_dict,
+                    QgsProcessingContext(),
+                    timing_feedback
+                )
+                run_result = {
+                    'junctions': n_junctions,
+                    'conduits': n_junctions,
+                    'subcatchments': n_junctions,
+                    'vertices_per_conduit': n_vertices,
+                    'timeseries_rows': n_ts_rows,
+                    'repeat': repeat,
+                    'success': bool(success),
+                    'total': round(time.perf_counter() - timing_feedback.start_time, 4),
+                    'stages': timing_feedback.get_stage_times(),
+                    'sections': timing_feedback.get_text_times(),
+                    'inp_file_bytes': os.path.getsize(inp_file) if success else 0,
+                    'messages': timing_feedback.messages
+                }
+                print(
+                    str(n_junctions) + ' junctions, run ' + str(repeat + 1) + ': '
+                    + ', '.join([k + ' ' + str(v) + ' s' for k, v in run_result['stages'].items()])
+                )
+                results_list.append(run_result)
+    return results_list
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Times the export of synthetic networks to swmm input files'
+    )
+    parser.add_argument(
+        '--junctions',
+        type=int,
+        nargs='+',
+        default=[1000, 10000],
+        help='network sizes (number of junctions, conduits and subcatchments)'
+    )
+    parser.add_argument('--timeseries-rows', type=int, default=10000)
+    parser.add_argument('--vertices', type=int, default=3, help='inner vertices per conduit')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument(
+        '--qgis-prefix',
+        default=os.environ.get('QGIS_PREFIX_PATH', ''),
+        help='QGIS installation path (default: $QGIS_PREFIX_PATH)'
+    )
+    args = parser.parse_args(argv)
+    init_qgis_worker(args.qgis_prefix)
+    metadata_file = os.path.join(os.path.dirname(__file__), 'metadata.txt')
+    with open(metadata_file, encoding='utf-8') as f:
+        plugin_version = [l.split('=', 1)[1].strip() for l in f if l.startswith('version=')]
+    results_list = run_benchmark(
+        args.junctions,
+        args.timeseries_rows,
+        args.vertices,
+        args.repeats
+    )
+    benchmark_dict = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'plugin_version': plugin_version[0] if len(plugin_version) > 0 else '',
+        'qgis_version': Qgis.version(),
+        'python_version': platform.python_version(),
+        'pandas_version': pd.__version__,
+        'numpy_version': np.__version__,
+        'machine': platform.platform(),
+        'results': results_list
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(benchmark_dict, f, indent=2)
+    print('results saved in ' + args.output)
+    return 0 if all(r['success'] for r in results_list) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -27,7 +27,11 @@ __copyright__ = '(C) 2023 by Jannik Schilling'
 import pandas as pd
 import numpy as np
 import copy
+import multiprocessing
 import os
+import sys
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from qgis.PyQt.QtGui import QColor
 from qgis.core import (
@@ -47,6 +51,11 @@ from .g_s_defaults import (
     ImportDataStatus,
     st_files_path
 )
+from .g_s_inp_sections import (
+    get_next_encoding,
+    index_inp_sections,
+    split_section_spans
+)
 from .g_s_nodes import (
     create_points_df,
     get_storages_from_inp,
@@ -284,38 +293,6 @@ def build_df_from_vals_list(section_vals, col_names):
     return df
 
 
-def concat_quoted_vals(text_line):
-    """
-    finds quoted text and cocatenates text strings if
-    they have been separated by whitespace or other separators
-    """
-    if any([x.startswith('"') for x in text_line]):  # any quoted elements
-        text_line_new = []
-        i = 0
-        quoted_elem = 0  # set not quoted
-        for t_l in text_line:
-            if quoted_elem == 0:  # is not quoted
-                text_line_new = text_line_new + [[t_l]]
-                if t_l.startswith('"'):
-                    quoted_elem = 1  # set quoted
-                    # t_l is not '"' and fully quoted (e.g. '"test"')
-                    if len(t_l) > 1 and t_l.endswith('"'):  
-                        quoted_elem = 0  # set not quoted again
-                        i += 1
-                else:
-                    i += 1
-            else:  # is quoted and has been separated
-                text_line_new[i] = text_line_new[i]+[t_l]
-                if t_l.endswith('"'):
-                    quoted_elem = 0  # set not quoted again
-                    i += 1
-                else:
-                    pass  # keep quoted and i
-        text_line_new = [' '.join(x) for x in text_line_new]  # concatenate strings
-    else:
-        text_line_new = text_line
-    return text_line_new 
-
 def replace_nan_null(data):
     """replaces np.nan or asterisk with NULL"""
     if pd.isna(data):
@@ -326,50 +303,154 @@ def replace_nan_null(data):
         return data
     
 
-def get_annotations(
-    section_text,
-    startpoint,
-    endpoint,
-    section_len
-):
+class InpSections(MutableMapping):
     """
-    concats annotations for a feature
-    :param list section text
-    :param int startpoint
-    :param int endpoint
-    :param in section_len
+    mapping of the known sections of an input file; a section is
+    extracted from the memory-mapped file at the first access
     """
-    annot_text_list = [x[1:] for x in section_text[startpoint:(endpoint+1)]]
-    annot_text = ' '.join(annot_text_list)
-    if endpoint+1 != section_len:
-        feature_name = section_text[endpoint+1].split()[0]
-        return [feature_name, annot_text]
+    def __init__(self, inp_file, encoding):
+        self.inp_file = inp_file
+        self.encoding = encoding
+        self.section_spans = {}
+        self.unknown_sections = []
+        self.extracted_sections = {}
+        for header, start, end in index_inp_sections(inp_file):
+            section_header = header.decode(encoding, errors='replace')
+            section_key = section_header[1:-1].upper()
+            if section_key in def_sections_dict.keys():
+                self.section_spans.setdefault(section_key, []).append((start, end))
+            else:
+                self.unknown_sections.append(section_header)
 
+    def __getitem__(self, section_key):
+        if section_key not in self.extracted_sections.keys():
+            if section_key not in self.section_spans.keys():
+                raise KeyError(section_key)
+            self.extracted_sections[section_key] = self.extract_section(section_key)
+        return self.extracted_sections[section_key]
 
-def extract_sections_from_text(
-    inp_text,
-    text_limits,
-    section_key
-):
+    def __setitem__(self, section_key, inp_extracted):
+        self.extracted_sections[section_key] = inp_extracted
+
+    def __delitem__(self, section_key):
+        if section_key not in self:
+            raise KeyError(section_key)
+        self.extracted_sections.pop(section_key, None)
+        self.section_spans.pop(section_key, None)
+
+    def __contains__(self, section_key):
+        # without extracting the section
+        return (
+            section_key in self.section_spans.keys()
+            or section_key in self.extracted_sections.keys()
+        )
+
+    def __iter__(self):
+        for section_key in self.section_spans.keys():
+            yield section_key
+        for section_key in self.extracted_sections.keys():
+            if section_key not in self.section_spans.keys():
+                yield section_key
+
+    def __len__(self):
+        return len(set(self.section_spans.keys()) | set(self.extracted_sections.keys()))
+
+    def extract_section(self, section_key):
+        """
+        extracts a section from its byte spans; repeated sections are merged;
+        if the section can not be decoded, the next candidate encoding is
+        used for it and all following sections
+        :param str section_key
+        :return: dict
+        """
+        while True:
+            try:
+                return build_extracted_section(*split_section_spans(
+                    self.inp_file,
+                    self.encoding,
+                    self.section_spans[section_key]
+                ))
+            except UnicodeDecodeError:
+                # the encoding was detected from the beginning of the file
+                next_encoding = get_next_encoding(self.encoding)
+                if next_encoding is None:
+                    raise
+                self.encoding = next_encoding
+
+    def extract_sections_parallel(self, feedback=None, min_section_size=2**20, n_workers=None):
+        """
+        extracts all sections larger than min_section_size in a process
+        pool; the other sections are still extracted at the first access,
+        as are the large sections if the pool fails
+        :param QgsProcessingFeedback feedback
+        :param int min_section_size: bytes
+        :param int n_workers: default: number of cpus - 1
+        :return: list of the sections extracted in the pool
+        """
+        large_sections = [
+            k for k, spans in self.section_spans.items()
+            if k not in self.extracted_sections.keys()
+            and sum(end - start for start, end in spans) >= min_section_size
+        ]
+        if n_workers is None:
+            n_workers = (os.cpu_count() or 1) - 1
+        n_workers = min(n_workers, len(large_sections))
+        if n_workers < 2:
+            return []  # a process pool would not pay off
+        extracted_in_pool = []
+        try:
+            mp_context = multiprocessing.get_context('spawn')
+            # in QGIS sys.executable is the QGIS application
+            mp_context.set_executable(get_python_executable())
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=mp_context
+            ) as executor:
+                # the workers only import g_s_inp_sections (no qgis)
+                section_futures = {
+                    executor.submit(
+                        split_section_spans,
+                        self.inp_file,
+                        self.encoding,
+                        self.section_spans[section_key]
+                    ): section_key for section_key in large_sections
+                }
+                for section_future in as_completed(section_futures):
+                    section_key = section_futures[section_future]
+                    self.extracted_sections[section_key] = build_extracted_section(
+                        *section_future.result()
+                    )
+                    extracted_in_pool.append(section_key)
+        except Exception as e:
+            # e.g. no python interpreter found, a worker died or a decoding error
+            if feedback is not None:
+                feedback.pushWarning(
+                    'Warning: the sections could not be read in parallel processes ('
+                    + str(e)
+                    + '). They will be read one after another'
+                )
+        return extracted_in_pool
+
+
+def get_python_executable():
+    """
+    returns the python interpreter for worker processes
+    :return: str
     """
-    extracts sections from inp_text
-    :param dict text_limits: line numbers at beginning and end sections
-    :param str section_key 
+    if os.path.basename(sys.executable).lower().startswith('python'):
+        return sys.executable
+    if os.name == 'nt':
+        return os.path.join(sys.exec_prefix, 'python.exe')
+    return os.path.join(sys.exec_prefix, 'bin', 'python3')
+
+
+def build_extracted_section(section_vals_clean, annot_dict):
+    """
+    returns the dict of an extracted section
+    :param list section_vals_clean: list of value lists
+    :param dict annot_dict: annotations
     :return: dict
     """
-    section_text = inp_text[text_limits[0]+1:text_limits[1]]
-    # find descriptions
-    section_len = len(section_text)
-    annotations_list = [i for i, x in enumerate(section_text) if x.startswith(';')]
-    annot_starts = [i for i in annotations_list if i-1 not in annotations_list]
-    annot_ends = [i for i in annotations_list if i+1 not in annotations_list]
-    annot_result_list = [get_annotations(section_text, s, e, section_len) for s, e in zip(annot_starts, annot_ends)]
-    annot_dict = {i[0]: i[1] for i in annot_result_list if i is not None}
-    # exclude empty comments
-    annot_dict = {k: v for k, v in annot_dict.items() if len(v) > 0}
-    section_text = [x for x in section_text if not x.startswith(';')]  # delete annotations / descriptions
-    section_vals = [x.split() for x in section_text]
-    section_vals_clean = [concat_quoted_vals(x) for x in section_vals]
     inp_extracted = {
         'data': section_vals_clean,
         'status': ImportDataStatus.RAW,
@@ -377,7 +458,8 @@ def extract_sections_from_text(
         'n_objects': len(section_vals_clean)
     }
     return inp_extracted
-    
+
+
 def build_df_for_section(section_name, dict_all_raw_vals, with_annot=False):
     """
     builds dataframes for a section
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ GenerateSwmmInp
+                                 A QGIS plugin
+ This plugin generates SWMM Input files
+ Generated by Plugin Builder: http://g-sherman.github.io/Qgis-Plugin-Builder/
+                              -------------------
+        begin                : 2021-07-09
+        copyright            : (C) 2023 by Jannik Schilling
+        email                : jannik.schilling@posteo.de
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+__author__ = 'Jannik Schilling'
+__date__ = '2023-06-01'
+__copyright__ = '(C) 2023 by Jannik Schilling'
+
+# only the standard library is imported here: the functions are also
+# used in worker processes, which must not load qgis or the plugin modules
+import codecs
+import mmap
+import os
+import re
+
+# candidate encodings of input and report files in the order of preference
+def_encodings = ('utf-8', 'windows-1250', 'windows-1252')
+
+# section headers at the beginning of a line, e.g. "[JUNCTIONS]"
+inp_header_pattern = re.compile(rb'^[ \t]*(\[[^\r\n]*\])[ \t]*\r?$', re.MULTILINE)
+
+
+def get_file_encoding(file_path, encodings=def_encodings, sample_size=2**16):
+    """
+    detects the encoding of a text file (e.g. inp or rpt file) from a
+    sample at the beginning of the file; the first candidate which
+    decodes the sample is returned. If a later part of the file can not
+    be decoded, the readers go on with get_next_encoding
+    :param str file_path
+    :param tuple encodings: candidates in the order of preference
+    :param int sample_size: bytes
+    :return: str or None if no candidate fits
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size)
+    # a character may be cut at the end of the sample
+    is_whole_file = os.path.getsize(file_path) <= sample_size
+    for encoding in encodings:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=is_whole_file)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    return None
+
+
+def get_next_encoding(encoding, encodings=def_encodings):
+    """
+    returns the candidate after encoding
+    :param str encoding
+    :param tuple encodings: candidates in the order of preference
+    :return: str or None if encoding is the last candidate
+    """
+    if encoding not in encodings:
+        return None
+    encoding_pos = encodings.index(encoding)
+    if encoding_pos + 1 == len(encodings):
+        return None
+    return encodings[encoding_pos + 1]
+
+
+def index_inp_sections(inp_file):
+    """
+    memory-maps the input file and finds the byte offsets of all
+    section headers in one scan
+    :param str inp_file: path of the input file
+    :return: list of tuples (bytes section header, int start, int end)
+    """
+    if os.path.getsize(inp_file) == 0:
+        return []
+    with open(inp_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as inp_buffer:
+            header_matches = [
+                (m.group(1), m.start(), m.end())
+                for m in inp_header_pattern.finditer(inp_buffer)
+            ]
+            file_end = len(inp_buffer)
+    section_ends = [m[1] for m in header_matches[1:]] + [file_end]
+    return [
+        (header, start, end) for (header, _, start), end in zip(header_matches, section_ends)
+    ]
+
+
+def iter_span_lines(inp_buffer, section_spans, encoding, chunk_size=2**20):
+    """
+    yields the stripped lines of the byte spans of a section; the spans
+    are decoded chunk wise, so the section is never held as one text;
+    empty lines and ';;' comments are skipped
+    :param mmap.mmap inp_buffer
+    :param list section_spans: tuples (start, end)
+    :param str encoding
+    :param int chunk_size: bytes per chunk
+    """
+    for start, end in section_spans:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        line_rest = ''
+        for chunk_start in range(start, end, chunk_size):
+            chunk_end = min(chunk_start + chunk_size, end)
+            is_last_chunk = chunk_end == end
+            chunk_lines = (line_rest + decoder.decode(
+                inp_buffer[chunk_start:chunk_end],
+                final=is_last_chunk
+            )).split('\n')
+            # the last line of a chunk may continue in the next chunk
+            line_rest = '' if is_last_chunk else chunk_lines.pop()
+            for inp_line in chunk_lines:
+                inp_line = inp_line.strip()
+                if inp_line == '' or inp_line.startswith(';;'):
+                    continue
+                yield inp_line
+
+
+def concat_quoted_vals(text_line):
+    """
+    finds quoted text and cocatenates text strings if
+    they have been separated by whitespace or other separators
+    """
+    if any([x.startswith('"') for x in text_line]):  # any quoted elements
+        text_line_new = []
+        i = 0
+        quoted_elem = 0  # set not quoted
+        for t_l in text_line:
+            if quoted_elem == 0:  # is not quoted
+                text_line_new = text_line_new + [[t_l]]
+                if t_l.startswith('"'):
+                    quoted_elem = 1  # set quoted
+                    # t_l is not '"' and fully quoted (e.g. '"test"')
+                    if len(t_l) > 1 and t_l.endswith('"'):  
+                        quoted_elem = 0  # set not quoted again
+                        i += 1
+                else:
+                    i += 1
+            else:  # is quoted and has been separated
+                text_line_new[i] = text_line_new[i]+[t_l]
+                if t_l.endswith('"'):
+                    quoted_elem = 0  # set not quoted again
+                    i += 1
+                else:
+                    pass  # keep quoted and i
+        text_line_new = [' '.join(x) for x in text_line_new]  # concatenate strings
+    else:
+        text_line_new = text_line
+    return text_line_new
+
+
+def split_section_lines(section_text):
+    """
+    splits the lines of a section into values in one pass; a block of
+    annotation lines (starting with ';') belongs to the next feature
+    :param iterable section_text: lines of the section (without header)
+    :return: tuple (list of value lists, dict annotations)
+    """
+    annot_dict = {}
+    section_vals_clean = []
+    annot_block = []
+    for inp_line in section_text:
+        if inp_line.startswith(';'):
+            annot_block.append(inp_line[1:])
+        else:
+            line_vals = inp_line.split()
+            if len(annot_block) > 0:
+                annot_dict[line_vals[0]] = ' '.join(annot_block)
+                annot_block = []
+            section_vals_clean.append(concat_quoted_vals(line_vals))
+    # exclude empty comments
+    annot_dict = {k: v for k, v in annot_dict.items() if len(v) > 0}
+    return section_vals_clean, annot_dict
+
+
+def split_section_spans(inp_file, encoding, section_spans):
+    """
+    reads a section from its byte spans in the memory-mapped input file
+    and splits its lines into values; repeated sections are merged
+    :param str inp_file
+    :param str encoding
+    :param list section_spans: tuples (start, end)
+    :return: tuple (list of value lists, dict annotations)
+    """
+    with open(inp_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as inp_buffer:
+            return split_section_lines(
+                iter_span_lines(inp_buffer, section_spans, encoding)
+            )
@@ -36,7 +36,7 @@ from .g_s_defaults import (
     def_qgis_fields_dict,
     def_sections_dict
 )
-from .g_s_various_functions import check_columns
+from .g_s_various_functions import check_columns, map_variant_columns
 
 # Definitions
 # Inlets
@@ -58,6 +58,43 @@ all_inl_type_cols = [
 
 
 # Export
+# cross sections
+def normalize_xsections(xsections_df, shape_names=None):
+    """
+    fills empty values in the cross sections of conduits, weirs and orifices:
+    Geom2 ... Geom4 are '' for IRREGULAR, STREET and CUSTOM shapes, else '0' if empty;
+    Barrels is '' for IRREGULAR and STREET shapes, else 1 if empty;
+    Barrels and Culvert are '' if the columns are missing (weirs, orifices)
+    :param pd.DataFrame xsections_df
+    :param pd.Series shape_names: transect, street or curve names for IRREGULAR, STREET (Geom1) and CUSTOM (Geom2) shapes
+    :return: pd.DataFrame
+    """
+    shapes = xsections_df['Shape']
+    tr_geom1_mask = shapes.isin(['IRREGULAR', 'STREET'])
+    custom_mask = shapes == 'CUSTOM'
+    no_geoms_mask = tr_geom1_mask | custom_mask
+    for col in ['Geom2', 'Geom3', 'Geom4']:
+        col_vals = xsections_df[col].astype(object)
+        col_vals = col_vals.where(col_vals.notna(), '0')
+        xsections_df[col] = col_vals.where(~no_geoms_mask, '')
+    if no_geoms_mask.any():
+        if shape_names is None:
+            raise QgsProcessingException('Column \"Shp_Trnsct\" is missing for IRREGULAR, CUSTOM or STREET Shape')
+        xsections_df['Geom1'] = xsections_df['Geom1'].astype(object)
+        xsections_df.loc[tr_geom1_mask, 'Geom1'] = shape_names[tr_geom1_mask]
+        xsections_df.loc[custom_mask, 'Geom2'] = shape_names[custom_mask]
+    if 'Barrels' in xsections_df.columns:
+        barrels = pd.to_numeric(xsections_df['Barrels']).fillna(1).astype(int).astype(object)
+        xsections_df['Barrels'] = barrels.where(~tr_geom1_mask, '')
+    else:
+        xsections_df['Barrels'] = ''
+    if 'Culvert' in xsections_df.columns:
+        xsections_df['Culvert'] = xsections_df['Culvert'].fillna('')
+    else:
+        xsections_df['Culvert'] = ''
+    return xsections_df[def_sections_dict['XSECTIONS']]
+
+
 # conduits
 def get_conduits_from_shapefile(conduits_raw):
     """
@@ -81,36 +118,10 @@ def get_conduits_from_shapefile(conduits_raw):
     conduits_df['OutOffset'] = conduits_df['OutOffset'].fillna('*')
     conduits_df['InitFlow'] = conduits_df['InitFlow'].fillna('0')
     conduits_df['MaxFlow'] = conduits_df['MaxFlow'].fillna('0')
-    xsections_df = conduits_raw[xsections_cols].copy()
-    xsections_df['Culvert'] = xsections_df['Culvert'].fillna('')
-    if any(xsections_df['Shape'] == 'IRREGULAR') or any(xsections_df['Shape'] == 'CUSTOM') or any(xsections_df['Shape'] == 'STREET'):
-        if 'Shp_Trnsct' not in conduits_raw.columns:
-            raise QgsProcessingException('Column \"Shp_Trnsct\" is missing for IRREGULAR, CUSTOM or STREET Shape')
-        else:
-            xsections_df.loc[xsections_df['Shape'] == 'IRREGULAR', 'Geom1'] = conduits_raw.loc[xsections_df['Shape'] == 'IRREGULAR', 'Shp_Trnsct']
-            xsections_df.loc[xsections_df['Shape'] == 'STREET', 'Geom1'] = conduits_raw.loc[xsections_df['Shape'] == 'STREET', 'Shp_Trnsct']
-            xsections_df.loc[xsections_df['Shape'] == 'CUSTOM', 'Geom2'] = conduits_raw.loc[xsections_df['Shape'] == 'CUSTOM', 'Shp_Trnsct']
-    def fill_empty_xsects(xs_row, col):
-        if col == 'Barrels':
-            if xs_row['Shape'] in ['IRREGULAR', 'STREET']:
-                return ''
-            else:
-                if pd.isna(xs_row[col]):
-                    return '1'
-                else:
-                    return int(xs_row[col])
-        else:
-            if xs_row['Shape'] in ['IRREGULAR', 'STREET', 'CUSTOM']:
-                return ''
-            else:
-                if pd.isna(xs_row[col]):
-                    return '0'
-                else:
-                    return xs_row[col]
-    xsections_df['Geom2'] = xsections_df.apply(lambda x: fill_empty_xsects(x, 'Geom2'), axis=1)
-    xsections_df['Geom3'] = xsections_df.apply(lambda x: fill_empty_xsects(x, 'Geom3'), axis=1)
-    xsections_df['Geom4'] = xsections_df.apply(lambda x: fill_empty_xsects(x, 'Geom4'), axis=1)
-    xsections_df['Barrels'] = xsections_df.apply(lambda x: fill_empty_xsects(x, 'Barrels'), axis=1)
+    xsections_df = normalize_xsections(
+        conduits_raw[xsections_cols].copy(),
+        conduits_raw['Shp_Trnsct']
+    )
     losses_df = conduits_raw[losses_cols].copy()
     losses_df['FlapGate'] = losses_df['FlapGate'].fillna('NO')
     losses_df['Seepage'] = losses_df['Seepage'].fillna('0')
@@ -128,30 +139,24 @@ def get_street_from_tables(streets_inlets_raw):
     inlets_raw = streets_inlets_raw['INLETS']
     inlets_df = inlets_raw.copy()
 
-    def inl_type_adjustment(inl_row):
-        in_type_i = inl_row['Type']
-        cols_needed_i = inl_types_def[in_type_i]
-        if len(cols_needed_i) == 1:  # curve
-            return inl_row[cols_needed_i[0]], '', '', '', ''
-        elif len(cols_needed_i) == 2:  # Drop curb or slotted
-            return inl_row[cols_needed_i[0]], inl_row[cols_needed_i[1]], '', '', ''
-        else:
-            if inl_row[cols_needed_i[2]] == 'GENERIC':
-                return inl_row[cols_needed_i[0]], inl_row[cols_needed_i[1]],  inl_row[cols_needed_i[2]], inl_row['OpenFract'], inl_row['SplashVel']
-            else:
-                return inl_row[cols_needed_i[0]], inl_row[cols_needed_i[1]],  inl_row[cols_needed_i[2]], '', ''
-    inlets_df[['Shape1', 'Shape2', 'Shape3', 'Shape4', 'Shape5']] = [inl_type_adjustment(inlets_df.loc[i]) for i in inlets_df.index]
+    unknown_inlet_types = [
+        str(x) for x in inlets_df['Type'].unique() if x not in inl_types_def.keys()
+    ]
+    if len(unknown_inlet_types) > 0:
+        raise QgsProcessingException(
+            'Unknown inlet type(s) (-> field (\"Type\"): '
+            + ', '.join(unknown_inlet_types)
+            + '. \"Type\" must be one of '
+            + ', '.join(inl_types_def.keys())
+        )
+    inlets_shapes = map_variant_columns(inlets_df, 'Type', inl_types_def, 5)
+    # open fraction and splash velocity only for GENERIC grates
+    generic_mask = (inlets_shapes[:, 2] == 'GENERIC')
+    inlets_shapes[generic_mask, 3:5] = inlets_df.loc[generic_mask, ['OpenFract', 'SplashVel']].to_numpy(dtype=object)
+    inlets_df[['Shape1', 'Shape2', 'Shape3', 'Shape4', 'Shape5']] = inlets_shapes
     inlets_df = inlets_df.drop(columns=all_inl_type_cols)
     return streets_df, inlets_df, inlets_usage_df
 
-# geometries
-def del_first_last_vt(link):
-    """
-    deletes first and last vertex as it is already in nodes coordinates
-    :param list link
-    """
-    return link[1:-1]
-
 # pumps
 def get_pumps_from_shapefile(pumps_raw):
     """prepares pumps data for writing an input file"""
@@ -209,18 +214,17 @@ def get_weirs_from_shapefile(weirs_raw):
         }
     )
     weirs_raw['Shape'] = [weirs_shape_dict[x] for x in weirs_raw['Type']]
-    weirs_raw['Geom3'] = weirs_raw['Geom3'].fillna('0')
     weirs_raw['Geom4'] = weirs_raw['Geom3']
-    xsections_df = weirs_raw[[
-        'Name',
-        'Shape',
-        'Geom1',
-        'Geom2',
-        'Geom3',
-        'Geom4'
-    ]].copy()
-    xsections_df['Barrels'] = ''
-    xsections_df['Culvert'] = ''
+    xsections_df = normalize_xsections(
+        weirs_raw[[
+            'Name',
+            'Shape',
+            'Geom1',
+            'Geom2',
+            'Geom3',
+            'Geom4'
+        ]].copy()
+    )
     return weirs_df, xsections_df
 
 # orifices
@@ -246,19 +250,18 @@ def get_orifices_from_shapefile(orifices_raw):
     orifices_df = orifices_df[orifices_inp_cols]
     orifices_raw['Geom1'] = orifices_raw['Height']
     orifices_raw['Geom2'] = orifices_raw['Width']
-    orifices_raw['Geom2'] = orifices_raw['Geom2'].fillna('0')
     orifices_raw['Geom3'] = 0
     orifices_raw['Geom4'] = 0
-    xsections_df = orifices_raw[[
-        'Name',
-        'Shape',
-        'Geom1',
-        'Geom2',
-        'Geom3',
-        'Geom4'
-    ]].copy()
-    xsections_df['Barrels'] = ''
-    xsections_df['Culvert'] = ''
+    xsections_df = normalize_xsections(
+        orifices_raw[[
+            'Name',
+            'Shape',
+            'Geom1',
+            'Geom2',
+            'Geom3',
+            'Geom4'
+        ]].copy()
+    )
     return orifices_df, xsections_df
 
 # outlets
@@ -296,32 +299,48 @@ def get_outlets_from_shapefile(outlets_raw):
 # Transects
 def get_transects_from_table(transects_raw):
     """writes strings for transects"""
-    tr_data = transects_raw['Data']
+    tr_data = transects_raw['Data'].drop_duplicates(subset='TransectName')
     tr_vals = transects_raw['XSections']
+    tr_names = tr_data['TransectName']
+
+    # sort the stations once in the order of the transects
+    tr_codes = pd.Index(tr_names).get_indexer(tr_vals['TransectName'])
+    tr_order = np.argsort(tr_codes, kind='stable')
+    tr_order = tr_order[tr_codes[tr_order] >= 0]
+    tr_counts = np.bincount(tr_codes[tr_codes >= 0], minlength=len(tr_names))
+    tr_offsets = 2 * np.concatenate([[0], np.cumsum(tr_counts)])
+    # elevation / station pairs as one flat array of strings
+    gr_vals = tr_vals[['Elevation', 'Station']].values[tr_order]
+    gr_vals = gr_vals.astype(str).astype(object).ravel()
 
-    def write_transect_lines(T_Name):
-        tr_data_i = tr_data[tr_data['TransectName'] == T_Name]
-        tr_vals_i = tr_vals[tr_vals['TransectName'] == T_Name]
-        tr_count_i = len(tr_vals_i)
-        tr_roughn_i = tr_data_i[['RoughnessLeftBank', 'RoughnessRightBank', 'RoughnessChannel']].values.tolist()[0]
-        tr_bank_i = tr_data_i[['BankStationLeft', 'BankStationRight']].values.tolist()[0]
-        tr_modifier_i = tr_data_i[['ModifierMeander', 'ModifierStations', 'ModifierElevations']].values.tolist()[0]
-        NC_data_i = ['NC']+tr_roughn_i
-        NC_string_i = '    '.join([str(i) for i in NC_data_i])
-        X1_data_i = ['X1', T_Name, '', tr_count_i] + tr_bank_i + [0.0, 0.0] + tr_modifier_i
-        X1_string_i = '    '.join([str(i) for i in X1_data_i])
-        tr_vals_i_list = [tr_vals_i.loc[i, ['Elevation', 'Station']].to_list() for i in tr_vals_i.index]
-        tr_vals_i_list = [str(x) for sublist in tr_vals_i_list for x in sublist]
-        tr_vals_i_list_splitted = [tr_vals_i_list[i: i + 10] for i in range(0, len(tr_vals_i_list), 10)]
-        tr_vals_i_list_splitted = [['GR'] + x for x in tr_vals_i_list_splitted]
+    def join_tr_cols(cols):
+        tr_cols_str = tr_data[cols].values.astype(str).astype(object)
+        tr_cols_joined = tr_cols_str[:, 0]
+        for j in range(1, len(cols)):
+            tr_cols_joined = tr_cols_joined + '    ' + tr_cols_str[:, j]
+        return tr_cols_joined
+    NC_strings = 'NC    ' + join_tr_cols(
+        ['RoughnessLeftBank', 'RoughnessRightBank', 'RoughnessChannel']
+    )
+    X1_strings = (
+        'X1    ' + join_tr_cols(['TransectName'])
+        + '        ' + tr_counts.astype(str).astype(object)
+        + '    ' + join_tr_cols(['BankStationLeft', 'BankStationRight'])
+        + '    0.0    0.0    '
+        + join_tr_cols(['ModifierMeander', 'ModifierStations', 'ModifierElevations'])
+    )
 
-        def concat_tr_str(tr_line):
-            return'    '.join([str(i) for i in tr_line])
-        GR_strings_i = [concat_tr_str(x) for x in tr_vals_i_list_splitted]
-        GR_strings_i_joined = '\n'.join(GR_strings_i)
-        tr_string = NC_string_i+'\n'+X1_string_i+'\n'+GR_strings_i_joined
-        return tr_string
-    transects_string_list = [write_transect_lines(x) for x in tr_data['TransectName']]
+    def write_GR_lines(k):
+        """GR lines with 5 elevation / station pairs of transect k"""
+        tr_vals_k = gr_vals[tr_offsets[k]:tr_offsets[k+1]]
+        return '\n'.join([
+            'GR    ' + '    '.join(tr_vals_k[i: i + 10])
+            for i in range(0, len(tr_vals_k), 10)
+        ])
+    transects_string_list = [
+        nc + '\n' + x1 + '\n' + write_GR_lines(k)
+        for k, (nc, x1) in enumerate(zip(NC_strings, X1_strings))
+    ]
     return transects_string_list
 
 
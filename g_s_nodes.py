@@ -36,7 +36,8 @@ from .g_s_defaults import (
 )
 from .g_s_various_functions import (
     check_columns,
-    get_coords_from_geometry
+    get_coords_from_geometry,
+    map_variant_columns
 )
 
 # Definitions for Storages
@@ -59,6 +60,10 @@ all_st_type_cols = [
     'SurfHeight'
 ]
 
+# Definitions for RDII hydrographs
+def_hydrograph_terms = ['Short', 'Medium', 'Long']
+def_hydrograph_params = ['R', 'T', 'K', 'D_max', 'D_recovery', 'D_init']
+
 # Export
 #----------
 # Outfalls
@@ -106,16 +111,13 @@ def get_storages_from_geodata(storages_raw):
     storage_df['Name'] = [str(x) for x in storage_df['Name']]
     storage_df['X_Coord'], storage_df['Y_Coord'] = get_coords_from_geometry(storage_df)
 
-    def st_type_adjustment(st_row):
-        st_type_i = st_row['Type']
-        cols_needed_i = st_types_def[st_type_i]
-        if len(cols_needed_i) == 1:  # TABULAR
-            return st_row[cols_needed_i[0]], '', ''
-        elif len(cols_needed_i) == 2:  # CYLINDRICAL
-            return st_row[cols_needed_i[0]], st_row[cols_needed_i[1]], 0
-        else:
-            return st_row[cols_needed_i[0]], st_row[cols_needed_i[1]], st_row[cols_needed_i[2]]
-    storage_df[['Shape1', 'Shape2', 'Shape3']] = [st_type_adjustment(storage_df.loc[i]) for i in storage_df.index]
+    storage_df[['Shape1', 'Shape2', 'Shape3']] = map_variant_columns(
+        storage_df,
+        'Type',
+        st_types_def,
+        3,
+        fill_values={'CYLINDRICAL': [0]}
+    )
     storage_df['Psi'] = storage_df['Psi'].fillna('')
     storage_df['Ksat'] = storage_df['Ksat'].fillna('')
     storage_df['IMD'] = storage_df['IMD'].fillna('')
@@ -126,84 +128,90 @@ def get_storages_from_geodata(storages_raw):
     return storage_df
 
 # inflows
-def compose_infl_dict(inflow, i, inf_type):
+def compose_infl_df(inflow_df, inf_type):
     """
-    writes an inflow dict from a pd.df for direct and dry weather inflow
-    :param pd.DataFram inflow
-    :param str i: name
-    :param str inf_type    
+    selects and renames the columns of direct and dry weather inflows
+    for the input file
+    :param pd.DataFrame inflow_df
+    :param str inf_type
+    :return: pd.DataFrame
     """
     if inf_type == 'Direct':
-        i_dict = {
-            'Name': i,
-            'Constituent': inflow['Constituent'],
-            'Time_Series': inflow['Time_Series'],
-            'Type': inflow['Type'],
-            'Mfactor': inflow['Units_Factor'],
-            'Sfactor': inflow['Scale_Factor'],
-            'Baseline': inflow['Baseline'],
-            'Pattern': inflow['Baseline_Pattern']
-        }
+        infl_df = pd.DataFrame({
+            'Name': inflow_df['Name'],
+            'Constituent': inflow_df['Constituent'],
+            'Time_Series': inflow_df['Time_Series'],
+            'Type': inflow_df['Type'],
+            'Mfactor': inflow_df['Units_Factor'],
+            'Sfactor': inflow_df['Scale_Factor'],
+            'Baseline': inflow_df['Baseline'],
+            'Pattern': inflow_df['Baseline_Pattern']
+        })
     if inf_type == 'Dry_Weather':  # dry weather
-        i_dict = {
-            'Name': i,
-            'Constituent': inflow['Constituent'],
-            'Baseline': inflow['Average_Value'],
-            'Patterns': ' '.join([
-                inflow['Time_Pattern1'],
-                inflow['Time_Pattern2'],
-                inflow['Time_Pattern3'],
-                inflow['Time_Pattern4']
-            ])
-        }            
-    return i_dict
-        
+        infl_df = pd.DataFrame({
+            'Name': inflow_df['Name'],
+            'Constituent': inflow_df['Constituent'],
+            'Baseline': inflow_df['Average_Value'],
+            'Patterns': inflow_df['Time_Pattern1'].astype(str).str.cat(
+                [
+                    inflow_df['Time_Pattern2'].astype(str),
+                    inflow_df['Time_Pattern3'].astype(str),
+                    inflow_df['Time_Pattern4'].astype(str)
+                ],
+                sep=' '
+            )
+        })
+    return infl_df.reset_index(drop=True)
+
 # Hydrographs
-def compose_hydrograph_df(hydrog):
-        """
-        creates a pd.Dataframe for evey hydrograph with short, medium
-        and long term parameters in different rows which can directly be 
-        printed into the input file
-        :param str i: hydrograph name
-        :param pd.DataFrame hydrog
-        :returns pd.DataFrame        
-        """
-        h_name = hydrog['Name']
-        df_rg = pd.DataFrame(
-            {'Name': h_name, 'RG_Month': hydrog['Rain_Gage']},
-            index = [0]
+def compose_hydrograph_df(hydrogr_table):
+    """
+    reshapes the hydrographs table into the rows of the input file:
+    a rain gage row followed by a short, medium and long term row
+    for every row of the table
+    :param pd.DataFrame hydrogr_table
+    :returns pd.DataFrame
+    """
+    n_hg = len(hydrogr_table)
+    h_names = hydrogr_table['Name'].values
+    response_dfs = [
+        pd.DataFrame({
+            'Name': h_names,
+            'RG_Month': hydrogr_table['Rain_Gage'].values
+        })
+    ]
+    for t in def_hydrograph_terms:
+        response_dfs.append(
+            pd.DataFrame({
+                'Name': h_names,
+                'RG_Month': hydrogr_table['Months'].values,
+                'Response': t,
+                **{
+                    p: hydrogr_table[p+'_'+t+'Term'].values
+                    for p in def_hydrograph_params
+                }
+            })
         )
-        for i, t in enumerate(['Short', 'Medium', 'Long']):
-            df_i = pd.DataFrame(
-                {
-                    'Name': h_name,
-                    'RG_Month': hydrog['Months'],
-                    'Response': t,
-                    'R': hydrog['R_'+t+'Term'],
-                    'T': hydrog['T_'+t+'Term'],
-                    'K': hydrog['K_'+t+'Term'],
-                    'D_max': hydrog['D_max_'+t+'Term'],
-                    'D_recovery': hydrog['D_recovery_'+t+'Term'],
-                    'D_init': hydrog['D_init_'+t+'Term']
-                },
-                index = [i+1]
-            )
-            df_rg = pd.concat([df_rg, df_i])
-        return df_rg
+    hydrogr_df = pd.concat(response_dfs, ignore_index=True)
+    # interleave the blocks: gage, short, medium, long per table row
+    row_order = np.arange(4 * n_hg).reshape(4, n_hg).T.ravel()
+    return hydrogr_df.iloc[row_order].reset_index(drop=True)
 
 # Inflows
 def get_inflows_from_table(inflows_raw, all_nodes, feedback):
     """
-    generates a dict for direct inflow and
-    dry weather inflow from tables in "inflows_raw"
+    generates pd.DataFrames for direct inflow, dry weather inflow,
+    hydrographs and rdii from tables in "inflows_raw"
     :param dict inflows_raw
     :param list all_nodes
     """       
-    # create empty dicts / pd.DataFrame in case no flow is given
-    inflow_dict = {}
-    dwf_dict = {}
+    # create empty pd.DataFrames in case no flow is given
+    inflow_df_out = pd.DataFrame()
+    dwf_df = pd.DataFrame()
     hydrogr_df = pd.DataFrame()
     rdii_df = pd.DataFrame()
+    # hashed index of the node names
+    all_nodes_index = pd.Index([str(x) for x in all_nodes]).unique()
     for inflow_type in ['Direct', 'Dry_Weather', 'Hydrographs', 'RDII']:
         inflow_df = inflows_raw[inflow_type]
         if not inflow_df.empty:
@@ -219,9 +227,10 @@ def get_inflows_from_table(inflows_raw, all_nodes, feedback):
             if inflow_type == 'RDII':
                 inflow_df['Name'] = inflow_df['Node']
             inflow_df = inflow_df[inflow_df['Name'] != ";"]
-            inflow_df['Name'] = [str(x) for x in inflow_df['Name']]
+            inflow_df['Name'] = inflow_df['Name'].astype(str)
             if inflow_type != 'Hydrographs':
-                missing_nodes = list(inflow_df.loc[~inflow_df['Name'].isin(all_nodes),'Name'])
+                node_exists = all_nodes_index.get_indexer(inflow_df['Name']) >= 0
+                missing_nodes = list(inflow_df.loc[~node_exists, 'Name'])
                 if len(missing_nodes) > 0:
                     feedback.pushWarning(
                         'Warning: Missing nodes for inflows: '
@@ -230,46 +239,22 @@ def get_inflows_from_table(inflows_raw, all_nodes, feedback):
                         + 'The inflows will not be written into the input file '
                         + 'to avoid errors in SWMM'
                     )
-                inflow_df = inflow_df[inflow_df['Name'].isin(all_nodes)]
-                inflow_df = inflow_df[pd.notna(inflow_df['Name'])]
+                inflow_df = inflow_df[node_exists]
             inflow_df = inflow_df.fillna('""')
             if not inflow_df.empty:
-                # prepare a dict with node names and constituents
-                a_l = inflow_df['Name'].tolist()
-                if inflow_type in ['Direct', 'Dry_Weather']:
-                    b_l = inflow_df['Constituent'].tolist()
-                    inflow_df['temp'] = [str(a) + '    ' + str(b) for a, b in zip(a_l, b_l)]
-                    inflow_df.set_index(keys=['temp'], inplace=True)
-                    if inflow_type == 'Direct':
-                        inflow_dict = {
-                            i: compose_infl_dict(
-                                inflow_df.loc[i, :],
-                                i,
-                                inflow_type
-                            ) for i in inflow_df.index
-                        }
-                    else:  # Dry_Weather
-                        dwf_dict = {
-                            i: compose_infl_dict(
-                                inflow_df.loc[i, :],
-                                i,
-                                inflow_type
-                            ) for i in inflow_df.index
-                        }
+                if inflow_type == 'Direct':
+                    inflow_df_out = compose_infl_df(inflow_df, inflow_type)
+                elif inflow_type == 'Dry_Weather':
+                    dwf_df = compose_infl_df(inflow_df, inflow_type)
                 elif inflow_type == 'Hydrographs':
                     # to do: check if rain gage exists
-                    hydrog_list = [
-                        compose_hydrograph_df(
-                            inflow_df.loc[i, :]
-                        ) for i in inflow_df.index
-                    ]
-                    hydrogr_df = pd.concat(hydrog_list)
+                    hydrogr_df = compose_hydrograph_df(inflow_df)
                     hydrogr_df = hydrogr_df.fillna('')
                 else:  # rdii
                     rdii_df = inflow_df
                     rdii_df = rdii_df[['Node', 'UnitHydrograph', 'SewerArea']]
                                    
-    return dwf_dict, inflow_dict, hydrogr_df, rdii_df
+    return dwf_df, inflow_df_out, hydrogr_df, rdii_df
 
 
 # Import
@@ -340,27 +325,36 @@ def get_storages_from_inp(st_raw_line, feedback):
     return(st_line_adjusted)
     
 # Hydrographs
-def get_hydrogrphs(hg_name, df_hydrographs_raw):
+def get_hydrogrphs(df_hydrographs_raw):
     '''
-    creates a flat hydrograph df
-    :param str hg_name
+    creates a flat hydrograph df with one row per hydrograph and month
     :param pd.DataFrame df_hydrographs_raw
     '''
-    subdf = df_hydrographs_raw[df_hydrographs_raw['Name'] == hg_name]
-    hg_rg = subdf[pd.isna(subdf['Response'])]
-    hg_rg = hg_rg[['Name', 'RG_Month']].rename(columns={'RG_Month': 'Rain_Gage'})
-    for t in ['Short', 'Medium', 'Long']:
-        hg_i = subdf[subdf['Response'] == t]
-        if t == 'Short':
-            hg_rg['Months'] = list(hg_i['RG_Month'])[0]
-        hg_i = hg_i.drop(columns = ['RG_Month', 'Response'])
-        ren_dict = {c: c+'_'+t+'Term' for c in hg_i.columns if c != 'Name'}
-        hg_i = hg_i.rename(columns=ren_dict)
-        hg_rg = hg_rg.join(
-            hg_i.set_index('Name'),
-            on='Name'
-        )
-    return (hg_rg)
+    is_rg = pd.isna(df_hydrographs_raw['Response'])
+    hg_rg = df_hydrographs_raw.loc[is_rg, ['Name', 'RG_Month']]
+    hg_rg = hg_rg.drop_duplicates(subset='Name', keep='last')
+    hg_rg = hg_rg.rename(columns={'RG_Month': 'Rain_Gage'})
+    hg_terms = df_hydrographs_raw[~is_rg].copy()
+    hg_terms['Response'] = hg_terms['Response'].str.capitalize()
+    hg_terms = hg_terms.drop_duplicates(
+        subset=['Name', 'RG_Month', 'Response'],
+        keep='last'
+    )
+    # order of the hydrographs and months in the input file
+    hg_months = pd.MultiIndex.from_frame(
+        hg_terms[['Name', 'RG_Month']].drop_duplicates()
+    )
+    hg_wide = hg_terms.pivot(
+        index=['Name', 'RG_Month'],
+        columns='Response',
+        values=def_hydrograph_params
+    ).reindex(hg_months)
+    hg_wide.columns = [p+'_'+t+'Term' for p, t in hg_wide.columns]
+    hg_wide = hg_wide.reset_index().rename(columns={'RG_Month': 'Months'})
+    hg_wide = hg_wide.merge(hg_rg, on='Name', how='left')
+    return hg_wide.reindex(
+        columns=list(def_tables_dict['INFLOWS']['tables']['Hydrographs'].keys())
+    )
 
 # Geometry helpers
 def create_point_from_x_y(sr, i, n, feedback):
@@ -29,27 +29,66 @@ import pandas as pd
 import numpy as np
 
 
+# default values for missing land use / pollutant combinations
+def_landuse_fill_values = {
+    'b': ['NONE', 0, 0, 0, 'AREA'],
+    'w': ['NONE', 0, 0, 0, 0]
+}
+
+
 def fill_landuse_params(df, pollutant_names, landuses_names, b_w):
     '''
     fills buildup or washoff data frames if missing
     '''
-    missing = []
-    for l_n in landuses_names:
-        df_sub = df[df['Name'] == l_n]
-        if b_w == 'b':
-            missing = missing + [[l_n, p_n, 'NONE', 0, 0, 0, 'AREA'] for p_n in pollutant_names if p_n not in df_sub['Pollutant'].to_list()]
-        if b_w == 'w':
-            missing = missing + [[l_n, p_n, 'NONE', 0, 0, 0, 0] for p_n in pollutant_names if p_n not in df_sub['Pollutant'].to_list()]
+    all_combinations = pd.MultiIndex.from_product(
+        [landuses_names, pollutant_names]
+    )
+    given_combinations = pd.MultiIndex.from_frame(df[['Name', 'Pollutant']])
+    missing = all_combinations[~all_combinations.isin(given_combinations)]
     if len(missing) == 0:
         pass  # returns None
     else:
-        missing_df = pd.DataFrame(missing)
+        missing_df = pd.DataFrame(
+            [def_landuse_fill_values[b_w]] * len(missing),
+            columns=df.columns[2:]
+        )
+        missing_df.insert(0, 'Pollutant', missing.get_level_values(1))
+        missing_df.insert(0, 'Name', missing.get_level_values(0))
         missing_df.columns = df.columns
         return missing_df
 
 
-def get_quality_params_from_table(quality_raw_dict, subcatchments_df=None):
+def get_unknown_names(df, name_col, known_names):
+    '''
+    checks the names in df[name_col] against an index of known names
+    :param pd.DataFrame df
+    :param str name_col
+    :param pd.Index known_names
+    :return: np.array of bool; True for unknown names
+    '''
+    return known_names.get_indexer(df[name_col]) < 0
+
+
+def get_quality_params_from_table(
+    quality_raw_dict,
+    subcatchments_df=None,
+    feedback=None
+):
     """generates a dictionary with quality data from an excel file"""
+    if subcatchments_df is not None:
+        subcatchment_names = pd.Index(subcatchments_df['Name']).unique()
+    else:
+        subcatchment_names = pd.Index([])
+
+    def warn_unknown(names_text, unknown_names):
+        """warns about rows which will not be written into the input file"""
+        if feedback is not None:
+            feedback.pushWarning(
+                'Warning: Unknown ' + names_text + ': '
+                + ', '.join([str(x) for x in unknown_names.unique()])
+                + '. These rows will not be written into the input file '
+                + 'to avoid errors in SWMM'
+            )
     quality_params = ['POLLUTANTS', 'LANDUSES', 'COVERAGES', 'LOADINGS']
     for q_p in quality_params:
         q_df_raw = quality_raw_dict[q_p]
@@ -129,10 +168,22 @@ def get_quality_params_from_table(quality_raw_dict, subcatchments_df=None):
                 'Landuse',
                 'Percent'
             ]]
-            if subcatchments_df is not None:
-                coverages_df = coverages_df[coverages_df['Subcatchment'].isin(subcatchments_df['Name'])]
-            else:
-                coverages_df = coverages_df[coverages_df['Subcatchment'].isin([])]  # if no subcatchments, delete all coverages data
+            coverages_df = coverages_df[~get_unknown_names(
+                coverages_df,
+                'Subcatchment',
+                subcatchment_names
+            )]  # if no subcatchments, delete all coverages data
+            unknown_landuses = get_unknown_names(
+                coverages_df,
+                'Landuse',
+                pd.Index(landuses_names).unique()
+            )
+            if any(unknown_landuses):
+                warn_unknown(
+                    'land uses in COVERAGES',
+                    coverages_df.loc[unknown_landuses, 'Landuse']
+                )
+                coverages_df = coverages_df[~unknown_landuses]
         if q_p == 'LOADINGS':
             loadings_df = q_df_raw
             loadings_df = loadings_df[[
@@ -140,6 +191,22 @@ def get_quality_params_from_table(quality_raw_dict, subcatchments_df=None):
                 'Pollutant',
                 'InitialBuildup'
             ]]
+            loadings_df = loadings_df[~get_unknown_names(
+                loadings_df,
+                'Subcatchment',
+                subcatchment_names
+            )]
+            unknown_pollutants = get_unknown_names(
+                loadings_df,
+                'Pollutant',
+                pd.Index(pollutant_names).unique()
+            )
+            if any(unknown_pollutants):
+                warn_unknown(
+                    'pollutants in LOADINGS',
+                    loadings_df.loc[unknown_pollutants, 'Pollutant']
+                )
+                loadings_df = loadings_df[~unknown_pollutants]
     return {
         'POLLUTANTS': pollutants_df,
         'LANDUSES': landuses_df,
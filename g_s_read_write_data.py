@@ -30,17 +30,22 @@ import pandas as pd
 import os
 import numpy as np
 import copy
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from qgis.core import (
     NULL,
     QgsCoordinateReferenceSystem,
     QgsCoordinateTransform,
     QgsFeature,
+    QgsFeatureRequest,
     QgsField,
     QgsGeometry,
     QgsProcessingException,
     QgsProject,
     QgsVectorFileWriter,
-    QgsVectorLayer
+    QgsVectorLayer,
+    QgsVectorLayerFeatureSource
 )
 from qgis.PyQt.QtCore import QVariant
 from .g_s_defaults import (
@@ -64,42 +69,74 @@ def replace_null_nan(attr_value):
         return attr_value
 
 # layers with geometry
+def attr_values_to_column(col_values, qgs_field):
+    """
+    converts the attribute values of one field into a np.array;
+    replaces NULL with np.nan and True / False with 'YES' / 'NO'
+    :param tuple col_values
+    :param QgsField qgs_field
+    :return: np.array
+    """
+    n_vals = len(col_values)
+    col_arr = np.empty(n_vals, dtype=object)
+    col_arr[:] = col_values
+    is_null = np.fromiter(
+        (v is None or v == NULL for v in col_values),
+        dtype=bool,
+        count=n_vals
+    )
+    field_type = qgs_field.type()
+    if field_type == QVariant.Double:
+        num_arr = np.full(n_vals, np.nan)
+        num_arr[~is_null] = col_arr[~is_null].astype(float)
+        return num_arr
+    if field_type in [QVariant.Int, QVariant.LongLong, QVariant.UInt, QVariant.ULongLong]:
+        if not is_null.any():
+            return col_arr.astype(np.int64)
+    elif field_type == QVariant.Bool:
+        col_arr[~is_null] = np.where(
+            col_arr[~is_null].astype(bool),
+            'YES',
+            'NO'
+        )
+    else:
+        col_arr[col_arr == 'True'] = 'YES'
+        col_arr[col_arr == 'False'] = 'NO'
+    col_arr[is_null] = np.nan
+    return col_arr
+
+
 def read_layers_direct(
     raw_layers_dict,
     select_cols=[],
-    with_id=False
+    with_id=False,
+    concurrent=False
 ):
     """
     reads layers from swmm model
     :param dict raw_layers_dict
     :param list select_cols
     :param bool with_id
+    :param bool concurrent: load all layers at the same time in worker threads
     """
 
-    def del_none_bool(df):
-        """
-        replaces None or NULL with np.nan
-        replaces True and False with 'YES' and 'NO'
-        except of geometry column
-        :param pd.DataFrame df
-        """
-        df[df.columns[:-1]] = df[df.columns[:-1]].fillna(value=np.nan)
-        df = df.applymap(replace_null_nan)
-        df[df.columns[:-1]] = df[df.columns[:-1]].replace('True', 'YES').replace('False', 'NO')
-        return df
-
     def load_layer_to_df(
-        vlayer,
+        feature_source,
+        layer_fields,
+        layer_name,
         select_cols=[],
         with_id=False
     ):
         """
-        reads layer attributes and geometries
-        :param QgsVectorLayer vlayer
+        reads layer attributes and geometries in one pass;
+        only the needed attributes are requested from the provider
+        :param QgsVectorLayer or QgsVectorLayerFeatureSource feature_source
+        :param QgsFields layer_fields
+        :param str layer_name
         :param list select_cols
         :param bool with_id
         """
-        cols = [f.name() for f in vlayer.fields()]
+        cols = [f.name() for f in layer_fields]
         if len(select_cols) > 0:
             if all([x in cols for x in select_cols]):
                 cols = select_cols
@@ -107,41 +144,133 @@ def read_layers_direct(
                 missing_cols = [x for x in select_cols if x not in cols]
                 raise QgsProcessingException(
                     'Missing colums in layer '
-                    + vlayer.name()
+                    + layer_name
                     + ': ' + ', '.join(missing_cols)
                 )
+        field_idxs = [layer_fields.indexFromName(col) for col in cols]
+        request = QgsFeatureRequest().setSubsetOfAttributes(field_idxs)
+        if len(field_idxs) == 1:
+            def get_attrs(attrs):
+                return (attrs[field_idxs[0]], )
+        else:
+            get_attrs = itemgetter(*field_idxs)
+        attr_rows = []
+        geoms = []
+        ids = []
+        missing_geom_pos = []
+        for f in feature_source.getFeatures(request):
+            if not f.hasGeometry():
+                missing_geom_pos.append(len(geoms))
+            attr_rows.append(get_attrs(f.attributes()))
+            geoms.append(f.geometry())
+            ids.append(f.id())
         # check for null geometries
-        if any(not(f.hasGeometry()) for f in vlayer.getFeatures()):
-            name_missing_geom = [f['Name'] for f in vlayer.getFeatures() if not(f.hasGeometry())]
+        if len(missing_geom_pos) > 0:
+            if 'Name' in cols:
+                name_pos = cols.index('Name')
+                name_missing_geom = [str(attr_rows[i][name_pos]) for i in missing_geom_pos]
+            else:
+                name_missing_geom = ['id ' + str(ids[i]) for i in missing_geom_pos]
             raise QgsProcessingException(
                 'Failed to load layer: missing geometries in '
-                + vlayer.name()+': '+', '.join(name_missing_geom)
+                + layer_name+': '+', '.join(name_missing_geom)
             )
-        # data generator
-        if with_id is True:
-            datagen = ([f[col] for col in cols] + [f.geometry()] + [f.id()] for f in vlayer.getFeatures())
-            df = pd.DataFrame.from_records(data=datagen, columns=cols+['geometry', 'id'])
+        # one np.array per column
+        if len(attr_rows) > 0:
+            col_values = list(zip(*attr_rows))
         else:
-            datagen = ([f[col] for col in cols]+[f.geometry()] for f in vlayer.getFeatures())
-            df = pd.DataFrame.from_records(data=datagen, columns=cols+['geometry'])
+            col_values = [() for col in cols]
+        df = pd.DataFrame({
+            col: attr_values_to_column(
+                c_vals,
+                layer_fields.at(c_i)
+            ) for col, c_vals, c_i in zip(cols, col_values, field_idxs)
+        })
+        geoms_arr = np.empty(len(geoms), dtype=object)
+        geoms_arr[:] = geoms
+        df['geometry'] = geoms_arr
+        if with_id is True:
+            df['id'] = np.array(ids, dtype=np.int64)
         return df
-    data_dict = {n: load_layer_to_df(d, select_cols, with_id) for n, d in raw_layers_dict.items() if d is not None}
+    raw_layers_dict = {n: d for n, d in raw_layers_dict.items() if d is not None}
+    if concurrent and len(raw_layers_dict) > 1:
+        # feature sources are thread safe copies of the layers; they have
+        # to be created in the thread which owns the layers
+        layer_sources = {
+            n: (
+                QgsVectorLayerFeatureSource(d),
+                d.fields(),
+                d.name()
+            ) for n, d in raw_layers_dict.items()
+        }
+        n_workers = min(len(layer_sources), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            futures_dict = {
+                n: executor.submit(
+                    load_layer_to_df,
+                    *l_s,
+                    select_cols,
+                    with_id
+                ) for n, l_s in layer_sources.items()
+            }
+            data_dict = {n: f.result() for n, f in futures_dict.items()}
+    else:
+        data_dict = {
+            n: load_layer_to_df(
+                d,
+                d.fields(),
+                d.name(),
+                select_cols,
+                with_id
+            ) for n, d in raw_layers_dict.items()
+        }
     data_dict_out = {n: d for n, d in data_dict.items() if len(d) > 0}
-    data_dict_out = {n: del_none_bool(data_dict_out[n]) for n in data_dict_out.keys()}
     return data_dict_out
 
 
 # tables
+# parsed workbooks {absolute path: [modification time, {sheet name: pd.DataFrame}]};
+# only the def_workbook_cache_size most recently used workbooks are kept
+def_workbook_cache_size = 4
+workbook_cache = OrderedDict()
+
+
+def read_workbook_cached(file):
+    """
+    reads all sheets of a workbook in one pass; later calls for the
+    same (unchanged) file are served from workbook_cache
+    :param str file
+    :return: dict
+    """
+    file_path = os.path.abspath(file)
+    file_mtime = os.path.getmtime(file_path)
+    if file_path in workbook_cache.keys() and workbook_cache[file_path][0] == file_mtime:
+        workbook_cache.move_to_end(file_path)
+        return workbook_cache[file_path][1]
+    try:
+        sheets_dict = pd.read_excel(file_path, sheet_name=None)
+    except BaseException:
+        sheets_dict = pd.read_excel(
+            file_path,
+            sheet_name=None,
+            engine='openpyxl'
+        )
+    # an edited file replaces its older version
+    workbook_cache[file_path] = [file_mtime, sheets_dict]
+    workbook_cache.move_to_end(file_path)
+    while len(workbook_cache) > def_workbook_cache_size:
+        workbook_cache.popitem(last=False)
+    return sheets_dict
+
+
 def read_data_from_table_direct(file, sheet=0):
     '''reads curves or other tables from excel or csv'''
     filename, file_extension = os.path.splitext(file)
     if file_extension == '.xlsx' or file_extension == '.xls' or file_extension == '.ods':
-        try:
-            sheets = list(pd.read_excel(file, None, engine='openpyxl').keys())
-        except BaseException:
-            sheets = pd.ExcelFile(file).sheet_names
+        sheets_dict = read_workbook_cached(file)
+        sheets = list(sheets_dict.keys())
         if sheet == 0:
-            s_n = 0
+            s_n = sheets[0] if len(sheets) > 0 else None
         else:
             if sheet in sheets:
                 s_n = sheet
@@ -154,14 +283,8 @@ def read_data_from_table_direct(file, sheet=0):
             else:
                 s_n = None
         if s_n is not None:
-            try:
-                data_df = pd.read_excel(file, sheet_name=s_n)
-            except BaseException:
-                data_df = pd.read_excel(
-                    file,
-                    sheet_name=s_n,
-                    engine='openpyxl'
-                )
+            # copy, because the tables are modified later on
+            data_df = sheets_dict[s_n].copy()
         else:
             data_df = pd.DataFrame()
     if file_extension == '.gpkg':
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ GenerateSwmmInp
+                                 A QGIS plugin
+ This plugin generates SWMM Input files
+ Generated by Plugin Builder: http://g-sherman.github.io/Qgis-Plugin-Builder/
+                              -------------------
+        begin                : 2021-07-09
+        copyright            : (C) 2023 by Jannik Schilling
+        email                : jannik.schilling@posteo.de
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Jannik Schilling'
+__date__ = '2023-05-09'
+__copyright__ = '(C) 2023 by Jannik Schilling'
+
+import hashlib
+import os
+from collections import OrderedDict
+import pandas as pd
+from qgis.core import QgsProviderRegistry
+
+# input layers and tables which are needed for a group of sections
+def_section_blocks_sources = {
+    'OPTIONS': ['options'],
+    'SUBCATCHMENTS': ['subcatchments_raw', 'options'],
+    'CONDUITS': ['conduits_raw'],
+    'PUMPS': ['pumps_raw'],
+    'WEIRS': ['weirs_raw'],
+    'OUTLETS': ['outlets_raw'],
+    'TRANSECTS': ['transects', 'conduits_raw', 'weirs_raw'],
+    'ORIFICES': ['orifices_raw'],
+    'JUNCTIONS': ['junctions_raw'],
+    'OUTFALLS': ['outfalls_raw'],
+    'STORAGE': ['storages_raw'],
+    'DIVIDERS': ['dividers_raw'],
+    'INFLOWS': [
+        'inflows',
+        'junctions_raw',
+        'outfalls_raw',
+        'storages_raw',
+        'dividers_raw'
+    ],
+    'STREETS': ['streets'],
+    'CURVES': ['curves'],
+    'PATTERNS': ['patterns'],
+    'TIMESERIES': ['timeseries'],
+    'RAINGAGES': ['raingages_raw'],
+    'QUALITY': ['quality', 'subcatchments_raw', 'options']
+}
+
+# sections which are combined from several blocks
+def_combined_sections = ['XSECTIONS', 'COORDINATES', 'VERTICES', 'POLYGONS']
+
+# files which belong to the data of a layer file (e.g. of a shapefile);
+# other files with the same name (e.g. the generated .inp file or the
+# .gpkg-shm index of geopackages, which changes on every read) are ignored
+def_source_sidecar_extensions = ['.shp', '.shx', '.dbf', '.prj', '.cpg']
+def_source_sidecar_suffixes = ['-wal']
+
+# prepared sections of previous runs
+# {block name: [block key, block sections, block extras, block messages, number of rows]};
+# the least recently used blocks are removed if the cached sections
+# have more than def_section_cache_max_rows rows in total
+def_section_cache_max_rows = 1000000
+section_cache = OrderedDict()
+
+
+class BlockFeedback:
+    """
+    passes all calls to the feedback of the processing algorithm and
+    records the warnings and errors of a block, so that they can be
+    repeated when the block is taken from section_cache
+    """
+    def __init__(self, feedback):
+        self.feedback = feedback
+        self.messages = []
+
+    def pushWarning(self, text):
+        self.messages.append(['pushWarning', text])
+        self.feedback.pushWarning(text)
+
+    def reportError(self, text, fatalError=False):
+        self.messages.append(['reportError', text])
+        self.feedback.reportError(text, fatalError)
+
+    def __getattr__(self, name):
+        return getattr(self.feedback, name)
+
+
+def get_source_fingerprint(source):
+    """
+    returns a fingerprint of a layer or table file, which changes with its content;
+    it is built from the names, sizes and modification times of the data files of the source
+    :param QgsVectorLayer or str source: layer or path of a table file
+    :return: str or None if the source can not be fingerprinted (e.g. memory layers or unsaved edits)
+    """
+    if source is None or source == '':
+        return 'NA'
+    if isinstance(source, str):
+        file_path = source
+        source_text = source
+    else:
+        if source.isModified():
+            return None
+        uri_parts = QgsProviderRegistry.instance().decodeUri(
+            source.providerType(),
+            source.source()
+        )
+        file_path = uri_parts.get('path', '')
+        source_text = source.source() + '|' + source.subsetString()
+    if not os.path.isfile(file_path):
+        return None
+    # e.g. .dbf of shapefiles or the write ahead log of geopackages
+    base_path = os.path.splitext(file_path)[0]
+    sidecar_files = [
+        base_path + ext for ext in def_source_sidecar_extensions
+    ] + [
+        base_path + ext.upper() for ext in def_source_sidecar_extensions
+    ] + [
+        file_path + suffix for suffix in def_source_sidecar_suffixes
+    ]
+    source_files = sorted(
+        set([file_path] + [s_f for s_f in sidecar_files if os.path.isfile(s_f)])
+    )
+    fingerprint_parts = [source_text]
+    for s_f in source_files:
+        s_f_stat = os.stat(s_f)
+        fingerprint_parts = fingerprint_parts + [
+            s_f,
+            str(s_f_stat.st_size),
+            str(s_f_stat.st_mtime_ns)
+        ]
+    return hashlib.sha1('|'.join(fingerprint_parts).encode('utf-8')).hexdigest()
+
+
+def get_block_keys(sources_fingerprints):
+    """
+    combines the fingerprints of the sources of every block
+    :param dict sources_fingerprints
+    :return: dict {block name: str or None}
+    """
+    block_keys = {}
+    for block_name, block_sources in def_section_blocks_sources.items():
+        block_fingerprints = [sources_fingerprints[s] for s in block_sources]
+        if any(f is None for f in block_fingerprints):
+            block_keys[block_name] = None
+        else:
+            block_keys[block_name] = hashlib.sha1(
+                '|'.join(block_fingerprints).encode('utf-8')
+            ).hexdigest()
+    return block_keys
+
+
+def get_cached_block(block_name, block_key):
+    """
+    returns the sections, extras and feedback messages of a block from
+    a previous run or None if one of the sources has changed
+    :param str block_name
+    :param str block_key
+    :return: list or None
+    """
+    if block_key is None or block_name not in section_cache.keys():
+        return None
+    cached_key, block_sections, block_extras, block_messages, _ = section_cache[block_name]
+    if cached_key != block_key:
+        return None
+    section_cache.move_to_end(block_name)
+    return [block_sections, block_extras, block_messages]
+
+
+def count_data_rows(data):
+    """
+    counts the rows of all tables in the (nested) data of a block
+    :param data: pd.DataFrame, dict, list or single value
+    :return: int
+    """
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        return len(data)
+    if isinstance(data, dict):
+        return sum(count_data_rows(v) for v in data.values())
+    if isinstance(data, (list, tuple)):
+        return len(data)
+    return 1
+
+
+def set_cached_block(
+    block_name,
+    block_key,
+    block_sections,
+    block_extras,
+    block_messages
+):
+    """
+    saves the sections, extras and feedback messages of a block for later runs
+    :param str block_name
+    :param str block_key
+    :param dict block_sections
+    :param dict block_extras
+    :param list block_messages: [feedback method name, text]
+    """
+    section_cache.pop(block_name, None)
+    if block_key is None:
+        return
+    n_rows = count_data_rows(block_sections) + count_data_rows(block_extras)
+    section_cache[block_name] = [
+        block_key,
+        block_sections,
+        block_extras,
+        block_messages,
+        n_rows
+    ]
+    cached_rows = sum(c[4] for c in section_cache.values())
+    while cached_rows > def_section_cache_max_rows:
+        _, removed_block = section_cache.popitem(last=False)
+        cached_rows = cached_rows - removed_block[4]
+
+
+def merge_block_sections(inp_dict, block_sections):
+    """
+    adds the sections of a block to inp_dict; the parts of sections in
+    def_combined_sections are collected in a list and concatenated once
+    by combine_block_sections
+    :param dict inp_dict
+    :param dict block_sections
+    """
+    for section_name, section_dict in block_sections.items():
+        if section_name in def_combined_sections:
+            if section_name in inp_dict.keys():
+                inp_dict[section_name]['data'].append(section_dict['data'])
+            else:
+                inp_dict[section_name] = {'data': [section_dict['data']]}
+        else:
+            inp_dict[section_name] = section_dict
+
+
+def combine_block_sections(inp_dict):
+    """
+    concatenates the collected parts of the sections in def_combined_sections
+    :param dict inp_dict
+    """
+    for section_name in def_combined_sections:
+        if section_name in inp_dict.keys():
+            inp_dict[section_name] = {
+                'data': pd.concat(
+                    inp_dict[section_name]['data'],
+                    ignore_index=True
+                )
+            }
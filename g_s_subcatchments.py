@@ -40,58 +40,36 @@ from .g_s_defaults import (
 )
 
 
+# columns of the subcatchments layer for Param1 ... Param5 of the infiltration methods
+def_infiltration_params = {
+    'GREEN_AMPT': ['SuctHead', 'Conductiv', 'InitDef'],
+    'MODIFIED_GREEN_AMPT': ['SuctHead', 'Conductiv', 'InitDef'],
+    'HORTON': ['MaxRate', 'MinRate', 'Decay', 'DryTime', 'MaxInf'],
+    'MODIFIED_HORTON': ['MaxRate', 'MinRate', 'Decay', 'DryTime', 'MaxInf'],
+    'CURVE_NUMBER': ['CurveNum', 'Conductiv', 'DryTime']
+}
+
+
 # Export
 # Subcatchments
 def get_subcatchments_from_layer(subcatchments_df, main_infiltration_method):
     """
     reads subcatchment shapefile
     """
-
-    def rename_for_infiltation(subc_row, main_infiltration_method):
-        """
-        selects and renames different columns
-        according to the columns 'InfMethod'
-        """
-        infiltr_method = subc_row['InfMethod']
-        if pd.isna(infiltr_method):
-            # take main infiltration method, if not given for subcatchment
-            infiltr_method = main_infiltration_method
-        if infiltr_method in ['GREEN_AMPT', 'MODIFIED_GREEN_AMPT']:
-            subc_row = subc_row.rename({
-                'SuctHead': 'Param1',
-                'Conductiv': 'Param2',
-                'InitDef': 'Param3'
-            })
-            subc_row['Param4'] = ''
-            subc_row['Param5'] = ''
-        if infiltr_method in ['HORTON', 'MODIFIED_HORTON']:
-            subc_row = subc_row.rename({
-                'MaxRate': 'Param1',
-                'MinRate': 'Param2',
-                'Decay': 'Param3',
-                'DryTime': 'Param4',
-                'MaxInf': 'Param5'
-            })
-        if infiltr_method == 'CURVE_NUMBER':
-            subc_row = subc_row.rename({
-                'CurveNum': 'Param1',
-                'Conductiv': 'Param2',
-                'DryTime': 'Param3'
-            })
-            subc_row['Param4'] = ''
-            subc_row['Param5'] = ''
-        if infiltr_method is None:
-            subc_row['Param1'] = ''
-            subc_row['Param2'] = ''
-            subc_row['Param3'] = ''
-            subc_row['Param4'] = ''
-            subc_row['Param5'] = ''
-        return subc_row
-    subcatchments_df = subcatchments_df.apply(
-        rename_for_infiltation,
-        axis=1,
-        args=(main_infiltration_method, )
-    )
+    inf_methods = subcatchments_df['InfMethod']
+    if main_infiltration_method is not None:
+        # take main infiltration method, if not given for subcatchment
+        inf_methods = inf_methods.fillna(main_infiltration_method)
+    # Param1 ... Param5; empty if no infiltration method is given
+    inf_params = np.full((len(subcatchments_df), 5), np.nan, dtype=object)
+    inf_params[inf_methods.isna().to_numpy()] = ''
+    for inf_method, inf_cols in def_infiltration_params.items():
+        inf_mask = (inf_methods == inf_method).to_numpy()
+        if inf_mask.any():
+            inf_params[inf_mask, :len(inf_cols)] = subcatchments_df.loc[inf_mask, inf_cols].to_numpy(dtype=object)
+            inf_params[inf_mask, len(inf_cols):] = ''
+    for i in range(5):
+        subcatchments_df['Param'+str(i+1)] = inf_params[:, i]
     subcatchments_df['CurbLen'] = subcatchments_df['CurbLen'].fillna('0')
     subcatchments_df['SnowPack'] = subcatchments_df['SnowPack'].fillna('')
     subcatchments_df['PctRouted'] = subcatchments_df['PctRouted'].fillna(100)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ GenerateSwmmInp
+                                 A QGIS plugin
+ This plugin generates SWMM Input files
+ Generated by Plugin Builder: http://g-sherman.github.io/Qgis-Plugin-Builder/
+                              -------------------
+        begin                : 2021-07-09
+        copyright            : (C) 2023 by Jannik Schilling
+        email                : jannik.schilling@posteo.de
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Jannik Schilling'
+__date__ = '2023-05-09'
+__copyright__ = '(C) 2023 by Jannik Schilling'
+
+import numpy as np
+import pandas as pd
+
+# functions for tables which only need pandas and numpy (no QGIS classes)
+
+
+def adjust_datetime(
+    dt_column,
+    str_input_formats,
+    str_output_format
+):
+    """
+    converts time values (tries different formats) into another time string;
+    the unique values of the column are converted format by format,
+    values in an unknown format are kept as strings
+    :param list or series dt_column: column in which the date or time is written
+    :param list str_input_formats
+    :param str str_output_format
+    :return: np.ndarray
+    """
+    dt_codes, dt_uniques = pd.factorize(pd.Series(dt_column))
+    try:
+        # if already in a date or time format
+        str_uniques = [t.strftime(str_output_format) for t in dt_uniques]
+    except BaseException:
+        # if given as string; values which do not match a format
+        # are tried with the next one
+        str_uniques = np.asarray(dt_uniques.astype(str), dtype=object)
+        not_converted = np.ones(len(str_uniques), dtype=bool)
+        for st in str_input_formats:
+            dt_converted = pd.to_datetime(
+                pd.Series(str_uniques[not_converted]),
+                format=st,
+                errors='coerce'
+            )
+            is_converted = dt_converted.notna().to_numpy()
+            if is_converted.any():
+                conv_idx = np.flatnonzero(not_converted)[is_converted]
+                str_uniques[conv_idx] = dt_converted[is_converted].dt.strftime(
+                    str_output_format
+                ).to_numpy(dtype=object)
+                not_converted[conv_idx] = False
+            if not not_converted.any():
+                break
+    # empty values (code -1) are the last element
+    str_uniques = np.append(np.asarray(str_uniques, dtype=object), '')
+    return str_uniques[dt_codes]
+
+
+def del_first_last_vt(links_verts):
+    """
+    deletes first and last vertex of every link as it is already in nodes
+    coordinates; links without further vertices are dropped
+    :param pd.DataFrame links_verts: one row per vertex (Name, X_Coord, Y_Coord)
+    :return: pd.DataFrame
+    """
+    # the vertices of a link are contiguous
+    link_ids = (links_verts['Name'] != links_verts['Name'].shift()).cumsum()
+    vt_pos = link_ids.groupby(link_ids).cumcount()
+    vt_count = link_ids.map(link_ids.value_counts())
+    inner_vts = (vt_pos > 0) & (vt_pos < vt_count - 1)
+    return links_verts[inner_vts].reset_index(drop=True)
@@ -27,11 +27,9 @@ __copyright__ = '(C) 2023 by Jannik Schilling'
 
 import numpy as np
 import pandas as pd
-from datetime import datetime
-from qgis.core import (
-    QgsWkbTypes,
-    QgsProcessingException
-)
+import struct
+from qgis.core import QgsProcessingException
+from .g_s_table_functions import adjust_datetime
 from .g_s_defaults import (
     def_tables_dict,
     annotation_field_name
@@ -39,114 +37,201 @@ from .g_s_defaults import (
 
 # Export
 # geometry functions
-def get_coords_from_geometry(df):
+def_wkb_kinds = {
+    1: 'Point',
+    2: 'Line',
+    3: 'Polygon',
+    4: 'MultiPoint',
+    5: 'Line',
+    6: 'Polygon'
+}
+
+
+def read_wkb_coords(wkb, pos, coord_arrays):
     """
-    extracts coords from any gpd.geodataframe
-    :param pd.DataFrame df
+    reads a (multi) geometry from wkb and appends one array of x and y
+    coordinates for every point sequence (point, line or ring) to coord_arrays
+    :param bytes wkb
+    :param int pos: position of the geometry in wkb
+    :param list coord_arrays
+    :return: tuple (wkb base type, position after the geometry)
     """
-    geom_point_types = {
-        'Point': 'simple',
-        'PointM': 'simple',
-        'PointZ': 'simple',
-        'PointZM': 'simple'
-    }
-    geom_line_types = {
-        'LineString': 'simple',
-        'LineStringZ': 'simple',
-        'LineStringZM': 'simple',
-        'LineStringM': 'simple',
-        'MultiLineString': 'multi',
-        'MultiLineStringM': 'multi',
-        'MultiLineStringZ': 'multi',
-        'MultiLineStringZM': 'multi'
-    }
-    geom_polygon_types = {
-        'Polygon': 'simple',
-        'PolygonZ': 'simple',
-        'PolygonM': 'simple',
-        'PolygonZM': 'simple',
-        'MultiPolygon': 'multi',
-        'MultiPolygonM': 'multi',
-        'MultiPolygonZ': 'multi',
-        'MultiPolygonZM': 'multi'
-    }
-    point_t_names = list(geom_point_types.keys())
-    line_t_names = list(geom_line_types.keys())
-    polygon_t_names = list(geom_polygon_types.keys())
+    byte_order = '<' if wkb[pos] == 1 else '>'
+    wkb_type = struct.unpack_from(byte_order+'I', wkb, pos+1)[0]
+    pos = pos+5
+    # EWKB flags or ISO codes for Z and M
+    dim = 2 + bool(wkb_type & 0x80000000) + bool(wkb_type & 0x40000000)
+    wkb_type = wkb_type & 0x0FFFFFFF
+    dim = dim + [0, 1, 1, 2][wkb_type // 1000 % 4]
+    base_type = wkb_type % 1000
+    coord_dtype = np.dtype(byte_order+'f8')
+
+    def read_sequence(pos, n_verts):
+        coords = np.frombuffer(
+            wkb,
+            dtype=coord_dtype,
+            count=n_verts*dim,
+            offset=pos
+        )
+        coord_arrays.append(coords.reshape(n_verts, dim)[:, :2])
+        return pos+8*dim*n_verts
+    if base_type == 1:
+        pos = read_sequence(pos, 1)
+    elif base_type == 2:
+        n_verts = struct.unpack_from(byte_order+'I', wkb, pos)[0]
+        pos = read_sequence(pos+4, n_verts)
+    elif base_type == 3:
+        n_rings = struct.unpack_from(byte_order+'I', wkb, pos)[0]
+        pos = pos+4
+        for r in range(n_rings):
+            n_verts = struct.unpack_from(byte_order+'I', wkb, pos)[0]
+            pos = read_sequence(pos+4, n_verts)
+    elif base_type in [4, 5, 6]:
+        n_parts = struct.unpack_from(byte_order+'I', wkb, pos)[0]
+        pos = pos+4
+        for p in range(n_parts):
+            _, pos = read_wkb_coords(wkb, pos, coord_arrays)
+    else:
+        raise QgsProcessingException(
+            'Geometry type of one or more features could not be handled'
+        )
+    return base_type, pos
+
 
-    def extract_xy_from_simple_line(line_simple):
-        """extracts x and y coordinates from a LineString"""
-        xy_arr = np.dstack([(p.x(), p.y()) for p in line_simple])[0]
-        xy_df = pd.DataFrame(xy_arr.T, columns=['x', 'y'])
-        return xy_df
+def get_xy_from_geometries(geometries):
+    """
+    extracts the vertices of all geometries from wkb into one flat float64
+    array (ragged layout): the vertices of feature i are xy[offsets[i]:offsets[i+1]]
+    :param iterable geometries: QgsGeometry of every feature
+    :return: tuple (str geometry kind, np.array xy with shape (n, 2), np.array offsets)
+    """
+    all_wkb = [bytes(g.asWkb()) for g in geometries]
+    coord_arrays = []
+    verts_per_feature = np.zeros(len(all_wkb), dtype=np.int64)
+    geom_kinds = set()
+    for i, wkb in enumerate(all_wkb):
+        n_arrays = len(coord_arrays)
+        base_type, _ = read_wkb_coords(wkb, 0, coord_arrays)
+        geom_kinds.add(def_wkb_kinds[base_type])
+        verts_per_feature[i] = sum(len(a) for a in coord_arrays[n_arrays:])
+    if len(geom_kinds) > 1:
+        raise QgsProcessingException(
+            'Geometry type of one or more features could not be handled'
+        )
+    geom_kind = geom_kinds.pop() if len(geom_kinds) == 1 else None
+    if len(coord_arrays) > 0:
+        xy = np.concatenate(coord_arrays).astype(np.float64)
+    else:
+        xy = np.empty((0, 2), dtype=np.float64)
+    offsets = np.zeros(len(all_wkb)+1, dtype=np.int64)
+    np.cumsum(verts_per_feature, out=offsets[1:])
+    return geom_kind, xy, offsets
 
-    def extract_xy_from_line(line_row):
-        """extraxts xy from LineString or MultiLineString"""
-        act_line_type = QgsWkbTypes.displayString(line_row.wkbType())
-        simple_or_multi = geom_line_types[act_line_type]
-        if simple_or_multi == 'simple':
-            return extract_xy_from_simple_line(line_row.asPolyline())
-        if simple_or_multi == 'multi':
-            xy_list = [extract_xy_from_simple_line(line_simple) for line_simple in line_row.asMultiPolyline()]
-            return pd.concat(xy_list, ignore_index=True)
 
-    if all(QgsWkbTypes.displayString(g_type.wkbType()) in point_t_names for g_type in df.geometry):
-        df['X_Coord'] = [str(df_row.asPoint().x()) for df_row in df['geometry']]
-        df['Y_Coord'] = [str(df_row.asPoint().y()) for df_row in df['geometry']]
-        return df['X_Coord'], df['Y_Coord']
-    elif all(QgsWkbTypes.displayString(g_type.wkbType()) in line_t_names for g_type in df.geometry):
-        return {na: extract_xy_from_line(geom) for geom, na in zip(df.geometry, df.Name)}
-    elif all(QgsWkbTypes.displayString(g_type.wkbType()) in polygon_t_names for g_type in df.geometry):
-        def extract_xy_from_area(geom_row):
-            """extraxts xy from polygon geometries"""
-            xy_arr = np.dstack([(v.x(), v.y()) for v in geom_row.vertices()])[0]
-            xy_df = pd.DataFrame(xy_arr.T, columns=['x', 'y'])
-            return xy_df
-        return {na: extract_xy_from_area(ge) for ge, na in zip(df.geometry, df.Name)}
+def get_coords_from_geometry(df):
+    """
+    extracts coords from the geometry column of a pd.DataFrame
+    :param pd.DataFrame df
+    :return: tuple of x and y strings for points or
+        pd.DataFrame with one row per vertex for lines and polygons
+    """
+    geom_kind, xy, offsets = get_xy_from_geometries(df['geometry'])
+    if geom_kind == 'Point':
+        # str conversion keeps the shortest repr of every coordinate
+        return xy[:, 0].astype(str), xy[:, 1].astype(str)
+    elif geom_kind in ['Line', 'Polygon']:
+        # the feature name is repeated for each of its vertices
+        return pd.DataFrame({
+            'Name': np.repeat(df['Name'].to_numpy(dtype=object), np.diff(offsets)),
+            'X_Coord': xy[:, 0],
+            'Y_Coord': xy[:, 1]
+        })
     else:
         raise QgsProcessingException(
             'Geometry type of one or more features could not be handled'
         )
 
 # functions for data in tables
+def map_variant_columns(df, type_col, types_def, n_target_cols, fill_values={}):
+    """
+    selects the columns in types_def according to the type of each row;
+    rows are grouped by type, so that the columns are copied once per type
+    :param pd.DataFrame df
+    :param str type_col: column with the type (e.g. storage or inlet type)
+    :param dict types_def: {type: [columns]}
+    :param int n_target_cols: number of resulting columns (e.g. Shape1 ... Shape3)
+    :param dict fill_values: {type: [values]} for the remaining columns of a type; default ''
+    :return: np.ndarray (dtype object) with n_target_cols columns
+    """
+    target_arr = np.full((len(df), n_target_cols), '', dtype=object)
+    row_types = df[type_col].to_numpy()
+    for row_type, type_cols in types_def.items():
+        type_mask = row_types == row_type
+        if type_mask.any():
+            target_arr[type_mask, :len(type_cols)] = df.loc[type_mask, type_cols].to_numpy(dtype=object)
+            type_fill_values = fill_values.get(row_type, [])
+            if len(type_fill_values) > 0:
+                target_arr[type_mask, len(type_cols):len(type_cols)+len(type_fill_values)] = type_fill_values
+    return target_arr
+
+
+def group_table_rows(df, name_col):
+    """
+    brings rows with the same name into one contiguous block (stable,
+    in order of the first appearance of the names); df is returned
+    unchanged if the rows are already grouped
+    :param pd.DataFrame df
+    :param str name_col
+    :return: pd.DataFrame
+    """
+    name_codes = pd.factorize(df[name_col])[0]
+    if np.any(np.diff(name_codes) < 0):
+        df = df.iloc[np.argsort(name_codes, kind='stable')]
+    return df
+
+
 def get_curves_from_table(curves_raw, name_col):
     """
-    generates curve data for the input file from tables (curve_raw)
-    :param pd.DataFrame curve_raw
+    generates curve data for the input file from tables (curve_raw);
+    the points of every curve are one contiguous block of rows
+    :param dict curves_raw: {curve type: pd.DataFrame}
     :param str name_col
+    :return: pd.DataFrame with the columns Name, Type, XVal, YVal
     """
     curve_types = list(def_tables_dict['CURVES']['tables'].keys())
-    curve_dict = dict()
+    curve_frames = []
     for curve_type in curve_types:
         if curve_type in curves_raw.keys():
             curve_df = curves_raw[curve_type]
-            if len(curve_df.columns) > 3:
-                curve_df = curve_df[curve_df.columns[:3]]
             curve_df = curve_df[curve_df[name_col] != ";"]
             curve_df = curve_df[pd.notna(curve_df[name_col])]
             if curve_df.empty:
                 pass
             else:
-                curve_df.set_index(keys=[name_col], inplace=True)
-                for i in curve_df.index.unique():
-                    curve = curve_df[curve_df.index == i]
-                    curve = curve.reset_index(drop=True)
-                    curve_dict[i] = {
-                        'Name': i,
-                        'Type': curve_type,
-                        'frame': curve
-                    }
-    return(curve_dict)
+                curve_df = group_table_rows(curve_df, name_col)
+                x_col, y_col = [c for c in curve_df.columns if c != name_col][:2]
+                # object columns keep integers of one curve type as they are
+                curve_frames.append(pd.DataFrame({
+                    'Name': curve_df[name_col].to_numpy(),
+                    'Type': curve_type,
+                    'XVal': curve_df[x_col].to_numpy(dtype=object),
+                    'YVal': curve_df[y_col].to_numpy(dtype=object)
+                }))
+    if len(curve_frames) == 0:
+        return pd.DataFrame(columns=['Name', 'Type', 'XVal', 'YVal'])
+    return pd.concat(curve_frames, ignore_index=True)
 
 
 def get_patterns_from_table(patterns_raw, name_col):
     """
-    generates a pattern dict for the input file from tables (patterns_raw)
-    :param pd.DataFrame patterns_raw
+    generates pattern data for the input file from tables (patterns_raw);
+    the factors of every pattern are one contiguous block of rows
+    :param dict patterns_raw: {pattern type: pd.DataFrame}
     :param str name_col
+    :return: pd.DataFrame with the columns Name, Type, Factor
     """
     pattern_types = def_tables_dict['PATTERNS']['tables'].keys()
-    pattern_dict = {}
+    pattern_frames = []
     for pattern_type in pattern_types:
         pattern_cols = def_tables_dict['PATTERNS']['tables'][pattern_type].keys()
         pattern_df = patterns_raw[pattern_type]
@@ -156,45 +241,17 @@ def get_patterns_from_table(patterns_raw, name_col):
         if pattern_df.empty:
             pass
         else:
-            pattern_df.set_index(keys=[name_col], inplace=True)
-            for i in pattern_df.index.unique():
-                pattern = pattern_df[pattern_df.index == i]
-                pattern = pattern.drop(columns=pattern.columns[0])
-                pattern = pattern.reset_index(drop=True)
-                pattern_dict[i] = {
-                    'Name': i,
-                    'Type': pattern_type,
-                    'Factors': pattern
-                }
-    return(pattern_dict)
-
-
-def adjust_datetime(
-    dt_column,
-    str_input_formats,
-    str_output_format
-):
-    """
-    converts time values (tries different formats) into another time string
-    :param list or series dt_column: column in which the date or time is written
-    :param list str_input_formats
-    :param str str_output_format
-    """
-    try:
-        # if already in a date or time format
-        dt_column = [t.strftime(str_output_format) for t in dt_column]
-        return dt_column
-    except BaseException:
-        # if given as string
-        for st in str_input_formats:
-            try:
-                dt_column = [datetime.strptime(str(t), st) for t in dt_column]
-                dt_column = [t.strftime(str_output_format) for t in dt_column]
-            except BaseException:
-                dt_column = [str(t) for t in dt_column]
-            else:
-                return dt_column
-                break
+            pattern_df = group_table_rows(pattern_df, name_col)
+            # the first column after the name is the time (or day, month)
+            factor_col = [c for c in pattern_df.columns if c != name_col][1]
+            pattern_frames.append(pd.DataFrame({
+                'Name': pattern_df[name_col].to_numpy(),
+                'Type': pattern_type,
+                'Factor': pattern_df[factor_col].to_numpy(dtype=object)
+            }))
+    if len(pattern_frames) == 0:
+        return pd.DataFrame(columns=['Name', 'Type', 'Factor'])
+    return pd.concat(pattern_frames, ignore_index=True)
 
 
 def get_timeseries_from_table(ts_raw, name_col, feedback):
@@ -218,39 +275,56 @@ def get_timeseries_from_table(ts_raw, name_col, feedback):
             + 'examplary layer from the default data set or have a look '
             + 'at the documentation file.'
         )
-    if ts_raw.empty:
+    ts_df = ts_raw[pd.notna(ts_raw[name_col])].copy()
+    if ts_df.empty:
         pass
     else:
-        for i in ts_raw[name_col].unique():
-            ts_df = ts_raw[ts_raw[name_col] == i]
-            if 'File_Name' in ts_raw.columns and not all(pd.isna(ts_df['File_Name'])):  # external time series
-                ts_df['Date'] = 'FILE'
-                ts_df['Time'] = ts_df['File_Name']
-                ts_df['Value'] = ''
-            else:
-                if sum(pd.isna(ts_df['Date'])) > 0:
-                    if not all(pd.isna(ts_df['Date'])):
-                        feedback.pushWarning(
-                                'Warning: At least one date in the timeseries file is missing. Date will be set to start date')
-                    ts_df['Date'] = ''
-                else: 
-                    ts_df['Date'] = adjust_datetime(
-                        ts_df['Date'],
-                        ['%Y-%m-%d', '%d/%m/%Y', '%d.%m.%Y'],
-                        '%m/%d/%Y'
-                    )
-                ts_df['Time'] = adjust_datetime(
-                    ts_df['Time'],
-                    ['%H:%M:%S', '%H:%M', '%H'],
-                    '%H:%M'
-                )
-            if annotation_field_name in ts_df.columns:
-                ts_annotation = ts_df[annotation_field_name].fillna('').unique()[0]
+        ts_names = ts_df[name_col]
+        # external time series
+        if 'File_Name' in ts_df.columns:
+            file_mask = ts_df['File_Name'].notna().groupby(ts_names).transform('any').to_numpy(dtype=bool)
+        else:
+            file_mask = np.zeros(len(ts_df), dtype=bool)
+        # time series with missing dates
+        date_na = ts_df['Date'].isna().groupby(ts_names)
+        date_na_any = date_na.transform('any').to_numpy(dtype=bool) & ~file_mask
+        date_na_all = date_na.transform('all').to_numpy(dtype=bool)
+        for ts_name in ts_names[date_na_any & ~date_na_all].unique():
+            feedback.pushWarning(
+                'Warning: At least one date in the timeseries \"' + str(ts_name)
+                + '\" is missing. Date will be set to start date')
+        # dates and times of all time series at once
+        ts_dates = np.full(len(ts_df), '', dtype=object)
+        ts_times = np.full(len(ts_df), '', dtype=object)
+        date_mask = ~file_mask & ~date_na_any
+        if date_mask.any():
+            ts_dates[date_mask] = adjust_datetime(
+                ts_df['Date'][date_mask],
+                ['%Y-%m-%d', '%d/%m/%Y', '%d.%m.%Y'],
+                '%m/%d/%Y'
+            )
+        if (~file_mask).any():
+            ts_times[~file_mask] = adjust_datetime(
+                ts_df['Time'][~file_mask],
+                ['%H:%M:%S', '%H:%M', '%H'],
+                '%H:%M'
+            )
+        if file_mask.any():
+            ts_dates[file_mask] = 'FILE'
+            ts_times[file_mask] = ts_df['File_Name'].to_numpy(dtype=object)[file_mask]
+            ts_values = ts_df['Value'].to_numpy(dtype=object)
+            ts_values[file_mask] = ''
+            ts_df['Value'] = ts_values
+        ts_df['Date'] = ts_dates
+        ts_df['Time'] = ts_times
+        for i, ts_df_i in ts_df.groupby(name_col, sort=False):
+            if annotation_field_name in ts_df_i.columns:
+                ts_annotation = ts_df_i[annotation_field_name].fillna('').iloc[0]
             else:
                 ts_annotation = ''
             ts_dict[i] = {
                 'Name': i,
-                'TimeSeries': ts_df[['Name', 'Date', 'Time', 'Value']],
+                'TimeSeries': ts_df_i[['Name', 'Date', 'Time', 'Value']],
                 'Annotations': ts_annotation
             }
     return(ts_dict)
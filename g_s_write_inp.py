@@ -26,21 +26,165 @@ __date__ = '2023-05-09'
 __copyright__ = '(C) 2023 by Jannik Schilling'
 
 import os
+import numpy as np
 import pandas as pd
 
-inflow_keys_dict = {
-    'DWF':['Name','Baseline','Patterns'],
-    'INFLOWS':[
+# columns of sections which are written from frames with additional columns
+record_cols_dict = {
+    'INFLOWS': [
         'Name',
+        'Constituent',
         'Time_Series',
         'Type',
         'Mfactor',
         'Sfactor',
         'Baseline',
         'Pattern'
+    ],
+    'DWF': [
+        'Name',
+        'Constituent',
+        'Baseline',
+        'Patterns'
+    ],
+    'OUTFALLS': [
+        'Name',
+        'Elevation',
+        'Type',
+        'Data',
+        'FlapGate',
+        'RouteTo'
+    ],
+    'DIVIDERS': [
+        'Name',
+        'Elevation',
+        'DivertLink',
+        'Type',
+        'CutoffFlow',
+        'WeirMinFlo',
+        'WeirMaxDep',
+        'WeirCoeff',
+        'MaxDepth',
+        'InitDepth',
+        'SurDepth',
+        'Aponded'
+    ],
+    'XSECTIONS': [
+        'Name',
+        'Shape',
+        'Geom1',
+        'Geom2',
+        'Geom3',
+        'Geom4',
+        'Barrels',
+        'Culvert'
+    ],
+    'LOSSES': [
+        'Name',
+        'Kentry',
+        'Kexit',
+        'Kavg',
+        'FlapGate',
+        'Seepage'
     ]
 }
 
+def format_df_column(col, na_rep='NaN'):
+    """
+    converts the values of a column into strings as str() does it
+    (e.g. '1.5', '0.123456789'); missing numbers are written as na_rep
+    :param pd.Series col
+    :param str na_rep
+    :return: np.ndarray
+    """
+    if isinstance(col.dtype, np.dtype) and col.dtype.kind in 'biuf':
+        col_vals = col.to_numpy()
+        str_vals = col_vals.astype(str)
+        if col.dtype.kind == 'f':
+            str_vals[np.isnan(col_vals)] = na_rep
+        return str_vals
+    col_vals = col.to_numpy(dtype=object)
+    str_vals = col_vals.astype(str)
+    na_pos = np.flatnonzero(pd.isna(col_vals))
+    # None is written as 'None', as str() does
+    na_pos = [i for i in na_pos if col_vals[i] is not None]
+    str_vals[na_pos] = na_rep
+    return str_vals
+
+
+def write_df_lines(
+    file1,
+    df,
+    sep='    ',
+    na_rep='NaN',
+    chunk_size=10000,
+    annotations=None
+):
+    """
+    writes the rows of df as text lines with a fixed delimiter into file1;
+    the rows are converted chunk wise in order to keep the memory usage low
+    :param file file1
+    :param pd.DataFrame df
+    :param str/list sep: one delimiter or a list of delimiters between the columns
+    :param str na_rep: text for missing numbers
+    :param int chunk_size
+    :param pd.Series annotations: text for every row (or np.nan), which is
+        written as ';annotation' line in front of the row
+    """
+    n_cols = len(df.columns)
+    if isinstance(sep, str):
+        sep = [sep] * (n_cols - 1)
+    for chunk_start in range(0, len(df), chunk_size):
+        df_chunk = df.iloc[chunk_start:chunk_start+chunk_size]
+        chunk_lines = format_df_column(df_chunk.iloc[:, 0], na_rep)
+        for col_pos in range(1, n_cols):
+            chunk_lines = np.char.add(
+                np.char.add(chunk_lines, sep[col_pos-1]),
+                format_df_column(df_chunk.iloc[:, col_pos], na_rep)
+            )
+        if annotations is not None:
+            annot_chunk = annotations.iloc[chunk_start:chunk_start+chunk_size].to_numpy(dtype=object)
+            annot_pos = np.flatnonzero(pd.notna(annot_chunk))
+            if len(annot_pos) > 0:
+                chunk_lines = chunk_lines.astype(object)
+                chunk_lines[annot_pos] = [
+                    ';' + str(annot) + '\n' + line
+                    for annot, line in zip(annot_chunk[annot_pos], chunk_lines[annot_pos])
+                ]
+        file1.write('\n'.join(chunk_lines))
+        file1.write('\n')
+
+
+def write_blocks_lines(file1, df, first_row_cols=['Type']):
+    """
+    writes blocks of rows with the same name (e.g. the points of a curve);
+    the values in first_row_cols are only written in the first row of a
+    block and every block is closed with a line ';'
+    :param file file1
+    :param pd.DataFrame df: rows of a block are contiguous; the first column is the name
+    :param list first_row_cols
+    """
+    if len(df) == 0:
+        return
+    block_cols = [df.columns[0]] + first_row_cols
+    first_rows = (df[block_cols] != df[block_cols].shift()).any(axis=1).to_numpy()
+    block_df = df.assign(**{
+        col: df[col].where(first_rows, '') for col in first_row_cols
+    })
+    # the annotation line ';' of a block start closes the previous block
+    block_ends = np.full(len(df), np.nan, dtype=object)
+    block_ends[first_rows] = ''
+    block_ends[0] = np.nan
+    # missing values are written as str() does it
+    write_df_lines(
+        file1,
+        block_df,
+        na_rep='nan',
+        annotations=pd.Series(block_ends)
+    )
+    file1.write(';\n')
+
+
 def write_inp(
     inp_file_name,
     project_dir,
@@ -57,42 +201,38 @@ def write_inp(
 
     # write input file
     file_path = os.path.join(project_dir, inp_file_name) 
-    file1 = open(file_path, 'w')
+    file1 = open(file_path, 'w', buffering=2**20)
 
     # function to write      
-    def df_to_inp_section(section_name, only_cols=None):
+    def df_to_inp_section(section_name, only_cols=None, sep='    ', na_rep='NaN'):
         """
         writes a input file section from pd.Dataframe to file1
         :param str section_name
         :param list only_cols
+        :param str/list sep: delimiter(s) between the columns
+        :param str na_rep: text for missing numbers
         """
         if section_name in inp_dict.keys():
             feedback.setProgressText('writing ['+section_name+']...')
             print_df = inp_dict[section_name]['data']
-            if 'annotations' in inp_dict[section_name].keys():
-                annotations_dict = inp_dict[section_name]['annotations']
-                if len(annotations_dict) > 0:
-                    annotations_df = pd.DataFrame.from_dict(
-                        annotations_dict, 
-                        orient='index',
-                        columns=['Name']
-                    )
-                    annotations_df['Name'] = [';'+str(i) for i in annotations_df['Name']]
-                    # prepare indices for insertion
-                    replace_index = [k-0.5 for k in print_df.index if print_df.loc[k, 'Name'] in annotations_df.index]
-                    annotations_df.index = replace_index
-                    missing_cols = print_df.columns.drop('Name')
-                    annotations_df[missing_cols] = ''
-                    print_df = pd.concat(
-                        [print_df, annotations_df]
-                    )
-                    print_df = print_df.sort_index(ascending=True)
+            annotations_dict = inp_dict[section_name].get('annotations', {})
+            if len(annotations_dict) > 0:
+                # hash lookup of the annotation for every feature name
+                annotations_dict = {str(k): v for k, v in annotations_dict.items()}
+                row_annotations = print_df['Name'].astype(str).map(annotations_dict)
+            else:
+                row_annotations = None
             if only_cols is not None:
                 print_df = print_df[only_cols]
             file1.write('['+section_name+']\n')
-            file1.write(print_df.to_string(header=False, index=False))
+            write_df_lines(
+                file1,
+                print_df,
+                sep=sep,
+                na_rep=na_rep,
+                annotations=row_annotations
+            )
             file1.write('\n')
-            file1.write('\n')   
 
     # header
     df_to_inp_section('TITLE')
@@ -110,42 +250,18 @@ def write_inp(
     df_to_inp_section('JUNCTIONS')
 
     # outfalls
-    if 'OUTFALLS' in inp_dict.keys():
-        feedback.setProgressText('writing [OUTFALLS]...')
-        outfalls_df = inp_dict['OUTFALLS']['data']
-        file1.write('[OUTFALLS]\n')
-        for i in range(len(outfalls_df)):
-            outl =  outfalls_df.loc[i, :]
-            file1.write(str(outl['Name'])+'    '+
-                        str(outl['Elevation'])+'    '+
-                        str(outl['Type'])+'    '+
-                        str(outl['Data'])+'    '+
-                        str(outl['FlapGate'])+'    '+
-                        str(outl['RouteTo']))
-            file1.write('\n')
-        file1.write('\n')
+    df_to_inp_section(
+        'OUTFALLS',
+        only_cols=record_cols_dict['OUTFALLS'],
+        na_rep='nan'
+    )
 
     # dividers
-    if 'DIVIDERS' in inp_dict.keys():
-        feedback.setProgressText('writing [DIVIDERS]...')
-        dividers_df = inp_dict['DIVIDERS']['data']
-        file1.write('[DIVIDERS]\n')
-        for i in range(len(dividers_df)):
-            div =  dividers_df.loc[i, :]
-            file1.write(str(div['Name'])+'    '+
-                        str(div['Elevation'])+'    '+
-                        str(div['DivertLink'])+'    '+
-                        str(div['Type'])+'    '+
-                        str(div['CutoffFlow'])+'    '+
-                        str(div['WeirMinFlo'])+'    '+
-                        str(div['WeirMaxDep'])+'    '+
-                        str(div['WeirCoeff'])+'    '+
-                        str(div['MaxDepth'])+'    '+
-                        str(div['InitDepth'])+'    '+
-                        str(div['SurDepth'])+'    '+
-                        str(div['Aponded']))
-            file1.write('\n')  
-        file1.write('\n')    
+    df_to_inp_section(
+        'DIVIDERS',
+        only_cols=record_cols_dict['DIVIDERS'],
+        na_rep='nan'
+    )
 
     # storages
     df_to_inp_section('STORAGE')
@@ -162,23 +278,12 @@ def write_inp(
     df_to_inp_section('OUTLETS')
     
     # cross sections
-    if 'XSECTIONS' in inp_dict.keys():
-        feedback.setProgressText('writing [XSECTIONS]...')
-        xsections_df = inp_dict['XSECTIONS']['data']
-        file1.write('[XSECTIONS]\n')
-        for i in range(len(xsections_df)):
-            xscn = xsections_df.loc[i, :]
-            file1.write(str(xscn['Name'])+'   '+
-                        str(xscn['Shape'])+'    '+
-                        str(xscn['Geom1'])+'    '+
-                        str(xscn['Geom2'])+'    '+
-                        str(xscn['Geom3'])+'    '+
-                        str(xscn['Geom4'])+'    '+
-                        str(xscn['Barrels'])+'    '+
-                        str(xscn['Culvert']))
-            file1.write('\n')
-        file1.write('\n')
-
+    df_to_inp_section(
+        'XSECTIONS',
+        only_cols=record_cols_dict['XSECTIONS'],
+        sep=['   '] + ['    '] * 6,
+        na_rep='nan'
+    )
 
     # transects
     if 'TRANSECTS' in inp_dict.keys():
@@ -198,20 +303,12 @@ def write_inp(
     df_to_inp_section('INLET_USAGE')
 
     # losses
-    if 'LOSSES' in inp_dict.keys():
-        feedback.setProgressText('writing [LOSSES]...')
-        file1.write('[LOSSES]\n')
-        losses_df = inp_dict['LOSSES']['data']
-        for i in range(len(losses_df)):
-            los = losses_df.loc[i,:]
-            file1.write(str(los['Name'])+'   '+
-                        str(los['Kentry'])+'   '+
-                        str(los['Kexit'])+'   '+
-                        str(los['Kavg'])+'   '+
-                        str(los['FlapGate'])+'   '+
-                        str(los['Seepage']))
-            file1.write('\n')
-        file1.write('\n')
+    df_to_inp_section(
+        'LOSSES',
+        only_cols=record_cols_dict['LOSSES'],
+        sep='   ',
+        na_rep='nan'
+    )
 
     # quality
     if 'QUALITY' in inp_dict.keys():
@@ -220,45 +317,20 @@ def write_inp(
         for q_k in quality_dict.keys():
             q_df = quality_dict[q_k]
             file1.write('['+str(q_k)+']\n')
-            if q_df.empty:
-                pass
-            else:
-                file1.write(q_df.to_string(header=False, index=False))
-                file1.write('\n')
+            write_df_lines(file1, q_df)
             file1.write('\n')
 
-    def compose_dict_text(dict_i, section, inflow_keys_dict):
-        """writes text lines from inflows dictionaries"""
-        section_keys = inflow_keys_dict[section]
-        return ['    '.join([str(dict_i[item_key][s_k]) for s_k in section_keys])+'\n' for item_key in dict_i.keys()]
-
     # inflows
-    if 'INFLOWS' in inp_dict.keys():
-        feedback.setProgressText('writing [INFLOWS]...')
-        inflow_dict = inp_dict['INFLOWS']['data']
-        file1.write('[INFLOWS]\n')
-        file1.write(''.join(
-            compose_dict_text(
-                inflow_dict,
-                'INFLOWS',
-                inflow_keys_dict
-            )
-        ))
-        file1.write('\n')
-
-    if 'DWF' in inp_dict.keys():
-        feedback.setProgressText('writing [Dry Weather Flows]...')
-        dwf_dict = inp_dict['DWF']['data']
-        file1.write('[DWF]\n')
-        file1.write(''.join(
-            compose_dict_text(
-                dwf_dict,
-                'DWF',
-                inflow_keys_dict
-            )
-        ))
-        file1.write('\n')
-        
+    df_to_inp_section(
+        'INFLOWS',
+        only_cols=record_cols_dict['INFLOWS'],
+        na_rep='nan'
+    )
+    df_to_inp_section(
+        'DWF',
+        only_cols=record_cols_dict['DWF'],
+        na_rep='nan'
+    )
     df_to_inp_section('HYDROGRAPHS')
     df_to_inp_section('RDII')
         
@@ -266,23 +338,11 @@ def write_inp(
     # curves
     if 'CURVES' in inp_dict.keys():
         feedback.setProgressText('writing [CURVES]...')
-        curves_dict = inp_dict['CURVES']['data']
         file1.write('[CURVES]\n')
-        for curve_key in curves_dict.keys():
-            curve_dict_i = curves_dict[curve_key].copy()
-            for i in range(len(curve_dict_i['frame'])):
-                if i == 0:
-                    file1.write(curve_dict_i['Name']+'    '+
-                                curve_dict_i['Type']+'    '+
-                                str(curve_dict_i['frame'].iloc[0, 0])+'    '+
-                                str(curve_dict_i['frame'].iloc[0, 1]))
-                    file1.write('\n')
-                else:
-                    file1.write(curve_dict_i['Name']+'    '+'    '+
-                                 str(curve_dict_i['frame'].iloc[i, 0])+'    '+
-                                 str(curve_dict_i['frame'].iloc[i, 1]))
-                    file1.write('\n')
-            file1.write(';\n')
+        write_blocks_lines(
+            file1,
+            inp_dict['CURVES']['data'][['Name', 'Type', 'XVal', 'YVal']]
+        )
         file1.write('\n')
 
     # time series
@@ -294,34 +354,31 @@ def write_inp(
             ts_dict_i = timeseries_dict[ts_key].copy()
             ts_df = ts_dict_i['TimeSeries']
             file1.write(';'+ts_dict_i['Annotations']+'\n')
-            file1.write(ts_df.to_string(header=False, index=False))
-            file1.write('\n')
+            write_df_lines(file1, ts_df)
         file1.write('\n')
 
     # patterns
     if 'PATTERNS' in inp_dict.keys():
         feedback.setProgressText('writing [PATTERNS]...')
-        patterns_dict = inp_dict['PATTERNS']['data']
+        patterns_df = inp_dict['PATTERNS']['data']
         file1.write('[PATTERNS]\n')
-        for patterns_key in patterns_dict.keys():
-            patterns_dict_i = patterns_dict[patterns_key].copy()
-            if patterns_dict_i['Type'] == 'DAILY':
-                file1.write(patterns_dict_i['Name']+'    '+
-                            patterns_dict_i['Type']+'    '+
-                            '    '.join([str(j) for j in patterns_dict_i['Factors'].iloc[:, 0]]))
-                file1.write('\n')
-            else:
-                for i in range(int(len(patterns_dict_i['Factors'])/6)):
-                    if i == 0:
-                        file1.write(patterns_dict_i['Name']+'    '+
-                                    patterns_dict_i['Type']+'    '+
-                                    '    '.join([str(j) for j in patterns_dict_i['Factors'].iloc[0:6, 0]]))
-                        file1.write('\n')
-                    else:
-                        file1.write(patterns_dict_i['Name']+'    '+'    '+
-                                    '    '.join([str(j) for j in patterns_dict_i['Factors'].iloc[6*i:6*(i+1), 0]]))
-                        file1.write('\n')
-            file1.write(';\n')
+        # six factors per line; all factors of DAILY patterns in one line
+        pattern_groups = patterns_df.groupby(['Name', 'Type'], sort=False)['Factor']
+        factor_pos = pattern_groups.cumcount().to_numpy()
+        n_factors = pattern_groups.transform('size').to_numpy()
+        daily_mask = (patterns_df['Type'] == 'DAILY').to_numpy()
+        line_mask = daily_mask | (factor_pos < (n_factors // 6) * 6)
+        pattern_lines = patterns_df.assign(
+            Line=np.where(daily_mask, 0, factor_pos // 6),
+            Factor=patterns_df['Factor'].to_numpy(dtype=object).astype(str)
+        )[line_mask].groupby(
+            ['Name', 'Type', 'Line'],
+            sort=False
+        )['Factor'].agg('    '.join).reset_index()
+        write_blocks_lines(
+            file1,
+            pattern_lines[['Name', 'Type', 'Factor']]
+        )
         file1.write('\n')
 
     # report options
@@ -340,30 +397,10 @@ def write_inp(
     df_to_inp_section('COORDINATES')
 
     # line coordinates
-    if 'VERTICES' in inp_dict.keys():
-        feedback.setProgressText('writing [VERTICES]...')
-        file1.write('[VERTICES]\n')
-        vertices_dict = inp_dict['VERTICES']['data']
-        for vert_key in vertices_dict.keys():
-            vert_df = vertices_dict[vert_key].copy()
-            vert_df['vertice'] = vert_key
-            vert_df = vert_df[['vertice', 'x', 'y']]
-            file1.write(vert_df.to_string(header=False, index=False))
-            file1.write('\n')
-        file1.write('\n')
+    df_to_inp_section('VERTICES')
 
     # subcatchment polygons
-    if 'POLYGONS' in inp_dict.keys():
-        feedback.setProgressText('writing [POLYGONS]...')
-        polygons_dict = inp_dict['POLYGONS']['data']
-        file1.write('[POLYGONS]\n')
-        for pol_key in polygons_dict.keys():
-            pol_df = polygons_dict[pol_key].copy()
-            pol_df['subcatch']=pol_key
-            pol_df = pol_df[['subcatch', 'x', 'y']]
-            file1.write(pol_df.to_string(header=False, index=False))
-            file1.write('\n')
-        file1.write('\n')
+    df_to_inp_section('POLYGONS')
 
     # gage symbol
     df_to_inp_section('SYMBOLS')
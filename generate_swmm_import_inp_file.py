@@ -65,6 +65,7 @@ from .g_s_read_write_data import (
     dict_to_excel,
     create_layer_from_df
 )
+from .g_s_inp_sections import get_file_encoding
 from .g_s_import_helpers import (
     add_layer_on_completion,
     adjust_column_types,
@@ -72,8 +73,8 @@ from .g_s_import_helpers import (
     build_df_for_section,
     build_df_from_vals_list,
     del_kw_from_list,
-    extract_sections_from_text,
     insert_nan_after_kw,
+    InpSections,
     sect_list_import_handler
 )
 
@@ -89,6 +90,7 @@ class ImportInpFile (QgsProcessingAlgorithm):
     DATA_CRS = 'DATA_CRS'
     CREATE_EMPTY = 'CREATE_EMPTY'
     TRANSFORM_CRS = 'TRANSFORM_CRS'
+    PARALLEL_SECTIONS = 'PARALLEL_SECTIONS'
 
     def initAlgorithm(self, config):
         """
@@ -152,6 +154,14 @@ class ImportInpFile (QgsProcessingAlgorithm):
         self.addParameter(transform_crs)
         transform_crs.setFlags(transform_crs.flags() | QgsProcessingParameterDefinition.FlagHidden)
 
+        parallel_sections = QgsProcessingParameterBoolean(
+            self.PARALLEL_SECTIONS,
+            self.tr('Read large sections in parallel processes (for very large input files)'),
+            defaultValue=False
+        )
+        parallel_sections.setFlags(parallel_sections.flags() | QgsProcessingParameterDefinition.FlagAdvanced)
+        self.addParameter(parallel_sections)
+
     def name(self):
         return 'ImportInpFile'
 
@@ -190,6 +200,7 @@ class ImportInpFile (QgsProcessingAlgorithm):
         geodata_driver_extension = def_ogr_driver_dict[geodata_driver_name]
         create_empty = self.parameterAsBoolean(parameters, self.CREATE_EMPTY, context)
         transform_crs_string = self.parameterAsString(parameters, self.TRANSFORM_CRS, context)
+        parallel_sections = self.parameterAsBoolean(parameters, self.PARALLEL_SECTIONS, context)
 
         import_parameters_dict = {
             'folder_save': folder_save,
@@ -214,39 +225,22 @@ class ImportInpFile (QgsProcessingAlgorithm):
         # reading input text file
         feedback.setProgressText(self.tr('reading inp ...'))
         feedback.setProgress(3)
-        encodings = ['utf-8', 'windows-1250', 'windows-1252']  # add more
-        for e in encodings:
-            try:
-                with open(readfile, 'r', encoding=e) as f:
-                    inp_text = f.readlines()
-            except UnicodeDecodeError:
-                feedback.setProgressText('got unicode error with %s , trying different encoding' % e)
-            else:
-                feedback.setProgressText('opening the file with encoding:  %s ' % e)
-                break
-        
-        # delete unused lines
-        inp_text = [x for x in inp_text if x != '\n']
-        inp_text = [x for x in inp_text if x != '\r']
-        inp_text = [x for x in inp_text if not x.startswith(';;')]
-        inp_text = [x.replace('\n', '') for x in inp_text]
-        inp_text = [x.strip() for x in inp_text]
-
-        # SWMM sections in the text file
-        inp_text_sections = [i for i in inp_text if i.startswith('[') and i.endswith(']')]
-        pos_start_list = [inp_text.index(sect) for sect in inp_text_sections]
-        pos_end_list = pos_start_list[1:]+[len(inp_text)]
-        
-        # make a dict of sections to extract
-        dict_search = {
-            s[1:-1].upper(): [
-                pos_start_list[i],
-                pos_end_list[i]
-            ] for i, s in enumerate(inp_text_sections) if s[1:-1].upper() in def_sections_dict.keys()
-        }
-        
+        inp_encoding = get_file_encoding(readfile)
+        if inp_encoding is None:
+            raise QgsProcessingException(
+                'The encoding of the input file could not be detected'
+            )
+        feedback.setProgressText('opening the file with encoding:  %s ' % inp_encoding)
+
+        # dict for raw values for every section; the sections are
+        # extracted from the memory-mapped file when they are needed
+        dict_all_vals = InpSections(readfile, inp_encoding)
+        unknown_sections = dict_all_vals.unknown_sections
+        if parallel_sections:
+            feedback.setProgressText(self.tr('reading large sections in parallel processes ...'))
+            dict_all_vals.extract_sections_parallel(feedback)
+
         # sections which are not available
-        unknown_sections = [s for s in inp_text_sections if not s[1:-1].upper() in def_sections_dict.keys()]
         if len(unknown_sections) > 0:
             feedback.pushWarning(
                             'Warning: unknown sections in input file: '
@@ -254,15 +248,6 @@ class ImportInpFile (QgsProcessingAlgorithm):
                             + 'These sections will be ignored'
                         )
 
-        # dict for raw values for every section
-        dict_all_vals = {
-            k: extract_sections_from_text(
-                inp_text,
-                dict_search[k],
-                k
-            ) for k in dict_search.keys()
-        }  
-        
         # sections which will be converted into tables
         # --------------------------------------------
         dict_res_table = {}
@@ -317,11 +302,7 @@ class ImportInpFile (QgsProcessingAlgorithm):
                 'HYDROGRAPHS',
                 dict_all_vals
             )
-            hg_name_list = np.unique(df_hydrographs_raw['Name'])
-            df_hydrographs = pd.DataFrame()
-            for hg_name in hg_name_list:
-                df_hydrographs = pd.concat([df_hydrographs, get_hydrogrphs(hg_name)])
-            df_hydrographs = df_hydrographs.reset_index(drop=True)
+            df_hydrographs = get_hydrogrphs(df_hydrographs_raw)
         else:
             df_hydrographs = build_df_from_vals_list(
                 [],
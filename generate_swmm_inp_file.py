@@ -37,6 +37,8 @@ from qgis.PyQt.QtCore import QCoreApplication
 from qgis.core import (
     QgsProcessing,
     QgsProcessingAlgorithm,
+    QgsProcessingParameterBoolean,
+    QgsProcessingParameterDefinition,
     QgsProcessingParameterFile,
     QgsProcessingParameterFileDestination,
     QgsProcessingParameterVectorLayer
@@ -53,6 +55,17 @@ from .g_s_read_write_data import (
     read_data_from_table_direct,
     read_layers_direct
 )
+from .g_s_table_functions import del_first_last_vt
+from .g_s_section_cache import (
+    BlockFeedback,
+    combine_block_sections,
+    def_section_blocks_sources,
+    get_block_keys,
+    get_cached_block,
+    get_source_fingerprint,
+    merge_block_sections,
+    set_cached_block
+)
 
 
 class GenerateSwmmInpFile(QgsProcessingAlgorithm):
@@ -79,6 +92,8 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
     FILE_QUALITY = 'FILE_QUALITY'
     FILE_TRANSECTS = 'FILE_TRANSECTS'
     FILE_STREETS = 'FILE_STREETS'
+    LOAD_CONCURRENTLY = 'LOAD_CONCURRENTLY'
+    USE_SECTION_CACHE = 'USE_SECTION_CACHE'
 
     def initAlgorithm(self, config):
         """
@@ -251,6 +266,20 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
                 fileFilter='Tables (*.xlsx *.xls *.odf)'
             )
         )
+        load_concurrently = QgsProcessingParameterBoolean(
+            self.LOAD_CONCURRENTLY,
+            self.tr('Load layers concurrently (e.g. for layers on network storage)'),
+            defaultValue=False
+        )
+        load_concurrently.setFlags(load_concurrently.flags() | QgsProcessingParameterDefinition.FlagAdvanced)
+        self.addParameter(load_concurrently)
+        use_section_cache = QgsProcessingParameterBoolean(
+            self.USE_SECTION_CACHE,
+            self.tr('Reuse sections of unchanged layers and tables from the previous run'),
+            defaultValue=False
+        )
+        use_section_cache.setFlags(use_section_cache.flags() | QgsProcessingParameterDefinition.FlagAdvanced)
+        self.addParameter(use_section_cache)
 
     def processAlgorithm(self, parameters, context, feedback):
         """
@@ -273,16 +302,8 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
         """
         inp_dict = dict()
         inp_dict['TITLE'] = {'data': pd.DataFrame(['test'])}
-        inp_dict['XSECTIONS'] = {
-            'data': pd.DataFrame(),
-            'annotations': {}
-        } 
-        inp_dict['COORDINATES'] = {'data': pd.DataFrame()}
-        inp_dict['VERTICES'] = {'data': dict()}
 
-        # reading geodata
-        feedback.setProgressText(self.tr('Reading shapfiles'))
-        feedback.setProgress(1)
+        # input layers and table files
         file_raingages = self.parameterAsVectorLayer(parameters, self.FILE_RAINGAGES, context)
         file_outfalls = self.parameterAsVectorLayer(parameters, self.FILE_OUTFALLS, context)
         file_storages = self.parameterAsVectorLayer(parameters, self.FILE_STORAGES, context)
@@ -307,6 +328,48 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
             'outlets_raw': file_outlets,
             'dividers_raw': file_dividers
         }
+        file_curves = self.parameterAsString(parameters, self.FILE_CURVES, context)
+        file_patterns = self.parameterAsString(parameters, self.FILE_PATTERNS, context)
+        file_options = self.parameterAsString(parameters, self.FILE_OPTIONS, context)
+        file_timeseries = self.parameterAsString(parameters, self.FILE_TIMESERIES, context)
+        file_inflows = self.parameterAsString(parameters, self.FILE_INFLOWS, context)
+        file_quality = self.parameterAsString(parameters, self.FILE_QUALITY, context)
+        file_transects = self.parameterAsString(parameters, self.FILE_TRANSECTS, context)
+        file_streets = self.parameterAsString(parameters, self.FILE_STREETS, context)
+        table_files_dict = {
+            'options': file_options,
+            'curves': file_curves,
+            'patterns': file_patterns,
+            'inflows': file_inflows,
+            'timeseries': file_timeseries,
+            'quality': file_quality,
+            'transects': file_transects,
+            'streets': file_streets
+        }
+
+        # sections of unchanged sources are taken from previous runs
+        use_section_cache = self.parameterAsBoolean(parameters, self.USE_SECTION_CACHE, context)
+        if use_section_cache:
+            sources_fingerprints = {
+                n: get_source_fingerprint(s) for n, s in raw_layers_dict.items()
+            }
+            sources_fingerprints.update({
+                n: get_source_fingerprint(f) for n, f in table_files_dict.items()
+            })
+            block_keys = get_block_keys(sources_fingerprints)
+        else:
+            block_keys = {b: None for b in def_section_blocks_sources.keys()}
+        cached_blocks = {
+            b: get_cached_block(b, k) for b, k in block_keys.items()
+        }
+        needed_sources = set()
+        for block_name, block_sources in def_section_blocks_sources.items():
+            if cached_blocks[block_name] is None:
+                needed_sources.update(block_sources)
+
+        # reading geodata
+        feedback.setProgressText(self.tr('Reading shapfiles'))
+        feedback.setProgress(1)
         raw_layers_crs_list = [
             v.crs().authid() for v in raw_layers_dict.values() if v is not None
         ]
@@ -315,29 +378,28 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
             feedback.pushWarning(
                 'Warning: different CRS in the selected layers.'
                 + 'This may lead to unexpected locations in SWMM')
-        raw_data_dict = read_layers_direct(raw_layers_dict)
+        load_concurrently = self.parameterAsBoolean(parameters, self.LOAD_CONCURRENTLY, context)
+        raw_data_dict = read_layers_direct(
+            {n: l for n, l in raw_layers_dict.items() if n in needed_sources},
+            concurrent=load_concurrently
+        )
         feedback.setProgressText(self.tr('done \n'))
         feedback.setProgress(12)
 
         # reading data in tables (curves, patterns, inflows ...)
         feedback.setProgressText(self.tr('Reading tables'))
-        file_curves = self.parameterAsString(parameters, self.FILE_CURVES, context)
-        file_patterns = self.parameterAsString(parameters, self.FILE_PATTERNS, context)
-        file_options = self.parameterAsString(parameters, self.FILE_OPTIONS, context)
-        file_timeseries = self.parameterAsString(parameters, self.FILE_TIMESERIES, context)
-        file_inflows = self.parameterAsString(parameters, self.FILE_INFLOWS, context)
-        file_quality = self.parameterAsString(parameters, self.FILE_QUALITY, context)
-        file_transects = self.parameterAsString(parameters, self.FILE_TRANSECTS, context)
-        file_streets = self.parameterAsString(parameters, self.FILE_STREETS, context)
+        table_files_dict = {
+            n: f for n, f in table_files_dict.items() if n in needed_sources
+        }
 
         # options table
-        if file_options != '':
+        if table_files_dict.get('options', '') != '':
             raw_data_dict['options_df'] = read_data_from_table_direct(
                 file_options,
                 sheet='OPTIONS'
             )
         # curves table
-        if file_curves != '':
+        if table_files_dict.get('curves', '') != '':
             raw_data_dict['curves'] = {}
             for curve_type in def_curve_types:
                 curve_df = read_data_from_table_direct(
@@ -347,7 +409,7 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
                 if len(curve_df) > 0:
                     raw_data_dict['curves'][curve_type] = curve_df
         # patterns table
-        if file_patterns != '':
+        if table_files_dict.get('patterns', '') != '':
             raw_data_dict['patterns'] = {}
             for pattern_type in ['HOURLY', 'DAILY', 'MONTHLY', 'WEEKEND']:
                 raw_data_dict['patterns'][pattern_type] = read_data_from_table_direct(
@@ -355,7 +417,7 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
                     sheet=pattern_type
                 )
         # inflows table
-        if file_inflows != '':
+        if table_files_dict.get('inflows', '') != '':
             raw_data_dict['inflows'] = {}
             for inflow_type in ['Direct', 'Dry_Weather', 'Hydrographs', 'RDII']:
                 raw_data_dict['inflows'][inflow_type] = read_data_from_table_direct(
@@ -363,12 +425,12 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
                     sheet=inflow_type
                 )
         # timeseries table
-        if file_timeseries != '':
+        if table_files_dict.get('timeseries', '') != '':
             raw_data_dict['timeseries'] = read_data_from_table_direct(
                 file_timeseries
             )
         # quality table
-        if file_quality != '':
+        if table_files_dict.get('quality', '') != '':
             raw_data_dict['quality'] = {}
             for quality_param in ['POLLUTANTS', 'LANDUSES', 'COVERAGES', 'LOADINGS']:
                 raw_data_dict['quality'][quality_param] = read_data_from_table_direct(
@@ -376,7 +438,7 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
                     sheet=quality_param
                 )
         # transects table
-        if file_transects != '':
+        if table_files_dict.get('transects', '') != '':
             raw_data_dict['transects'] = {}
             for transects_param in ['Data', 'XSections']:
                 raw_data_dict['transects'][transects_param] = read_data_from_table_direct(
@@ -384,7 +446,7 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
                     sheet=transects_param
                 )
         # streets table
-        if file_streets != '':
+        if table_files_dict.get('streets', '') != '':
             raw_data_dict['streets'] = {}
             for streets_param in ['STREETS', 'INLETS', 'INLET_USAGE']:
                 raw_data_dict['streets'][streets_param] = read_data_from_table_direct(
@@ -394,7 +456,7 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
         feedback.setProgressText(self.tr('done \n'))
         feedback.setProgress(20)
         feedback.setProgressText(self.tr('preparing data for input file:'))
-        
+
         # function for annotations / descriptions
         def get_annotations_from_raw_df(df_raw):
             if annotation_field_name in df_raw.columns:
@@ -405,9 +467,45 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
                 annot_dict = {}
             return annot_dict
 
+        # every block returns its sections and additional values for other blocks
+        block_extras = {
+            'main_infiltration_method': None,
+            'all_nodes': list()
+        }
+
+        def run_block(block_name, build_function):
+            """
+            takes the sections of a block from section_cache or builds them
+            and adds them to inp_dict
+            :param str block_name
+            :param function build_function: takes the feedback and returns (block_sections, extras)
+            """
+            if cached_blocks[block_name] is None:
+                block_feedback = BlockFeedback(feedback)
+                block_sections, extras = build_function(block_feedback)
+                set_cached_block(
+                    block_name,
+                    block_keys[block_name],
+                    block_sections,
+                    extras,
+                    block_feedback.messages
+                )
+            else:
+                feedback.setProgressText(self.tr('[' + block_name + '] section (unchanged)'))
+                block_sections, extras, block_messages = cached_blocks[block_name]
+                # warnings of the previous run are still valid for the unchanged data
+                for feedback_method, message_text in block_messages:
+                    getattr(feedback, feedback_method)(message_text)
+            merge_block_sections(inp_dict, block_sections)
+            if 'node_names' in extras.keys():
+                block_extras['all_nodes'] = block_extras['all_nodes'] + extras['node_names']
+            else:
+                block_extras.update(extras)
+
         # options
-        main_infiltration_method = None
-        if 'options_df' in raw_data_dict.keys():
+        def build_options(feedback):
+            if 'options_df' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[OPTIONS] section'))
             from .g_s_options import get_options_from_table
             check_columns(
@@ -416,10 +514,16 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
                 raw_data_dict['options_df'].keys()
             )
             options_df, main_infiltration_method = get_options_from_table(raw_data_dict['options_df'].copy())
-            inp_dict['OPTIONS'] = {'data': options_df}
+            return (
+                {'OPTIONS': {'data': options_df}},
+                {'main_infiltration_method': main_infiltration_method}
+            )
+        run_block('OPTIONS', build_options)
 
         # subcatchments
-        if 'subcatchments_raw' in raw_data_dict.keys():
+        def build_subcatchments(feedback):
+            if 'subcatchments_raw' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[SUBCATCHMENTS] section'))
             from .g_s_subcatchments import get_subcatchments_from_layer
             # check if all columns exist
@@ -432,125 +536,157 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
             )
             subcatchments_df, subareas_df, infiltration_df = get_subcatchments_from_layer(
                 raw_data_dict['subcatchments_raw'].copy(),
-                main_infiltration_method
+                block_extras['main_infiltration_method']
             )
-            inp_dict['POLYGONS'] = {'data':
-                get_coords_from_geometry(raw_data_dict['subcatchments_raw'])
-            }
             subcatchments_annot = get_annotations_from_raw_df(
                 raw_data_dict['subcatchments_raw'].copy()
             )
-            inp_dict['SUBCATCHMENTS'] = {
-                'data': subcatchments_df,
-                'annotations': subcatchments_annot
+            block_sections = {
+                'POLYGONS': {'data':
+                    get_coords_from_geometry(raw_data_dict['subcatchments_raw'])
+                },
+                'SUBCATCHMENTS': {
+                    'data': subcatchments_df,
+                    'annotations': subcatchments_annot
+                },
+                'SUBAREAS': {'data': subareas_df},
+                'INFILTRATION': {'data': infiltration_df}
             }
-            inp_dict['SUBAREAS'] = {'data': subareas_df}
-            inp_dict['INFILTRATION'] = {'data': infiltration_df}
+            return block_sections, {}
+        run_block('SUBCATCHMENTS', build_subcatchments)
 
         # conduits
-        if 'conduits_raw' in raw_data_dict.keys():
+        def build_conduits(feedback):
+            if 'conduits_raw' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[CONDUITS] section'))
-            from .g_s_links import get_conduits_from_shapefile, del_first_last_vt
+            from .g_s_links import get_conduits_from_shapefile
             conduits_df, xsections_df, losses_df = get_conduits_from_shapefile(raw_data_dict['conduits_raw'].copy())
             conduits_verts = get_coords_from_geometry(raw_data_dict['conduits_raw'].copy())
-            conduits_verts = {k: del_first_last_vt(v) for k, v in conduits_verts.items() if len(v) > 2}  # first and last vertices are in nodes coordinates anyway
-            inp_dict['VERTICES']['data'].update(conduits_verts)
+            conduits_verts = del_first_last_vt(conduits_verts)  # first and last vertices are in nodes coordinates anyway
             conduits_annot = get_annotations_from_raw_df(
                 raw_data_dict['conduits_raw'].copy()
             )
-            inp_dict['CONDUITS'] = {
-                'data': conduits_df,
-                'annotations': conduits_annot
+            block_sections = {
+                'VERTICES': {'data': conduits_verts},
+                'CONDUITS': {
+                    'data': conduits_df,
+                    'annotations': conduits_annot
+                },
+                'XSECTIONS': {'data': xsections_df},
+                'LOSSES': {'data': losses_df}
             }
-            inp_dict['XSECTIONS'] = {'data': xsections_df}
-            inp_dict['LOSSES'] = {'data': losses_df}
+            return block_sections, {}
+        run_block('CONDUITS', build_conduits)
 
         # pumps
-        if 'pumps_raw' in raw_data_dict.keys():
+        def build_pumps(feedback):
+            if 'pumps_raw' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[PUMPS] section'))
-            from .g_s_links import get_pumps_from_shapefile, del_first_last_vt
+            from .g_s_links import get_pumps_from_shapefile
             pumps_df = get_pumps_from_shapefile(raw_data_dict['pumps_raw'].copy())
             pumps_annot = get_annotations_from_raw_df(
                 raw_data_dict['pumps_raw'].copy()
             )
             pumps_verts = get_coords_from_geometry(raw_data_dict['pumps_raw'].copy())
-            pumps_verts = {k: del_first_last_vt(v) for k, v in pumps_verts.items() if len(v) > 2}
+            pumps_verts = del_first_last_vt(pumps_verts)
             pumps_inp_cols = def_sections_dict['PUMPS']
-            inp_dict['VERTICES']['data'].update(pumps_verts)
-            inp_dict['PUMPS'] = {
-                'data': pumps_df[pumps_inp_cols],
-                'annotations': pumps_annot
+            block_sections = {
+                'VERTICES': {'data': pumps_verts},
+                'PUMPS': {
+                    'data': pumps_df[pumps_inp_cols],
+                    'annotations': pumps_annot
+                }
             }
+            return block_sections, {}
+        run_block('PUMPS', build_pumps)
 
         # weirs
-        if 'weirs_raw' in raw_data_dict.keys():
+        def build_weirs(feedback):
+            if 'weirs_raw' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[WEIRS] section'))
-            from .g_s_links import get_weirs_from_shapefile, del_first_last_vt
+            from .g_s_links import get_weirs_from_shapefile
             weirs_df, xsections_df = get_weirs_from_shapefile(raw_data_dict['weirs_raw'])
             weirs_annot = get_annotations_from_raw_df(
                 raw_data_dict['weirs_raw'].copy()
             )
             weirs_verts = get_coords_from_geometry(raw_data_dict['weirs_raw'].copy())
-            weirs_verts = {k: del_first_last_vt(v) for k, v in weirs_verts.items() if len(v) > 2}  # first and last vertices are in nodes coordinates anyway
-            inp_dict['VERTICES']['data'].update(weirs_verts)
-            inp_dict['XSECTIONS']['data'] = pd.concat(
-                [inp_dict['XSECTIONS']['data'], xsections_df],
-                ignore_index = True
-            )
-            inp_dict['WEIRS'] = {
-                'data': weirs_df,
-                'annotations': weirs_annot
+            weirs_verts = del_first_last_vt(weirs_verts)  # first and last vertices are in nodes coordinates anyway
+            block_sections = {
+                'VERTICES': {'data': weirs_verts},
+                'XSECTIONS': {'data': xsections_df},
+                'WEIRS': {
+                    'data': weirs_df,
+                    'annotations': weirs_annot
+                }
             }
+            return block_sections, {}
+        run_block('WEIRS', build_weirs)
 
         # outlets
-        if 'outlets_raw' in raw_data_dict.keys():
+        def build_outlets(feedback):
+            if 'outlets_raw' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[OUTLETS] section'))
-            from .g_s_links import get_outlets_from_shapefile, del_first_last_vt
+            from .g_s_links import get_outlets_from_shapefile
             outlets_annot = get_annotations_from_raw_df(
                 raw_data_dict['outlets_raw'].copy()
-            )            
-            inp_dict['OUTLETS'] = {
-                'data': get_outlets_from_shapefile(raw_data_dict['outlets_raw']),
-                'annotations': outlets_annot
-            }
+            )
             outlets_verts = get_coords_from_geometry(raw_data_dict['outlets_raw'].copy())
-            outlets_verts = {k: del_first_last_vt(v) for k, v in outlets_verts.items() if len(v) > 2}
-            inp_dict['VERTICES']['data'].update(outlets_verts)
+            outlets_verts = del_first_last_vt(outlets_verts)
+            block_sections = {
+                'OUTLETS': {
+                    'data': get_outlets_from_shapefile(raw_data_dict['outlets_raw']),
+                    'annotations': outlets_annot
+                },
+                'VERTICES': {'data': outlets_verts}
+            }
+            return block_sections, {}
+        run_block('OUTLETS', build_outlets)
 
         # optional: transects for conduits or weirs
-        if 'conduits_raw' in raw_data_dict.keys() or 'weirs_raw' in raw_data_dict.keys():
-            if 'transects' in raw_data_dict.keys():
-                feedback.setProgressText(self.tr('[TRANSECTS] section'))
-                from .g_s_links import get_transects_from_table
-                transects_string_list = get_transects_from_table(raw_data_dict['transects'].copy())
-                inp_dict['TRANSECTS'] = {'data': transects_string_list}
+        def build_transects(feedback):
+            if 'conduits_raw' not in raw_data_dict.keys() and 'weirs_raw' not in raw_data_dict.keys():
+                return {}, {}
+            if 'transects' not in raw_data_dict.keys():
+                return {}, {}
+            feedback.setProgressText(self.tr('[TRANSECTS] section'))
+            from .g_s_links import get_transects_from_table
+            transects_string_list = get_transects_from_table(raw_data_dict['transects'].copy())
+            return {'TRANSECTS': {'data': transects_string_list}}, {}
+        run_block('TRANSECTS', build_transects)
 
         # orifices
-        if 'orifices_raw' in raw_data_dict.keys():
+        def build_orifices(feedback):
+            if 'orifices_raw' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[ORIFICES] section'))
-            from .g_s_links import get_orifices_from_shapefile, del_first_last_vt
+            from .g_s_links import get_orifices_from_shapefile
             orifices_df, xsections_df = get_orifices_from_shapefile(raw_data_dict['orifices_raw'])
             orifices_annot = get_annotations_from_raw_df(
                 raw_data_dict['orifices_raw'].copy()
             )
             orifices_verts = get_coords_from_geometry(raw_data_dict['orifices_raw'].copy())
-            orifices_verts = {k: del_first_last_vt(v) for k, v in orifices_verts.items() if len(v) > 2}  # first and last vertices are in nodes coordinates anyway
-            inp_dict['VERTICES']['data'].update(orifices_verts)
-            inp_dict['XSECTIONS']['data'] = pd.concat(
-                [inp_dict['XSECTIONS']['data'], xsections_df],
-                ignore_index = True
-            )
-            inp_dict['XSECTIONS']['data'] = inp_dict['XSECTIONS']['data'].reset_index(drop=True)
-            inp_dict['ORIFICES'] = {
-                'data': orifices_df,
-                'annotations': orifices_annot
+            orifices_verts = del_first_last_vt(orifices_verts)  # first and last vertices are in nodes coordinates anyway
+            block_sections = {
+                'VERTICES': {'data': orifices_verts},
+                'XSECTIONS': {'data': xsections_df},
+                'ORIFICES': {
+                    'data': orifices_df,
+                    'annotations': orifices_annot
+                }
             }
+            return block_sections, {}
+        run_block('ORIFICES', build_orifices)
 
         feedback.setProgress(40)
 
         # nodes (junctions, outfalls, orifices)
-        all_nodes = list()
-        if 'junctions_raw' in raw_data_dict.keys():
+        def build_junctions(feedback):
+            if 'junctions_raw' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[JUNCTIONS] section'))
             # check columns
             junctions_cols = list(def_qgis_fields_dict['JUNCTIONS'].keys())
@@ -572,16 +708,19 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
             junctions_df['X_Coord'], junctions_df['Y_Coord'] = get_coords_from_geometry(junctions_df)
             junctions_coords = junctions_df[['Name', 'X_Coord', 'Y_Coord']]
             junctions_inp_cols = def_sections_dict['JUNCTIONS']
-            inp_dict['JUNCTIONS'] = {
-                'data': junctions_df[junctions_inp_cols],
-                'annotations': junctions_annot
+            block_sections = {
+                'JUNCTIONS': {
+                    'data': junctions_df[junctions_inp_cols],
+                    'annotations': junctions_annot
+                },
+                'COORDINATES': {'data': junctions_coords}
             }
-            inp_dict['COORDINATES']['data'] = pd.concat(
-                [inp_dict['COORDINATES']['data'], junctions_coords],
-                ignore_index = True
-            )
-            all_nodes = all_nodes+junctions_df['Name'].tolist()
-        if 'outfalls_raw' in raw_data_dict.keys():
+            return block_sections, {'node_names': junctions_df['Name'].tolist()}
+        run_block('JUNCTIONS', build_junctions)
+
+        def build_outfalls(feedback):
+            if 'outfalls_raw' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[OUTFALLS] section'))
             outfalls_cols = list(def_qgis_fields_dict['OUTFALLS'].keys())
             outfalls_layer_name = 'Outfalls Layer'
@@ -597,16 +736,19 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
             outfalls_annot = get_annotations_from_raw_df(
                 raw_data_dict['outfalls_raw'].copy()
             )
-            inp_dict['OUTFALLS'] = {
-                'data': outfalls_df,
-                'annotations': outfalls_annot
+            block_sections = {
+                'OUTFALLS': {
+                    'data': outfalls_df,
+                    'annotations': outfalls_annot
+                },
+                'COORDINATES': {'data': outfalls_coords}
             }
-            inp_dict['COORDINATES']['data'] = pd.concat(
-                [inp_dict['COORDINATES']['data'], outfalls_coords],
-                ignore_index = True
-            )
-            all_nodes = all_nodes+outfalls_df['Name'].tolist()
-        if 'storages_raw' in raw_data_dict.keys():
+            return block_sections, {'node_names': outfalls_df['Name'].tolist()}
+        run_block('OUTFALLS', build_outfalls)
+
+        def build_storages(feedback):
+            if 'storages_raw' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[STORAGES] section'))
             # check columns is performed within get_storages_from_geodata for different storage types
             from .g_s_nodes import get_storages_from_geodata
@@ -623,16 +765,19 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
                 'Ksat','IMD'
             ]
             storage_df = storage_df[storage_inp_cols]
-            inp_dict['COORDINATES']['data'] = pd.concat(
-                [inp_dict['COORDINATES']['data'], storage_coords],
-                ignore_index = True
-            )
-            inp_dict['STORAGE'] = {
-                'data': storage_df,
-                'annotations': storage_annot
+            block_sections = {
+                'COORDINATES': {'data': storage_coords},
+                'STORAGE': {
+                    'data': storage_df,
+                    'annotations': storage_annot
+                }
             }
-            all_nodes = all_nodes+storage_df['Name'].tolist()
-        if 'dividers_raw' in raw_data_dict.keys():
+            return block_sections, {'node_names': storage_df['Name'].tolist()}
+        run_block('STORAGE', build_storages)
+
+        def build_dividers(feedback):
+            if 'dividers_raw' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[DIVIDERS] section'))
             dividers_df = raw_data_dict['dividers_raw'].copy()
             dividers_df['X_Coord'], dividers_df['Y_Coord'] = get_coords_from_geometry(dividers_df)
@@ -652,113 +797,143 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
                 raw_data_dict['dividers_raw'].copy()
             )
             dividers_coords = dividers_df[['Name', 'X_Coord', 'Y_Coord']]
-            inp_dict['DIVIDERS'] = {
-                'data': dividers_df,
-                'annotations': dividers_annot
+            block_sections = {
+                'DIVIDERS': {
+                    'data': dividers_df,
+                    'annotations': dividers_annot
+                },
+                'COORDINATES': {'data': dividers_coords}
             }
-            inp_dict['COORDINATES']['data'] = pd.concat(
-                [inp_dict['COORDINATES']['data'], dividers_coords],
-                ignore_index = True
-            )
-            all_nodes = all_nodes+dividers_df['Name'].tolist()
+            return block_sections, {'node_names': dividers_df['Name'].tolist()}
+        run_block('DIVIDERS', build_dividers)
         feedback.setProgress(50)
 
         # inflows
-        if len(all_nodes) > 0:
-            if 'inflows' in raw_data_dict.keys():
-                feedback.setProgressText(self.tr('[INFLOWS] section'))
-                from .g_s_nodes import get_inflows_from_table
-                dwf_dict, inflow_dict, hydrogr_df, rdii_df = get_inflows_from_table(
-                    raw_data_dict['inflows'],
-                    all_nodes,
-                    feedback
-                )
-                if len(inflow_dict) > 0:
-                    inp_dict['INFLOWS'] = {'data': inflow_dict}
-                if len(dwf_dict) > 0:
-                    inp_dict['DWF'] = {'data': dwf_dict}
-                if len(hydrogr_df) > 0:
-                    inp_dict['HYDROGRAPHS'] = {'data': hydrogr_df}
-                if len(rdii_df) > 0:
-                    if len (hydrogr_df) == 0:
+        def build_inflows(feedback):
+            all_nodes = block_extras['all_nodes']
+            if len(all_nodes) == 0 or 'inflows' not in raw_data_dict.keys():
+                return {}, {}
+            feedback.setProgressText(self.tr('[INFLOWS] section'))
+            from .g_s_nodes import get_inflows_from_table
+            dwf_df, inflow_df, hydrogr_df, rdii_df = get_inflows_from_table(
+                raw_data_dict['inflows'],
+                all_nodes,
+                feedback
+            )
+            block_sections = {}
+            if len(inflow_df) > 0:
+                block_sections['INFLOWS'] = {'data': inflow_df}
+            if len(dwf_df) > 0:
+                block_sections['DWF'] = {'data': dwf_df}
+            if len(hydrogr_df) > 0:
+                block_sections['HYDROGRAPHS'] = {'data': hydrogr_df}
+            if len(rdii_df) > 0:
+                if len (hydrogr_df) == 0:
+                    feedback.pushWarning(
+                        'Warning: No hydrographs were provided for RDII'
+                        + '. Please check if the correct file was selected '
+                        + 'and the \"Hydrographs\" table is set up correctly. '
+                        + 'The RDII section will not be written into the input file '
+                        + 'to avoid errors in SWMM.'
+                    )
+                else:
+                    needed_U_H = list(rdii_df['UnitHydrograph'])
+                    misshing_U_H = [h for h in needed_U_H if h not in list(hydrogr_df['Name'])]
+                    if len (misshing_U_H) > 0:
                         feedback.pushWarning(
-                            'Warning: No hydrographs were provided for RDII'
-                            + '. Please check if the correct file was selected '
+                            'Warning: Missing hydrographs for RDII: '
+                            + ', '.join([str(x) for x in misshing_U_H])
+                            + '. \nPlease check if the correct file was selected '
                             + 'and the \"Hydrographs\" table is set up correctly. '
                             + 'The RDII section will not be written into the input file '
                             + 'to avoid errors in SWMM.'
                         )
                     else:
-                        needed_U_H = list(rdii_df['UnitHydrograph'])
-                        misshing_U_H = [h for h in needed_U_H if h not in list(hydrogr_df['Name'])]
-                        if len (misshing_U_H) > 0:
-                            feedback.pushWarning(
-                                'Warning: Missing hydrographs for RDII: '
-                                + ', '.join([str(x) for x in misshing_U_H])
-                                + '. \nPlease check if the correct file was selected '
-                                + 'and the \"Hydrographs\" table is set up correctly. '
-                                + 'The RDII section will not be written into the input file '
-                                + 'to avoid errors in SWMM.'
-                            )
-                        else:
-                            inp_dict['RDII'] = {'data': rdii_df}
+                        block_sections['RDII'] = {'data': rdii_df}
+            return block_sections, {}
+        run_block('INFLOWS', build_inflows)
         feedback.setProgress(55)
 
         # Streets and inlets
-        if 'streets' in raw_data_dict.keys():
+        def build_streets(feedback):
+            if 'streets' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[STREETS] and [INLETS] section'))
             from .g_s_links import get_street_from_tables
             streets_df, inlets_df, inlet_usage_df = get_street_from_tables(
                 raw_data_dict['streets']
             )
+            block_sections = {}
             if len(streets_df) > 0:
-                inp_dict['STREETS'] = {'data': streets_df}
+                block_sections['STREETS'] = {'data': streets_df}
             if len(inlets_df) > 0:
-                inp_dict['INLETS'] = {'data': inlets_df}
+                block_sections['INLETS'] = {'data': inlets_df}
             if len(inlet_usage_df) > 0:
-                inp_dict['INLET_USAGE'] = {'data': inlet_usage_df}
+                block_sections['INLET_USAGE'] = {'data': inlet_usage_df}
+            return block_sections, {}
+        run_block('STREETS', build_streets)
 
         # Curves
-        if 'curves' in raw_data_dict.keys():
+        def build_curves(feedback):
+            if 'curves' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[CURVES] section'))
             from .g_s_various_functions import get_curves_from_table
-            inp_dict['CURVES'] = {
-                'data': get_curves_from_table(
-                    raw_data_dict['curves'],
-                    name_col='Name'
-                )
+            block_sections = {
+                'CURVES': {
+                    'data': get_curves_from_table(
+                        raw_data_dict['curves'],
+                        name_col='Name'
+                    )
+                }
             }
+            return block_sections, {}
+        run_block('CURVES', build_curves)
         feedback.setProgress(60)
 
         # patterns
-        if 'patterns' in raw_data_dict.keys():
+        def build_patterns(feedback):
+            if 'patterns' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[PATTERNS] section'))
             from .g_s_various_functions import get_patterns_from_table
-            inp_dict['PATTERNS'] = {
-                'data': get_patterns_from_table(
-                    raw_data_dict['patterns'],
-                    name_col='Name'
-                )
+            block_sections = {
+                'PATTERNS': {
+                    'data': get_patterns_from_table(
+                        raw_data_dict['patterns'],
+                        name_col='Name'
+                    )
+                }
             }
+            return block_sections, {}
+        run_block('PATTERNS', build_patterns)
         feedback.setProgress(65)
 
         # time series
-        if 'timeseries' in raw_data_dict.keys():
+        def build_timeseries(feedback):
+            if 'timeseries' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[TIMESERIES] section'))
             from .g_s_various_functions import get_timeseries_from_table
-            inp_dict['TIMESERIES'] = {
-                'data': get_timeseries_from_table(
-                    raw_data_dict['timeseries'],
-                    name_col='Name',
-                    feedback=feedback
-                )
+            block_sections = {
+                'TIMESERIES': {
+                    'data': get_timeseries_from_table(
+                        raw_data_dict['timeseries'],
+                        name_col='Name',
+                        feedback=feedback
+                    )
+                }
             }
+            return block_sections, {}
+        run_block('TIMESERIES', build_timeseries)
         feedback.setProgress(70)
 
         # rain gages
-        from .g_s_subcatchments import get_raingage_from_qgis_row
-        if 'raingages_raw' in raw_data_dict.keys():
+        def build_raingages(feedback):
+            if 'raingages_raw' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[RAINGAGES] section'))
+            from .g_s_subcatchments import get_raingage_from_qgis_row
             rg_cols = list(def_qgis_fields_dict['RAINGAGES'].keys())
             rg_features_df = raw_data_dict['raingages_raw']
             check_columns(
@@ -777,34 +952,41 @@ class GenerateSwmmInpFile(QgsProcessingAlgorithm):
             rg_symbols_df = rg_features_df[['Name', 'X_Coord', 'Y_Coord']]
             rg_inp_cols = def_sections_dict['RAINGAGES']
             rg_features_df = rg_features_df[rg_inp_cols]
-            inp_dict['RAINGAGES'] = {
-                'data': rg_features_df,
-                'annotations': raingages_annot
+            block_sections = {
+                'RAINGAGES': {
+                    'data': rg_features_df,
+                    'annotations': raingages_annot
+                },
+                'SYMBOLS': {'data': rg_symbols_df}
             }
-            inp_dict['SYMBOLS'] = {'data': rg_symbols_df}
+            return block_sections, {}
+        run_block('RAINGAGES', build_raingages)
 
         # quality
-        if 'quality' in raw_data_dict.keys():
+        def build_quality(feedback):
+            if 'quality' not in raw_data_dict.keys():
+                return {}, {}
             feedback.setProgressText(self.tr('[POLLUTANTS] and [LANDUSES] section'))
             from .g_s_quality import get_quality_params_from_table
             if 'SUBCATCHMENTS' in inp_dict.keys():
-                inp_dict['QUALITY'] = {
-                    'data': get_quality_params_from_table(
-                        raw_data_dict['quality'],
-                        inp_dict['SUBCATCHMENTS']['data'].copy()
-                    )
-                }
+                quality_data = get_quality_params_from_table(
+                    raw_data_dict['quality'],
+                    inp_dict['SUBCATCHMENTS']['data'].copy(),
+                    feedback
+                )
             else:
-                inp_dict['QUALITY'] = {
-                    'data': get_quality_params_from_table(
-                        raw_data_dict['quality']
-                    )
-                }
+                quality_data = get_quality_params_from_table(
+                    raw_data_dict['quality'],
+                    feedback=feedback
+                )
+            return {'QUALITY': {'data': quality_data}}, {}
+        run_block('QUALITY', build_quality)
         feedback.setProgressText(self.tr('done \n'))
         feedback.setProgress(80)
 
         # writing inp file
         feedback.setProgressText(self.tr('Creating inp file:'))
+        combine_block_sections(inp_dict)
         inp_dict = {k: v for k, v in inp_dict.items() if len(v['data']) > 0}  # remove empty sections
         from .g_s_write_inp import write_inp
         write_inp(inp_file_name,
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""
+makes the plugin importable as the package generate_swmm_inp, whatever
+the name of the plugin folder is (its modules use relative imports)
+"""
+import importlib
+import os
+import sys
+
+plugin_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.dirname(plugin_dir) not in sys.path:
+    sys.path.insert(0, os.path.dirname(plugin_dir))
+sys.modules.setdefault(
+    'generate_swmm_inp',
+    importlib.import_module(os.path.basename(plugin_dir))
+)
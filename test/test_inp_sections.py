@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+tests for reading the sections of input files
+"""
+import mmap
+import os
+import tempfile
+import unittest
+
+from generate_swmm_inp.g_s_inp_sections import (
+    get_file_encoding,
+    get_next_encoding,
+    index_inp_sections,
+    iter_span_lines,
+    split_section_lines,
+    split_section_spans
+)
+
+inp_text = (
+    '[TITLE]\r\n'
+    ';;Project Title/Notes\r\n'
+    'Straße\r\n'
+    '\r\n'
+    '[JUNCTIONS]\r\n'
+    ';;Name  Elevation\r\n'
+    ';first junction\r\n'
+    ';second line\r\n'
+    'J1    10.5    2\r\n'
+    'J2    "quoted name"    3\r\n'
+    '\r\n'
+    '[CONDUITS]\r\n'
+    'C1    J1    J2\r\n'
+    '\r\n'
+    '[JUNCTIONS]\r\n'
+    ';\r\n'
+    'J3    12    0\r\n'
+)
+
+
+class InpSectionsTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.inp_file = os.path.join(tmp_dir.name, 'test.inp')
+        with open(self.inp_file, 'wb') as f:
+            f.write(inp_text.encode('utf-8'))
+
+    def get_spans(self, section_header):
+        return [
+            (start, end) for header, start, end in index_inp_sections(self.inp_file)
+            if header == section_header
+        ]
+
+    def test_index(self):
+        headers = [h for h, _, _ in index_inp_sections(self.inp_file)]
+        self.assertEqual(
+            headers,
+            [b'[TITLE]', b'[JUNCTIONS]', b'[CONDUITS]', b'[JUNCTIONS]']
+        )
+
+    def test_span_lines_in_small_chunks(self):
+        with open(self.inp_file, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as inp_buffer:
+                # the chunks split 'ß' into its two bytes
+                for chunk_size in [1, 3, 2**20]:
+                    self.assertEqual(
+                        list(iter_span_lines(
+                            inp_buffer,
+                            self.get_spans(b'[TITLE]'),
+                            'utf-8',
+                            chunk_size=chunk_size
+                        )),
+                        ['Straße']
+                    )
+
+    def test_repeated_sections(self):
+        section_vals, annot_dict = split_section_spans(
+            self.inp_file,
+            'utf-8',
+            self.get_spans(b'[JUNCTIONS]')
+        )
+        self.assertEqual(
+            section_vals,
+            [['J1', '10.5', '2'], ['J2', '"quoted name"', '3'], ['J3', '12', '0']]
+        )
+        self.assertEqual(annot_dict, {'J1': 'first junction second line'})
+
+    def test_annotation_blocks(self):
+        section_vals, annot_dict = split_section_lines(iter([
+            ';old',
+            'J1    1',
+            ';',
+            'J2    2',
+            ';new',
+            'J1    3',
+            ';at the end'
+        ]))
+        self.assertEqual(section_vals, [['J1', '1'], ['J2', '2'], ['J1', '3']])
+        self.assertEqual(annot_dict, {'J1': 'new'})
+
+
+
+class FileEncodingTest(unittest.TestCase):
+
+    def get_encoding(self, file_bytes, **kwargs):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'test.rpt')
+            with open(file_path, 'wb') as f:
+                f.write(file_bytes)
+            return get_file_encoding(file_path, **kwargs)
+
+    def test_candidates(self):
+        self.assertEqual(self.get_encoding('Łódź'.encode('utf-8')), 'utf-8')
+        self.assertEqual(self.get_encoding('Łódź'.encode('windows-1250')), 'windows-1250')
+        self.assertEqual(self.get_encoding(b''), 'utf-8')
+        # 0x81 is not defined in any of the candidates
+        self.assertIsNone(self.get_encoding(b'[TITLE]\x81'))
+
+    def test_only_sample_is_decoded(self):
+        file_bytes = 'Straße\n'.encode('utf-8') * 10 + 'Łódź'.encode('windows-1250')
+        self.assertEqual(self.get_encoding(file_bytes, sample_size=20), 'utf-8')
+        self.assertEqual(self.get_encoding(file_bytes), 'windows-1250')
+        # a character which is cut at the end of the sample
+        self.assertEqual(self.get_encoding('aß'.encode('utf-8'), sample_size=2), 'utf-8')
+
+    def test_next_encoding(self):
+        self.assertEqual(get_next_encoding('utf-8'), 'windows-1250')
+        self.assertEqual(get_next_encoding('windows-1250'), 'windows-1252')
+        self.assertIsNone(get_next_encoding('windows-1252'))
+        self.assertIsNone(get_next_encoding('utf-8', encodings=()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+tests for the table functions which only need pandas and numpy
+"""
+import datetime
+import unittest
+
+import pandas as pd
+
+from generate_swmm_inp.g_s_table_functions import (
+    adjust_datetime,
+    del_first_last_vt
+)
+
+
+class AdjustDatetimeTest(unittest.TestCase):
+
+    def test_mixed_formats(self):
+        dates = adjust_datetime(
+            ['2023-01-02', '03.01.2023', None, 'unknown'],
+            ['%Y-%m-%d', '%d.%m.%Y'],
+            '%m/%d/%Y'
+        )
+        self.assertEqual(
+            list(dates),
+            ['01/02/2023', '01/03/2023', '', 'unknown']
+        )
+
+    def test_time_objects(self):
+        times = adjust_datetime(
+            [datetime.time(1, 30), datetime.time(12, 0), datetime.time(1, 30)],
+            ['%H:%M:%S'],
+            '%H:%M'
+        )
+        self.assertEqual(list(times), ['01:30', '12:00', '01:30'])
+
+
+
+class DelFirstLastVtTest(unittest.TestCase):
+
+    def test_inner_vertices(self):
+        links_verts = pd.DataFrame({
+            'Name': ['C1', 'C1', 'C1', 'C1', 'C2', 'C2', 'C3', 'C3', 'C3'],
+            'X_Coord': [0, 1, 2, 3, 3, 4, 4, 5, 6],
+            'Y_Coord': [0, 1, 1.5, 0, 0, 0, 0, 2, 0]
+        })
+        inner_verts = del_first_last_vt(links_verts)
+        self.assertEqual(list(inner_verts['Name']), ['C1', 'C1', 'C3'])
+        self.assertEqual(list(inner_verts['X_Coord']), [1, 2, 5])
+        self.assertEqual(list(inner_verts.index), [0, 1, 2])
+
+    def test_links_without_inner_vertices(self):
+        links_verts = pd.DataFrame({
+            'Name': ['C1', 'C1', 'C2', 'C2'],
+            'X_Coord': [0.0, 1.0, 1.0, 2.0],
+            'Y_Coord': [0.0, 1.0, 1.0, 2.0]
+        })
+        inner_verts = del_first_last_vt(links_verts)
+        self.assertEqual(len(inner_verts), 0)
+        self.assertEqual(list(inner_verts.columns), ['Name', 'X_Coord', 'Y_Coord'])
+
+
+if __name__ == '__main__':
+    unittest.main()
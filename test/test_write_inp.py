@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+tests for the text written into input files
+"""
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from generate_swmm_inp.g_s_write_inp import write_df_lines, write_inp
+
+
+class WriteDfLinesTest(unittest.TestCase):
+
+    def get_lines(self, df, **kwargs):
+        file1 = io.StringIO()
+        write_df_lines(file1, df, **kwargs)
+        return file1.getvalue().splitlines()
+
+    def test_floats_keep_full_precision(self):
+        df = pd.DataFrame({
+            'Name': ['J1', 'J2', 'J3'],
+            'x': [5812345.5, 5812346.25, 5812347.123456789],
+            'y': [1.0, 0.1, 2e-07]
+        })
+        self.assertEqual(
+            self.get_lines(df),
+            [
+                'J1    5812345.5    1.0',
+                'J2    5812346.25    0.1',
+                'J3    5812347.123456789    2e-07'
+            ]
+        )
+
+    def test_missing_values(self):
+        df = pd.DataFrame({
+            'Name': ['O1', 'O2'],
+            'Data': pd.Series([None, 'TS1'], dtype=object),
+            'Value': [np.nan, 3],
+            'RouteTo': [np.nan, 'S1']
+        })
+        self.assertEqual(
+            self.get_lines(df),
+            ['O1    None    NaN    NaN', 'O2    TS1    3.0    S1']
+        )
+        self.assertEqual(
+            self.get_lines(df, na_rep='nan'),
+            ['O1    None    nan    nan', 'O2    TS1    3.0    S1']
+        )
+
+    def test_separators_and_chunks(self):
+        df = pd.DataFrame({
+            'Name': ['C' + str(i) for i in range(5)],
+            'Shape': 'CIRCULAR',
+            'Geom1': range(5),
+            'Barrels': True
+        })
+        lines = self.get_lines(df, sep=['   ', '    ', ' '], chunk_size=2)
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[0], 'C0   CIRCULAR    0 True')
+        self.assertEqual(lines[4], 'C4   CIRCULAR    4 True')
+
+    def test_annotations(self):
+        df = pd.DataFrame(
+            {'Name': ['J1', 'J2', 'J3'], 'Elevation': [1.5, 2, 3]},
+            index=[7, 3, 5]
+        )
+        annotations = pd.Series([np.nan, 'second node', 'third'])
+        self.assertEqual(
+            self.get_lines(df, annotations=annotations, chunk_size=2),
+            [
+                'J1    1.5',
+                ';second node',
+                'J2    2.0',
+                ';third',
+                'J3    3.0'
+            ]
+        )
+
+
+
+class ProgressFeedback:
+    def setProgressText(self, text):
+        pass
+
+
+class WriteInpTest(unittest.TestCase):
+
+    def get_inp_text(self, inp_dict):
+        with tempfile.TemporaryDirectory() as project_dir:
+            write_inp('test.inp', project_dir, inp_dict, ProgressFeedback())
+            with open(os.path.join(project_dir, 'test.inp')) as inp_file:
+                return inp_file.read()
+
+    def test_record_sections_as_before(self):
+        """
+        the text of these sections is the same as the row wise writer
+        of version 0.31 wrote it
+        """
+        inp_dict = {
+            'OUTFALLS': {'data': pd.DataFrame({
+                'Name': ['Out1', 'Out2'],
+                'Elevation': [10.5, 9.123456789],
+                'Type': ['FREE', 'FIXED'],
+                'Data': pd.Series([np.nan, 8.25], dtype=object),
+                'FlapGate': ['NO', 'YES'],
+                'RouteTo': pd.Series([np.nan, 'S1'], dtype=object)
+            })},
+            'DIVIDERS': {'data': pd.DataFrame({
+                'Name': ['Div1'],
+                'Elevation': [12.0],
+                'DivertLink': ['C2'],
+                'Type': ['WEIR'],
+                'CutoffFlow': [np.nan],
+                'WeirMinFlo': [0.5],
+                'WeirMaxDep': [1.25],
+                'WeirCoeff': [3.3],
+                'MaxDepth': [2],
+                'InitDepth': [0],
+                'SurDepth': [0.0],
+                'Aponded': [0]
+            })},
+            'XSECTIONS': {'data': pd.DataFrame({
+                'Name': ['C1', 'C2'],
+                'Shape': ['CIRCULAR', 'IRREGULAR'],
+                'Geom1': [0.3, 'T1'],
+                'Geom2': [0.0, 0.0],
+                'Geom3': [0, 0],
+                'Geom4': [0, 0],
+                'Barrels': [1, 1],
+                'Culvert': pd.Series([np.nan, np.nan], dtype=object)
+            })},
+            'LOSSES': {'data': pd.DataFrame({
+                'Name': ['C1'],
+                'Kentry': [0.5],
+                'Kexit': [0],
+                'Kavg': [0.25],
+                'FlapGate': ['NO'],
+                'Seepage': [0.000001]
+            })}
+        }
+        self.assertEqual(
+            self.get_inp_text(inp_dict),
+            '[OUTFALLS]\n'
+            'Out1    10.5    FREE    nan    NO    nan\n'
+            'Out2    9.123456789    FIXED    8.25    YES    S1\n'
+            '\n'
+            '[DIVIDERS]\n'
+            'Div1    12.0    C2    WEIR    nan    0.5    1.25    3.3    2    0    0.0    0\n'
+            '\n'
+            '[XSECTIONS]\n'
+            'C1   CIRCULAR    0.3    0.0    0    0    1    nan\n'
+            'C2   IRREGULAR    T1    0.0    0    0    1    nan\n'
+            '\n'
+            '[LOSSES]\n'
+            'C1   0.5   0   0.25   NO   1e-06\n'
+            '\n'
+            '[REPORT]\n'
+            'SUBCATCHMENTS ALL\n'
+            'NODES ALL\n'
+            'LINKS ALL\n'
+            '\n'
+            '[TAGS]\n'
+            '\n'
+        )
+
+
+    def test_curves_and_patterns_as_before(self):
+        inp_dict = {
+            'CURVES': {'data': pd.DataFrame({
+                'Name': ['P1', 'P1', 'P1', 'S1', 'S1'],
+                'Type': ['PUMP1', 'PUMP1', 'PUMP1', 'STORAGE', 'STORAGE'],
+                'XVal': np.array([0, 1, 2, 0.5, 1.25], dtype=object),
+                'YVal': np.array([0, 5, 7, 10.0, np.nan], dtype=object)
+            })},
+            'PATTERNS': {'data': pd.DataFrame({
+                'Name': ['D1'] * 7 + ['H1'] * 12,
+                'Type': ['DAILY'] * 7 + ['HOURLY'] * 12,
+                'Factor': np.array(
+                    [1.0] * 5 + [0.5] * 2 + [1.0] * 6 + [0.75] * 6,
+                    dtype=object
+                )
+            })}
+        }
+        self.assertEqual(
+            self.get_inp_text(inp_dict),
+            '[CURVES]\n'
+            'P1    PUMP1    0    0\n'
+            'P1        1    5\n'
+            'P1        2    7\n'
+            ';\n'
+            'S1    STORAGE    0.5    10.0\n'
+            'S1        1.25    nan\n'
+            ';\n'
+            '\n'
+            '[PATTERNS]\n'
+            'D1    DAILY    1.0    1.0    1.0    1.0    1.0    0.5    0.5\n'
+            ';\n'
+            'H1    HOURLY    1.0    1.0    1.0    1.0    1.0    1.0\n'
+            'H1        0.75    0.75    0.75    0.75    0.75    0.75\n'
+            ';\n'
+            '\n'
+            '[REPORT]\n'
+            'SUBCATCHMENTS ALL\n'
+            'NODES ALL\n'
+            'LINKS ALL\n'
+            '\n'
+            '[TAGS]\n'
+            '\n'
+        )
+
+
+    def test_inflows_as_before(self):
+        inp_dict = {
+            'INFLOWS': {'data': pd.DataFrame({
+                'Name': ['J1', 'J2'],
+                'Constituent': ['FLOW', 'TSS'],
+                'Time_Series': ['TS1', '""'],
+                'Type': ['FLOW', 'CONCEN'],
+                'Mfactor': [1.0, 1.0],
+                'Sfactor': [1.0, 0.5],
+                'Baseline': [np.nan, 2.25],
+                'Pattern': pd.Series([np.nan, 'P1'], dtype=object)
+            })},
+            'DWF': {'data': pd.DataFrame({
+                'Name': ['J1'],
+                'Constituent': ['FLOW'],
+                'Baseline': [0.012345678],
+                'Patterns': ['D1 H1 "" ""']
+            })}
+        }
+        self.assertTrue(self.get_inp_text(inp_dict).startswith(
+            '[INFLOWS]\n'
+            'J1    FLOW    TS1    FLOW    1.0    1.0    nan    nan\n'
+            'J2    TSS    ""    CONCEN    1.0    0.5    2.25    P1\n'
+            '\n'
+            '[DWF]\n'
+            'J1    FLOW    0.012345678    D1 H1 "" ""\n'
+            '\n'
+        ))
+
+
+    def test_vertices_and_polygons(self):
+        inp_dict = {
+            'VERTICES': {'data': pd.DataFrame({
+                'Name': ['C1', 'C1', 'C3', 'P1'],
+                'X_Coord': [1.0, 2.0, 5.0, 6.5],
+                'Y_Coord': [1.0, 1.5, 2.0, 0.5]
+            })},
+            'POLYGONS': {'data': pd.DataFrame({
+                'Name': ['S1', 'S1', 'S1', 'S1'],
+                'X_Coord': [0.0, 10.0, 10.0, 0.0],
+                'Y_Coord': [0.0, 0.0, 5.123456789, 0.0]
+            })}
+        }
+        inp_text = self.get_inp_text(inp_dict)
+        self.assertIn(
+            '[VERTICES]\n'
+            'C1    1.0    1.0\n'
+            'C1    2.0    1.5\n'
+            'C3    5.0    2.0\n'
+            'P1    6.5    0.5\n'
+            '\n',
+            inp_text
+        )
+        self.assertIn(
+            '[POLYGONS]\n'
+            'S1    0.0    0.0\n'
+            'S1    10.0    0.0\n'
+            'S1    10.0    5.123456789\n'
+            'S1    0.0    0.0\n'
+            '\n',
+            inp_text
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
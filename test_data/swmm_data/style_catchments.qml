@@ -787,7 +787,7 @@
   <expressionfields/>
   <attributeactions>
     <defaultAction value="{c1a5565f-ccac-4086-a6b2-621ef3e8b795}" key="Canvas"/>
-    <actionsetting action="from PyQt5.QtWidgets import (&#xd;&#xa;    QCheckBox,&#xd;&#xa;    QDialog,&#xd;&#xa;    QDialogButtonBox,&#xd;&#xa;    QPushButton,&#xd;&#xa;    QVBoxLayout,&#xd;&#xa;    QTableWidget,&#xd;&#xa;    QTableWidgetItem,&#xd;&#xa;    QLabel,&#xd;&#xa;    QComboBox&#xd;&#xa;)&#xd;&#xa;from PyQt5.QtGui import QColor&#xd;&#xa;from PyQt5.QtCore import Qt&#xd;&#xa;from qgis.core import (&#xd;&#xa;    QgsProject,&#xd;&#xa;    QgsFeature,&#xd;&#xa;    NULL&#xd;&#xa;)&#xd;&#xa;from qgis.PyQt import QtWidgets&#xd;&#xa;from qgis.gui import QgsFileWidget&#xd;&#xa;import pandas as pd&#xd;&#xa;import numpy as np&#xd;&#xa;import os&#xd;&#xa;&#xd;&#xa;swmm_layer = QgsProject.instance().mapLayer('[% @layer_id %]')&#xd;&#xa;#swmm_layer = iface.activeLayer()&#xd;&#xa;feat_names = [f['Name'] for f in swmm_layer.getFeatures()]&#xd;&#xa;layer_geom = swmm_layer.geometryType()&#xd;&#xa;swmm_geom_types = {&#xd;&#xa;    0: 'NODES',&#xd;&#xa;    1: 'LINKS',&#xd;&#xa;    2: 'SUBCATCHMENTS'&#xd;&#xa;}&#xd;&#xa;select_dict = {&#xd;&#xa;    'NODES': {&#xd;&#xa;        'JUNCIONS':[&#xd;&#xa;            'node_depth',&#xd;&#xa;            'node_inflow',&#xd;&#xa;            'node_surcharge',&#xd;&#xa;            'node_flooding'&#xd;&#xa;        ],&#xd;&#xa;        'OUTFALLS':[&#xd;&#xa;            'node_depth',&#xd;&#xa;            'node_inflow',&#xd;&#xa;            'node_surcharge',&#xd;&#xa;            'node_flooding',&#xd;&#xa;            'outfall_loading'&#xd;&#xa;        ],&#xd;&#xa;        'DIVIDERS':[&#xd;&#xa;            'node_depth',&#xd;&#xa;            'node_inflow',&#xd;&#xa;            'node_surcharge',&#xd;&#xa;            'node_flooding'&#xd;&#xa;        ],&#xd;&#xa;        'STORAGE':[&#xd;&#xa;            'node_depth',&#xd;&#xa;            'node_inflow',&#xd;&#xa;            'node_surcharge',&#xd;&#xa;            'node_flooding',&#xd;&#xa;            'storage_volume'&#xd;&#xa;        ]&#xd;&#xa;    },&#xd;&#xa;    'LINKS': {&#xd;&#xa;        'CONDUITS':[&#xd;&#xa;            'link_flow',&#xd;&#xa;            'flow_classification',&#xd;&#xa;            'conduit_surcharge',&#xd;&#xa;            'link_pollutant_load'&#xd;&#xa;        ],&#xd;&#xa;        'PUMPS':[&#xd;&#xa;            'link_flow',&#xd;&#xa;            'link_pollutant_load',&#xd;&#xa;            'pumping_summary'&#xd;&#xa;        ],&#xd;&#xa;        'ORIFICES':[&#xd;&#xa;            'link_flow',&#xd;&#xa;            'flow_classification',&#xd;&#xa;            'link_pollutant_load'&#xd;&#xa;        ],&#xd;&#xa;        'WEIRS':[&#xd;&#xa;            'link_flow',&#xd;&#xa;            'link_pollutant_load'&#xd;&#xa;        ],&#xd;&#xa;        'OUTLETS':[&#xd;&#xa;            'link_flow',&#xd;&#xa;            'link_pollutant_load'&#xd;&#xa;        ],&#xd;&#xa;    },&#xd;&#xa;    'SUBCATCHMENTS':[&#xd;&#xa;        'subcatchment_runoff',&#xd;&#xa;        'subcatchment_washoff'&#xd;&#xa;    ]&#xd;&#xa;}&#xd;&#xa;dict_report_line_sects = {&#xd;&#xa;    'subcatchment_runoff': 'Subcatchment Runoff Summary',&#xd;&#xa;    'subcatchment_washoff': 'Subcatchment Washoff Summary',&#xd;&#xa;    'subcatchment_lid_performance': None,&#xd;&#xa;    'subcatchment_groundwater': None,&#xd;&#xa;    'node_depth': 'Node Depth Summary',&#xd;&#xa;    'node_inflow': 'Node Inflow Summary',&#xd;&#xa;    'node_surcharge': 'Node Surcharge Summary',&#xd;&#xa;    'node_flooding': 'Node Flooding Summary',&#xd;&#xa;    'storage_volume': 'Storage Volume Summary',&#xd;&#xa;    'outfall_loading': 'Outfall Loading Summary',&#xd;&#xa;    'street_flow': 'Street Flow Summary',&#xd;&#xa;    'link_flow': 'Link Flow Summary',&#xd;&#xa;    'flow_classification': 'Flow Classification Summary',&#xd;&#xa;    'conduit_surcharge': 'Conduit Surcharge Summary',&#xd;&#xa;    'pumping_summary': 'Pumping Summary',&#xd;&#xa;    'link_pollutant_load': 'Link Pollutant Load Summary',&#xd;&#xa;}&#xd;&#xa;&#xd;&#xa;def get_header_val(header_lines, h_line, start, length):&#xd;&#xa;    dist_whitespace = 2  # left whitespace in rpt file&#xd;&#xa;    python_adjustment = 1  # in order to have the same vals as in Fresults.pas&#xd;&#xa;    dist_whitespace = dist_whitespace + python_adjustment&#xd;&#xa;    unit_line = header_lines[h_line]&#xd;&#xa;    start = start - dist_whitespace&#xd;&#xa;    end = start + length&#xd;&#xa;    return unit_line[start:end]&#xd;&#xa;    &#xd;&#xa;def get_dict_report_cols(topic, header_lines):&#xd;&#xa;    if topic == 'subcatchment_runoff':&#xd;&#xa;        units_1 = get_header_val(header_lines, 2, 32, 2)&#xd;&#xa;        units_2 = get_header_val(header_lines, 2, 104, 9)&#xd;&#xa;        units_3 = get_header_val(header_lines, 2, 118, 4)&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'TotalPrecipitation'+'_'+units_1,&#xd;&#xa;            'TotalRunon'+'_'+units_1,&#xd;&#xa;            'TotalEvaporation'+'_'+units_1,&#xd;&#xa;            'TotalInfiltration'+'_'+units_1,&#xd;&#xa;            'ImperviousRunoff'+'_'+units_1,&#xd;&#xa;            'PerviousRunoff'+'_'+units_1,&#xd;&#xa;            'TotalRunoff1'+'_'+units_1,&#xd;&#xa;            'TotalRunoff2'+'_'+units_2,&#xd;&#xa;            'PeakRunoff'+'_'+units_3,&#xd;&#xa;            'RunoffCoeffient'&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'subcatchment_washoff':&#xd;&#xa;        pol_names = header_lines[0].split()&#xd;&#xa;        pol_units = header_lines[1].split()[1:]&#xd;&#xa;        col_pol = [n+'_'+u for n, u in zip(pol_names, pol_units)]&#xd;&#xa;        cols = ['Name'] + col_pol&#xd;&#xa;    if topic == 'node_depth':&#xd;&#xa;        units_1 = get_header_val(header_lines, 2, 35, 6).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'Type',&#xd;&#xa;            'AverageDepth'+'_'+units_1,&#xd;&#xa;            'MaximumDepth'+'_'+units_1,&#xd;&#xa;            'MaximumHGL'+'_'+units_1,&#xd;&#xa;            'TimeOfMaxOccurrence_Days',&#xd;&#xa;            'TimeOfMaxOccurrence_HoursMin',&#xd;&#xa;            'MaxReportedDepth'+'_'+units_1&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'node_inflow':&#xd;&#xa;        units_1 = get_header_val(header_lines, 3, 38, 4).strip()&#xd;&#xa;        units_2 = get_header_val(header_lines, 3, 68, 8).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'Type',&#xd;&#xa;            'MaximumLateralInflow'+'_'+units_1,&#xd;&#xa;            'MaximumTotalInflow'+'_'+units_1,&#xd;&#xa;            'TimeOfMaxOccurrence_Days',&#xd;&#xa;            'TimeOfMaxOccurrence_HoursMin',&#xd;&#xa;            'LateralInflowVolume'+'_'+units_2,&#xd;&#xa;            'TotalInflowVolume'+'_'+units_2,&#xd;&#xa;            'FlowBalanceError_Pcnt',&#xd;&#xa;            'flag'&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'node_surcharge':&#xd;&#xa;        units_1 = get_header_val(header_lines, 2, 53, 6).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'Type',&#xd;&#xa;            'Surcharged_Hours',&#xd;&#xa;            'MaxHeightAboveCrown'+'_'+units_1,&#xd;&#xa;            'MinDepthBelowRim'+'_'+units_1&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'node_flooding':&#xd;&#xa;        units_1 = get_header_val(header_lines, 3, 38, 4).strip()&#xd;&#xa;        units_2 = get_header_val(header_lines, 3, 59, 9).strip()&#xd;&#xa;        units_3 = get_header_val(header_lines, 3, 69, 9).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'Flooded_Hours',&#xd;&#xa;            'MaximumRate'+'_'+units_1,&#xd;&#xa;            'TimeOfMaxOccurrence_Days',&#xd;&#xa;            'TimeOfMaxOccurrence_HoursMin',&#xd;&#xa;            'TotalFloodVolume'+'_'+units_2,&#xd;&#xa;            'MaximumPondedDepth'+'_'+units_3&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'storage_volume':&#xd;&#xa;        units_1 = get_header_val(header_lines, 2, 25, 9).strip()&#xd;&#xa;        units_2 = get_header_val(header_lines, 2, 93, 6).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'AverageVolume'+'_'+units_1,&#xd;&#xa;            'AvgFull_Pcnt',&#xd;&#xa;            'EvapLoss_Pcnt',&#xd;&#xa;            'ExfilLoss_Pcnt',&#xd;&#xa;            'MaximumVolume'+'_'+units_1,&#xd;&#xa;            'MaxFull_Pcnt',&#xd;&#xa;            'TimeOfMaxOccurrence_Days',&#xd;&#xa;            'TimeOfMaxOccurrence_HoursMin',&#xd;&#xa;            'MaximumOutflow'+'_'+units_2&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'outfall_loading':&#xd;&#xa;        head_tokens = header_lines[1].split()&#xd;&#xa;        units_1 = get_header_val(header_lines, 2, 36, 4).strip()&#xd;&#xa;        units_2 = get_header_val(header_lines, 2, 54, 9).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'FlowFreq_Pcnt',&#xd;&#xa;            'AvgFlow'+'_'+units_1,&#xd;&#xa;            'MaxFlow'+'_'+units_1,&#xd;&#xa;            'TotalVolume'+'_'+units_2&#xd;&#xa;        ]&#xd;&#xa;        if len(head_tokens) > 4:&#xd;&#xa;            header_unit_line = header_lines[2][60:]&#xd;&#xa;            header_unit_line = header_unit_line.strip()&#xd;&#xa;            pol_names = head_tokens[4:]&#xd;&#xa;            pol_units = header_unit_line.split()&#xd;&#xa;            col_pol = ['Total'+n+'_'+u for n, u in zip(pol_names, pol_units)]&#xd;&#xa;            cols = cols + col_pol&#xd;&#xa;    if topic == 'street_flow':&#xd;&#xa;        units_1 = get_header_val(header_lines, 3, 25, 4).strip()&#xd;&#xa;        units_2 = get_header_val(header_lines, 3, 37, 2).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'PeakFlow'+'_'+units_1,&#xd;&#xa;            'MaximumSpread'+'_'+units_2,&#xd;&#xa;            'MaximumDepth'+'_'+units_2,&#xd;&#xa;            'InletDesing',&#xd;&#xa;            'InletLocation',&#xd;&#xa;            'Inlet',&#xd;&#xa;            'PeakFlowCapture_Pcnt',&#xd;&#xa;            'AverageFlowCapture_Pcnt',&#xd;&#xa;            'BypassFlowFrequnecy_Pcnt',&#xd;&#xa;            'BackFlowFrequnecy_Pcnt',&#xd;&#xa;            'PeakCaptureInlet'+'_'+units_1,&#xd;&#xa;            'PeakBypassFlow'+'_'+units_1,&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'link_flow':&#xd;&#xa;        units_1 = get_header_val(header_lines, 2, 38, 4).strip()&#xd;&#xa;        units_2 = get_header_val(header_lines, 2, 58, 6).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'Type',&#xd;&#xa;            'MaximumFlow'+'_'+units_1,&#xd;&#xa;            'TimeOfMaxOccurrence_Days',&#xd;&#xa;            'TimeOfMaxOccurrence_HoursMin',&#xd;&#xa;            'MaximumVeloc'+'_'+units_2,&#xd;&#xa;            'MaxFullFlow',&#xd;&#xa;            'MaxFullDepth'&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'flow_classification': &#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'AdjustedActualLength',&#xd;&#xa;            'FractionOfTimeDry',&#xd;&#xa;            'FractionOfTimeUpDry',&#xd;&#xa;            'FractionOfTimeDownDry',&#xd;&#xa;            'FractionOfTimeSubCrit',&#xd;&#xa;            'FractionOfTimeSupCrit',&#xd;&#xa;            'FractionOfTimeUpCrit',&#xd;&#xa;            'FractionOfTimeDownCrit',&#xd;&#xa;            'FractionOfTimeNormLtd',&#xd;&#xa;            'FractionOfTimeInletCtrl'&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'conduit_surcharge': &#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'FullBothEnds_Hours',&#xd;&#xa;            'FullUpstream_Hours',&#xd;&#xa;            'FullDownstream_Hours',&#xd;&#xa;            'AboveFullNormalFlow_Hours',&#xd;&#xa;            'CapacityLimited_Hours',&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'pumping_summary':&#xd;&#xa;        units_1 = get_header_val(header_lines, 2, 51, 4).strip()&#xd;&#xa;        units_2 = get_header_val(header_lines, 2, 76, 9).strip()&#xd;&#xa;        units_3 = get_header_val(header_lines, 2, 89, 6).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'Utilized_Pcnt',&#xd;&#xa;            'NumberOfStartups',&#xd;&#xa;            'MinFlow'+'_'+units_1,&#xd;&#xa;            'AverageFlow'+'_'+units_1,&#xd;&#xa;            'MaxFlow'+'_'+units_1,&#xd;&#xa;            'TotalVolume'+'_'+units_2,&#xd;&#xa;            'PowerUsage'+'_'+units_3,&#xd;&#xa;            'TimeBelowPumpCurve_Pcnt',&#xd;&#xa;            'TimeAbovePumpCurve_Pcnt'&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'link_pollutant_load': &#xd;&#xa;        pol_names = header_lines[0].split()&#xd;&#xa;        pol_units = header_lines[1].split()[1:]&#xd;&#xa;        col_pol = [n+'_'+u for n, u in zip(pol_names, pol_units)]&#xd;&#xa;        cols = ['Name'] + col_pol&#xd;&#xa;    return cols&#xd;&#xa;&#xd;&#xa;def build_df_from_vals_list(section_vals, col_names):&#xd;&#xa;    &quot;&quot;&quot;&#xd;&#xa;    builds a dataframe for a section; &#xd;&#xa;    missing vals at the end are set as np.nan&#xd;&#xa;    :param list section_vals&#xd;&#xa;    :param list col_names&#xd;&#xa;    :return: pd.DataFrame&#xd;&#xa;    &quot;&quot;&quot;&#xd;&#xa;    df = pd.DataFrame(section_vals)&#xd;&#xa;    col_len = len(df.columns)&#xd;&#xa;    if col_names is None:&#xd;&#xa;        pass&#xd;&#xa;    else:&#xd;&#xa;        df.columns = col_names[0:col_len]&#xd;&#xa;        if len(col_names) > col_len:  # if missing vals in inp-data&#xd;&#xa;            for i in col_names[col_len:]:&#xd;&#xa;                df[i] = np.nan&#xd;&#xa;    return df&#xd;&#xa;    &#xd;&#xa;def find_rpt_section_position(i, rpt_line, rpt_text):&#xd;&#xa;    &quot;&quot;&quot;&#xd;&#xa;    finds report sections in a list of text lines&#xd;&#xa;    :param int i: index of the current text line&#xd;&#xa;    :param str rpt_line: current text line&#xd;&#xa;    :param list rpt_text&#xd;&#xa;    &quot;&quot;&quot;&#xd;&#xa;    line_list = rpt_line.split()&#xd;&#xa;    if i &lt;= (len(rpt_text)-2):&#xd;&#xa;        if line_list[0].startswith('**') and line_list[0].endswith('**'):&#xd;&#xa;            line_list_2 = rpt_text[i+2].split()&#xd;&#xa;            if line_list_2[0].startswith('**') and line_list_2[0].endswith('**'):&#xd;&#xa;                return (i+1)&#xd;&#xa;            else:&#xd;&#xa;                return 'NA'&#xd;&#xa;        else:&#xd;&#xa;            return 'NA'&#xd;&#xa;    else:&#xd;&#xa;        return 'NA'&#xd;&#xa;&#xd;&#xa;def get_rpt_df(topic, readfile):&#xd;&#xa;    rpt_section_title = dict_report_line_sects[topic]&#xd;&#xa;    rpt_text = get_rpt_txt(readfile)&#xd;&#xa;    if rpt_section_title in rpt_text:&#xd;&#xa;        startpos = rpt_text.index(rpt_section_title)&#xd;&#xa;        rpt_text_trimmed = rpt_text[startpos:]&#xd;&#xa;        separation_lines_0 = [i for i, l in enumerate(rpt_text_trimmed) if l.startswith('**') and l.endswith('**')]&#xd;&#xa;        if len(separation_lines_0) != 1:&#xd;&#xa;            #last item&#xd;&#xa;            endpos = separation_lines_0[1]&#xd;&#xa;            sect_lines = rpt_text_trimmed[:endpos]&#xd;&#xa;        else:&#xd;&#xa;            sect_lines = rpt_text_trimmed&#xd;&#xa;        separation_lines = [i for i, l in enumerate(sect_lines) if l.startswith('--') and l.endswith('--')]&#xd;&#xa;        if len(separation_lines) == 2:&#xd;&#xa;            # without Summary&#xd;&#xa;            separation_lines = separation_lines+[len(sect_lines)]&#xd;&#xa;        sect_lines_vals = sect_lines[(separation_lines[1]+1):separation_lines[2]]&#xd;&#xa;        sect_lines_vals = [x.split() for x in sect_lines_vals]&#xd;&#xa;        header_lines = sect_lines[(separation_lines[0]+1):separation_lines[1]]&#xd;&#xa;        col_names = get_dict_report_cols(topic, header_lines)&#xd;&#xa;        df = build_df_from_vals_list(&#xd;&#xa;            sect_lines_vals,&#xd;&#xa;            col_names&#xd;&#xa;        )&#xd;&#xa;        return df&#xd;&#xa;    else:&#xd;&#xa;        return(pd.DataFrame())&#xd;&#xa;&#xd;&#xa;&#xd;&#xa;def get_rpt_txt(readfile):&#xd;&#xa;    # open file with different encodings&#xd;&#xa;    encodings = [&#xd;&#xa;        'utf-8',&#xd;&#xa;        'windows-1250',&#xd;&#xa;        'windows-1252'&#xd;&#xa;    ]  # add more?&#xd;&#xa;    for e in encodings:&#xd;&#xa;        try:&#xd;&#xa;            with open(readfile, 'r', encoding=e) as f:&#xd;&#xa;                rpt_text = f.readlines()&#xd;&#xa;        except UnicodeDecodeError:&#xd;&#xa;            pass&#xd;&#xa;        else:&#xd;&#xa;            break&#xd;&#xa;    rpt_text = [x for x in rpt_text if x != '\n']&#xd;&#xa;    rpt_text = [x for x in rpt_text if x != '\r']&#xd;&#xa;    rpt_text = [x.strip() for x in rpt_text]&#xd;&#xa;    rpt_text = [x for x in rpt_text if len(x)>0]&#xd;&#xa;    # delete last three lines of the file (information on start and end time)&#xd;&#xa;    rpt_text = rpt_text[:-3]&#xd;&#xa;    return rpt_text&#xd;&#xa;&#xd;&#xa;# third dialog&#xd;&#xa;class saveCsvDialog(QDialog):&#xd;&#xa;    def __init__(self, parent):&#xd;&#xa;        QDialog.__init__(self, parent)&#xd;&#xa;        self.setWindowTitle('Save table section as CSV')&#xd;&#xa;        self.df = parent.df&#xd;&#xa;        self.topic = parent.topic&#xd;&#xa;        self.layout = QVBoxLayout()&#xd;&#xa;&#xd;&#xa;        # path&#xd;&#xa;        self.label_CsvFile = QLabel('Resulting CSV file')&#xd;&#xa;        self.layout.addWidget(self.label_CsvFile)&#xd;&#xa;        self.CsvFile = QgsFileWidget()&#xd;&#xa;        self.CsvFile.setFilter('CSV files (*.csv)')&#xd;&#xa;        self.CsvFile.setStorageMode(3)&#xd;&#xa;        self.layout.addWidget(self.CsvFile)&#xd;&#xa;&#xd;&#xa;        # checkbox&#xd;&#xa;        self.addcheckbox = QCheckBox('add resulting CSV file to Project')&#xd;&#xa;        self.addcheckbox.setChecked(True)&#xd;&#xa;&#xd;&#xa;        # OK/Cancel-Buttons&#xd;&#xa;        btn2 = QDialogButtonBox.Ok | QDialogButtonBox.Cancel&#xd;&#xa;        self.buttonBox = QDialogButtonBox(btn2)&#xd;&#xa;        self.buttonBox.accepted.connect(self.save_csv_action)&#xd;&#xa;        self.buttonBox.rejected.connect(self.close)&#xd;&#xa;&#xd;&#xa;        self.layout.addWidget(self.addcheckbox)&#xd;&#xa;        self.layout.addWidget(self.buttonBox)&#xd;&#xa;        self.setLayout(self.layout)&#xd;&#xa;&#xd;&#xa;    def closeaction(self):&#xd;&#xa;        self.close()&#xd;&#xa;&#xd;&#xa;    def save_csv_action(self):&#xd;&#xa;        csvpath = self.CsvFile.filePath()&#xd;&#xa;        if csvpath=='':&#xd;&#xa;            QtWidgets.QMessageBox.information(&#xd;&#xa;                None,&#xd;&#xa;                &quot;Warning&quot;,&#xd;&#xa;                'Resulting CSV file can`t be empty. Please select a file'&#xd;&#xa;            )&#xd;&#xa;        else:&#xd;&#xa;            self.df.to_csv(csvpath, index=False)&#xd;&#xa;            self.add_to_project = self.addcheckbox.isChecked()&#xd;&#xa;            if self.add_to_project:&#xd;&#xa;                showname = self.topic+' ('+os.path.split(csvpath)[1]+')'&#xd;&#xa;                csv_layer = QgsVectorLayer(csvpath, showname , 'ogr')&#xd;&#xa;                QgsProject.instance().addMapLayer(csv_layer)&#xd;&#xa;            QtWidgets.QMessageBox.information(&#xd;&#xa;                None,&#xd;&#xa;                &quot;Info&quot;,&#xd;&#xa;                'Report data was saved in '+ csvpath&#xd;&#xa;            )&#xd;&#xa;            self.closeaction()&#xd;&#xa;&#xd;&#xa;&#xd;&#xa;# second dialog&#xd;&#xa;class showTableDialog(QDialog):&#xd;&#xa;    def __init__(self, parent):&#xd;&#xa;        QDialog.__init__(self, parent)&#xd;&#xa;        self.topic = parent.topic&#xd;&#xa;        self.setWindowTitle(self.topic)&#xd;&#xa;        self.df = parent.df&#xd;&#xa;        self.layout = QVBoxLayout()&#xd;&#xa;        self.tableWidget = QTableWidget()&#xd;&#xa;        self.tableWidget.setColumnCount(&#xd;&#xa;            len(self.df.columns)&#xd;&#xa;        )&#xd;&#xa;        self.tableWidget.setRowCount(&#xd;&#xa;            len(self.df.index)&#xd;&#xa;        )&#xd;&#xa;        self.tableWidget.setSortingEnabled(True)&#xd;&#xa;        if any([x in feat_names for x in self.df['Name']]):&#xd;&#xa;            self.infotext = QLabel(&#xd;&#xa;                'Features of the current layer are highlighted in yellow'&#xd;&#xa;            )&#xd;&#xa;        else:&#xd;&#xa;            self.infotext = QLabel(&#xd;&#xa;                'No features of current layer were found in this report section!'&#xd;&#xa;            )&#xd;&#xa;        self.layout.addWidget(self.infotext)&#xd;&#xa;        for i in self.df.index:&#xd;&#xa;            val0 = self.df['Name'][i]&#xd;&#xa;            for j, col in enumerate(self.df.columns):&#xd;&#xa;                val = self.df[col][i]&#xd;&#xa;                item1 = QTableWidgetItem(str(val))&#xd;&#xa;                item1.setFlags(Qt.ItemIsEditable)&#xd;&#xa;                if val0 in feat_names:&#xd;&#xa;                    item1.setBackground(QColor('yellow'))&#xd;&#xa;                self.tableWidget.setItem(i, j, item1)&#xd;&#xa;        self.tableWidget.setHorizontalHeaderLabels(&#xd;&#xa;            list(self.df.columns)&#xd;&#xa;        )&#xd;&#xa;&#xd;&#xa;        # button to save csv&#xd;&#xa;        self.button_save = QPushButton('Close and save table as CSV')&#xd;&#xa;        self.button_save.clicked.connect(self.open_save_csv)&#xd;&#xa;        self.layout.addWidget(self.button_save)&#xd;&#xa;        self.layout.addWidget(self.tableWidget)&#xd;&#xa;        self.setLayout(self.layout)&#xd;&#xa;&#xd;&#xa;    def open_save_csv(self):&#xd;&#xa;        self.w3 = saveCsvDialog(self)&#xd;&#xa;        self.w3.show()&#xd;&#xa;        self.close()&#xd;&#xa;&#xd;&#xa;# main dialog&#xd;&#xa;class joinSwmmReportDialog(QDialog):&#xd;&#xa;    def __init__(self, parent=None):&#xd;&#xa;        &quot;&quot;&quot;Constructor.&quot;&quot;&quot;&#xd;&#xa;        super(joinSwmmReportDialog, self).__init__(parent)&#xd;&#xa;        # Drop-down-Listen und Labels&#xd;&#xa;        QDialog.__init__(self, parent)&#xd;&#xa;        self.layout = QVBoxLayout()&#xd;&#xa;        self.setWindowTitle('Get results from SWMM report file')&#xd;&#xa;&#xd;&#xa;        # swmm rpt file&#xd;&#xa;        self.label_SwmmRptFile = QLabel('SWMM report File')&#xd;&#xa;        self.swmmRptFile = QgsFileWidget() #rpt&#xd;&#xa;        self.swmmRptFile.setFilter('SWMM report files (*.rpt)')&#xd;&#xa;        self.layout.addWidget(self.label_SwmmRptFile)&#xd;&#xa;        self.layout.addWidget(self.swmmRptFile)&#xd;&#xa;        &#xd;&#xa;        if swmm_type in ['NODES','LINKS']:&#xd;&#xa;            #swmm obj type&#xd;&#xa;            self.label_swmmobj_selBox = QLabel('SWMM layer type')&#xd;&#xa;            self.swmmobj_selBox = QComboBox()&#xd;&#xa;            self.swmmobj_list = list(select_dict[swmm_type].keys())&#xd;&#xa;            self.swmmobj_selBox.addItems(self.swmmobj_list)&#xd;&#xa;            self.swmmobj_selBox.setCurrentIndex(0)&#xd;&#xa;            self.swmm_obj = self.swmmobj_selBox.currentText()&#xd;&#xa;            self.swmmobj_selBox.currentIndexChanged.connect(self.update_topic_box)&#xd;&#xa;            self.layout.addWidget(self.label_swmmobj_selBox)&#xd;&#xa;            self.layout.addWidget(self.swmmobj_selBox)&#xd;&#xa;&#xd;&#xa;            &#xd;&#xa;            self.label_topic_selBox = QLabel('SWMM report topic')&#xd;&#xa;            self.topic_selBox = QComboBox()&#xd;&#xa;            self.topic_list = list(select_dict[swmm_type][self.swmm_obj])&#xd;&#xa;            self.topic_selBox.addItems(self.topic_list)&#xd;&#xa;            self.topic_selBox.setCurrentIndex(0)&#xd;&#xa;            self.layout.addWidget(self.label_topic_selBox)&#xd;&#xa;            self.layout.addWidget(self.topic_selBox)&#xd;&#xa;        elif swmm_type == 'SUBCATCHMENTS':&#xd;&#xa;            self.label_topic_selBox = QLabel('SWMM report topic')&#xd;&#xa;            self.topic_selBox = QComboBox()&#xd;&#xa;            self.topic_list = list(select_dict[swmm_type])&#xd;&#xa;            self.topic_selBox.addItems(self.topic_list)&#xd;&#xa;            self.topic_selBox.setCurrentIndex(0)&#xd;&#xa;            self.layout.addWidget(self.label_topic_selBox)&#xd;&#xa;            self.layout.addWidget(self.topic_selBox)&#xd;&#xa;        else:&#xd;&#xa;            QtWidgets.QMessageBox.information(&#xd;&#xa;                None,&#xd;&#xa;                &quot;Warning&quot;,&#xd;&#xa;                'No suitable data can be accessed'&#xd;&#xa;            )&#xd;&#xa;            self.close()&#xd;&#xa;        &#xd;&#xa;        # OK/Cancel-Buttons&#xd;&#xa;        btn = QDialogButtonBox.Ok | QDialogButtonBox.Cancel&#xd;&#xa;        self.buttonBox = QDialogButtonBox(btn)&#xd;&#xa;        self.buttonBox.accepted.connect(self.join_report_vals)&#xd;&#xa;        self.buttonBox.rejected.connect(self.close)&#xd;&#xa;        self.buttonBox.clicked.connect(self.close)&#xd;&#xa;        self.layout.addWidget(self.buttonBox)&#xd;&#xa;        self.setLayout(self.layout)&#xd;&#xa;&#xd;&#xa;    def update_topic_box(self):&#xd;&#xa;        self.topic_selBox.clear()&#xd;&#xa;        self.swmm_obj = self.swmmobj_selBox.currentText()&#xd;&#xa;        self.topic_list_neu = list(select_dict[swmm_type][self.swmm_obj])&#xd;&#xa;        self.topic_selBox.addItems(self.topic_list_neu)&#xd;&#xa;        self.topic_selBox.setCurrentIndex(0)&#xd;&#xa;    &#xd;&#xa;    def join_report_vals(self):&#xd;&#xa;        self.topic = self.topic_selBox.currentText()&#xd;&#xa;        readfile = self.swmmRptFile.filePath()&#xd;&#xa;        if readfile=='':&#xd;&#xa;            QtWidgets.QMessageBox.information(&#xd;&#xa;                None,&#xd;&#xa;                &quot;Warning&quot;,&#xd;&#xa;                'SWMM report file can`t be empty. Please select a file'&#xd;&#xa;            )&#xd;&#xa;            w.show()&#xd;&#xa;        else:&#xd;&#xa;            self.df = get_rpt_df(self.topic, readfile)&#xd;&#xa;            if len(self.df) == 0:&#xd;&#xa;                QtWidgets.QMessageBox.information(&#xd;&#xa;                None,&#xd;&#xa;                &quot;Warning&quot;,&#xd;&#xa;                'This report section is not available in the chosen report file. Please select another report file or topic'&#xd;&#xa;                )&#xd;&#xa;                w.show()&#xd;&#xa;            else:&#xd;&#xa;                w2 = showTableDialog(self)&#xd;&#xa;                w2.show()&#xd;&#xa;&#xd;&#xa;if layer_geom in swmm_geom_types.keys():&#xd;&#xa;    swmm_type = swmm_geom_types[layer_geom]&#xd;&#xa;    w = joinSwmmReportDialog()&#xd;&#xa;    w.show()&#xd;&#xa;else:&#xd;&#xa;    QtWidgets.QMessageBox.information(None,&quot;Info&quot;, 'Cannot show results for this data type')" type="1" capture="0" shortTitle="Get results from report file" isEnabledOnlyWhenEditable="0" id="{c1a5565f-ccac-4086-a6b2-621ef3e8b795}" name="get_report" icon="" notificationMessage="">
+    <actionsetting action="from PyQt5.QtWidgets import (&#xd;&#xa;    QCheckBox,&#xd;&#xa;    QDialog,&#xd;&#xa;    QDialogButtonBox,&#xd;&#xa;    QPushButton,&#xd;&#xa;    QVBoxLayout,&#xd;&#xa;    QTableWidget,&#xd;&#xa;    QTableWidgetItem,&#xd;&#xa;    QLabel,&#xd;&#xa;    QComboBox&#xd;&#xa;)&#xd;&#xa;from PyQt5.QtGui import QColor&#xd;&#xa;from PyQt5.QtCore import Qt&#xd;&#xa;from qgis.core import (&#xd;&#xa;    QgsProject,&#xd;&#xa;    QgsFeature,&#xd;&#xa;    NULL&#xd;&#xa;)&#xd;&#xa;from qgis.PyQt import QtWidgets&#xd;&#xa;from qgis.gui import QgsFileWidget&#xd;&#xa;import pandas as pd&#xd;&#xa;import numpy as np&#xd;&#xa;import codecs&#xd;&#xa;import os&#xd;&#xa;&#xd;&#xa;swmm_layer = QgsProject.instance().mapLayer('[% @layer_id %]')&#xd;&#xa;#swmm_layer = iface.activeLayer()&#xd;&#xa;feat_names = [f['Name'] for f in swmm_layer.getFeatures()]&#xd;&#xa;layer_geom = swmm_layer.geometryType()&#xd;&#xa;swmm_geom_types = {&#xd;&#xa;    0: 'NODES',&#xd;&#xa;    1: 'LINKS',&#xd;&#xa;    2: 'SUBCATCHMENTS'&#xd;&#xa;}&#xd;&#xa;select_dict = {&#xd;&#xa;    'NODES': {&#xd;&#xa;        'JUNCIONS':[&#xd;&#xa;            'node_depth',&#xd;&#xa;            'node_inflow',&#xd;&#xa;            'node_surcharge',&#xd;&#xa;            'node_flooding'&#xd;&#xa;        ],&#xd;&#xa;        'OUTFALLS':[&#xd;&#xa;            'node_depth',&#xd;&#xa;            'node_inflow',&#xd;&#xa;            'node_surcharge',&#xd;&#xa;            'node_flooding',&#xd;&#xa;            'outfall_loading'&#xd;&#xa;        ],&#xd;&#xa;        'DIVIDERS':[&#xd;&#xa;            'node_depth',&#xd;&#xa;            'node_inflow',&#xd;&#xa;            'node_surcharge',&#xd;&#xa;            'node_flooding'&#xd;&#xa;        ],&#xd;&#xa;        'STORAGE':[&#xd;&#xa;            'node_depth',&#xd;&#xa;            'node_inflow',&#xd;&#xa;            'node_surcharge',&#xd;&#xa;            'node_flooding',&#xd;&#xa;            'storage_volume'&#xd;&#xa;        ]&#xd;&#xa;    },&#xd;&#xa;    'LINKS': {&#xd;&#xa;        'CONDUITS':[&#xd;&#xa;            'link_flow',&#xd;&#xa;            'flow_classification',&#xd;&#xa;            'conduit_surcharge',&#xd;&#xa;            'link_pollutant_load'&#xd;&#xa;        ],&#xd;&#xa;        'PUMPS':[&#xd;&#xa;            'link_flow',&#xd;&#xa;            'link_pollutant_load',&#xd;&#xa;            'pumping_summary'&#xd;&#xa;        ],&#xd;&#xa;        'ORIFICES':[&#xd;&#xa;            'link_flow',&#xd;&#xa;            'flow_classification',&#xd;&#xa;            'link_pollutant_load'&#xd;&#xa;        ],&#xd;&#xa;        'WEIRS':[&#xd;&#xa;            'link_flow',&#xd;&#xa;            'link_pollutant_load'&#xd;&#xa;        ],&#xd;&#xa;        'OUTLETS':[&#xd;&#xa;            'link_flow',&#xd;&#xa;            'link_pollutant_load'&#xd;&#xa;        ],&#xd;&#xa;    },&#xd;&#xa;    'SUBCATCHMENTS':[&#xd;&#xa;        'subcatchment_runoff',&#xd;&#xa;        'subcatchment_washoff'&#xd;&#xa;    ]&#xd;&#xa;}&#xd;&#xa;dict_report_line_sects = {&#xd;&#xa;    'subcatchment_runoff': 'Subcatchment Runoff Summary',&#xd;&#xa;    'subcatchment_washoff': 'Subcatchment Washoff Summary',&#xd;&#xa;    'subcatchment_lid_performance': None,&#xd;&#xa;    'subcatchment_groundwater': None,&#xd;&#xa;    'node_depth': 'Node Depth Summary',&#xd;&#xa;    'node_inflow': 'Node Inflow Summary',&#xd;&#xa;    'node_surcharge': 'Node Surcharge Summary',&#xd;&#xa;    'node_flooding': 'Node Flooding Summary',&#xd;&#xa;    'storage_volume': 'Storage Volume Summary',&#xd;&#xa;    'outfall_loading': 'Outfall Loading Summary',&#xd;&#xa;    'street_flow': 'Street Flow Summary',&#xd;&#xa;    'link_flow': 'Link Flow Summary',&#xd;&#xa;    'flow_classification': 'Flow Classification Summary',&#xd;&#xa;    'conduit_surcharge': 'Conduit Surcharge Summary',&#xd;&#xa;    'pumping_summary': 'Pumping Summary',&#xd;&#xa;    'link_pollutant_load': 'Link Pollutant Load Summary',&#xd;&#xa;}&#xd;&#xa;&#xd;&#xa;def get_header_val(header_lines, h_line, start, length):&#xd;&#xa;    dist_whitespace = 2  # left whitespace in rpt file&#xd;&#xa;    python_adjustment = 1  # in order to have the same vals as in Fresults.pas&#xd;&#xa;    dist_whitespace = dist_whitespace + python_adjustment&#xd;&#xa;    unit_line = header_lines[h_line]&#xd;&#xa;    start = start - dist_whitespace&#xd;&#xa;    end = start + length&#xd;&#xa;    return unit_line[start:end]&#xd;&#xa;    &#xd;&#xa;def get_dict_report_cols(topic, header_lines):&#xd;&#xa;    if topic == 'subcatchment_runoff':&#xd;&#xa;        units_1 = get_header_val(header_lines, 2, 32, 2)&#xd;&#xa;        units_2 = get_header_val(header_lines, 2, 104, 9)&#xd;&#xa;        units_3 = get_header_val(header_lines, 2, 118, 4)&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'TotalPrecipitation'+'_'+units_1,&#xd;&#xa;            'TotalRunon'+'_'+units_1,&#xd;&#xa;            'TotalEvaporation'+'_'+units_1,&#xd;&#xa;            'TotalInfiltration'+'_'+units_1,&#xd;&#xa;            'ImperviousRunoff'+'_'+units_1,&#xd;&#xa;            'PerviousRunoff'+'_'+units_1,&#xd;&#xa;            'TotalRunoff1'+'_'+units_1,&#xd;&#xa;            'TotalRunoff2'+'_'+units_2,&#xd;&#xa;            'PeakRunoff'+'_'+units_3,&#xd;&#xa;            'RunoffCoeffient'&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'subcatchment_washoff':&#xd;&#xa;        pol_names = header_lines[0].split()&#xd;&#xa;        pol_units = header_lines[1].split()[1:]&#xd;&#xa;        col_pol = [n+'_'+u for n, u in zip(pol_names, pol_units)]&#xd;&#xa;        cols = ['Name'] + col_pol&#xd;&#xa;    if topic == 'node_depth':&#xd;&#xa;        units_1 = get_header_val(header_lines, 2, 35, 6).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'Type',&#xd;&#xa;            'AverageDepth'+'_'+units_1,&#xd;&#xa;            'MaximumDepth'+'_'+units_1,&#xd;&#xa;            'MaximumHGL'+'_'+units_1,&#xd;&#xa;            'TimeOfMaxOccurrence_Days',&#xd;&#xa;            'TimeOfMaxOccurrence_HoursMin',&#xd;&#xa;            'MaxReportedDepth'+'_'+units_1&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'node_inflow':&#xd;&#xa;        units_1 = get_header_val(header_lines, 3, 38, 4).strip()&#xd;&#xa;        units_2 = get_header_val(header_lines, 3, 68, 8).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'Type',&#xd;&#xa;            'MaximumLateralInflow'+'_'+units_1,&#xd;&#xa;            'MaximumTotalInflow'+'_'+units_1,&#xd;&#xa;            'TimeOfMaxOccurrence_Days',&#xd;&#xa;            'TimeOfMaxOccurrence_HoursMin',&#xd;&#xa;            'LateralInflowVolume'+'_'+units_2,&#xd;&#xa;            'TotalInflowVolume'+'_'+units_2,&#xd;&#xa;            'FlowBalanceError_Pcnt',&#xd;&#xa;            'flag'&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'node_surcharge':&#xd;&#xa;        units_1 = get_header_val(header_lines, 2, 53, 6).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'Type',&#xd;&#xa;            'Surcharged_Hours',&#xd;&#xa;            'MaxHeightAboveCrown'+'_'+units_1,&#xd;&#xa;            'MinDepthBelowRim'+'_'+units_1&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'node_flooding':&#xd;&#xa;        units_1 = get_header_val(header_lines, 3, 38, 4).strip()&#xd;&#xa;        units_2 = get_header_val(header_lines, 3, 59, 9).strip()&#xd;&#xa;        units_3 = get_header_val(header_lines, 3, 69, 9).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'Flooded_Hours',&#xd;&#xa;            'MaximumRate'+'_'+units_1,&#xd;&#xa;            'TimeOfMaxOccurrence_Days',&#xd;&#xa;            'TimeOfMaxOccurrence_HoursMin',&#xd;&#xa;            'TotalFloodVolume'+'_'+units_2,&#xd;&#xa;            'MaximumPondedDepth'+'_'+units_3&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'storage_volume':&#xd;&#xa;        units_1 = get_header_val(header_lines, 2, 25, 9).strip()&#xd;&#xa;        units_2 = get_header_val(header_lines, 2, 93, 6).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'AverageVolume'+'_'+units_1,&#xd;&#xa;            'AvgFull_Pcnt',&#xd;&#xa;            'EvapLoss_Pcnt',&#xd;&#xa;            'ExfilLoss_Pcnt',&#xd;&#xa;            'MaximumVolume'+'_'+units_1,&#xd;&#xa;            'MaxFull_Pcnt',&#xd;&#xa;            'TimeOfMaxOccurrence_Days',&#xd;&#xa;            'TimeOfMaxOccurrence_HoursMin',&#xd;&#xa;            'MaximumOutflow'+'_'+units_2&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'outfall_loading':&#xd;&#xa;        head_tokens = header_lines[1].split()&#xd;&#xa;        units_1 = get_header_val(header_lines, 2, 36, 4).strip()&#xd;&#xa;        units_2 = get_header_val(header_lines, 2, 54, 9).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'FlowFreq_Pcnt',&#xd;&#xa;            'AvgFlow'+'_'+units_1,&#xd;&#xa;            'MaxFlow'+'_'+units_1,&#xd;&#xa;            'TotalVolume'+'_'+units_2&#xd;&#xa;        ]&#xd;&#xa;        if len(head_tokens) > 4:&#xd;&#xa;            header_unit_line = header_lines[2][60:]&#xd;&#xa;            header_unit_line = header_unit_line.strip()&#xd;&#xa;            pol_names = head_tokens[4:]&#xd;&#xa;            pol_units = header_unit_line.split()&#xd;&#xa;            col_pol = ['Total'+n+'_'+u for n, u in zip(pol_names, pol_units)]&#xd;&#xa;            cols = cols + col_pol&#xd;&#xa;    if topic == 'street_flow':&#xd;&#xa;        units_1 = get_header_val(header_lines, 3, 25, 4).strip()&#xd;&#xa;        units_2 = get_header_val(header_lines, 3, 37, 2).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'PeakFlow'+'_'+units_1,&#xd;&#xa;            'MaximumSpread'+'_'+units_2,&#xd;&#xa;            'MaximumDepth'+'_'+units_2,&#xd;&#xa;            'InletDesing',&#xd;&#xa;            'InletLocation',&#xd;&#xa;            'Inlet',&#xd;&#xa;            'PeakFlowCapture_Pcnt',&#xd;&#xa;            'AverageFlowCapture_Pcnt',&#xd;&#xa;            'BypassFlowFrequnecy_Pcnt',&#xd;&#xa;            'BackFlowFrequnecy_Pcnt',&#xd;&#xa;            'PeakCaptureInlet'+'_'+units_1,&#xd;&#xa;            'PeakBypassFlow'+'_'+units_1,&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'link_flow':&#xd;&#xa;        units_1 = get_header_val(header_lines, 2, 38, 4).strip()&#xd;&#xa;        units_2 = get_header_val(header_lines, 2, 58, 6).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'Type',&#xd;&#xa;            'MaximumFlow'+'_'+units_1,&#xd;&#xa;            'TimeOfMaxOccurrence_Days',&#xd;&#xa;            'TimeOfMaxOccurrence_HoursMin',&#xd;&#xa;            'MaximumVeloc'+'_'+units_2,&#xd;&#xa;            'MaxFullFlow',&#xd;&#xa;            'MaxFullDepth'&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'flow_classification': &#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'AdjustedActualLength',&#xd;&#xa;            'FractionOfTimeDry',&#xd;&#xa;            'FractionOfTimeUpDry',&#xd;&#xa;            'FractionOfTimeDownDry',&#xd;&#xa;            'FractionOfTimeSubCrit',&#xd;&#xa;            'FractionOfTimeSupCrit',&#xd;&#xa;            'FractionOfTimeUpCrit',&#xd;&#xa;            'FractionOfTimeDownCrit',&#xd;&#xa;            'FractionOfTimeNormLtd',&#xd;&#xa;            'FractionOfTimeInletCtrl'&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'conduit_surcharge': &#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'FullBothEnds_Hours',&#xd;&#xa;            'FullUpstream_Hours',&#xd;&#xa;            'FullDownstream_Hours',&#xd;&#xa;            'AboveFullNormalFlow_Hours',&#xd;&#xa;            'CapacityLimited_Hours',&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'pumping_summary':&#xd;&#xa;        units_1 = get_header_val(header_lines, 2, 51, 4).strip()&#xd;&#xa;        units_2 = get_header_val(header_lines, 2, 76, 9).strip()&#xd;&#xa;        units_3 = get_header_val(header_lines, 2, 89, 6).strip()&#xd;&#xa;        cols = [&#xd;&#xa;            'Name',&#xd;&#xa;            'Utilized_Pcnt',&#xd;&#xa;            'NumberOfStartups',&#xd;&#xa;            'MinFlow'+'_'+units_1,&#xd;&#xa;            'AverageFlow'+'_'+units_1,&#xd;&#xa;            'MaxFlow'+'_'+units_1,&#xd;&#xa;            'TotalVolume'+'_'+units_2,&#xd;&#xa;            'PowerUsage'+'_'+units_3,&#xd;&#xa;            'TimeBelowPumpCurve_Pcnt',&#xd;&#xa;            'TimeAbovePumpCurve_Pcnt'&#xd;&#xa;        ]&#xd;&#xa;    if topic == 'link_pollutant_load': &#xd;&#xa;        pol_names = header_lines[0].split()&#xd;&#xa;        pol_units = header_lines[1].split()[1:]&#xd;&#xa;        col_pol = [n+'_'+u for n, u in zip(pol_names, pol_units)]&#xd;&#xa;        cols = ['Name'] + col_pol&#xd;&#xa;    return cols&#xd;&#xa;&#xd;&#xa;def build_df_from_vals_list(section_vals, col_names):&#xd;&#xa;    &quot;&quot;&quot;&#xd;&#xa;    builds a dataframe for a section; &#xd;&#xa;    missing vals at the end are set as np.nan&#xd;&#xa;    :param list section_vals&#xd;&#xa;    :param list col_names&#xd;&#xa;    :return: pd.DataFrame&#xd;&#xa;    &quot;&quot;&quot;&#xd;&#xa;    df = pd.DataFrame(section_vals)&#xd;&#xa;    col_len = len(df.columns)&#xd;&#xa;    if col_names is None:&#xd;&#xa;        pass&#xd;&#xa;    else:&#xd;&#xa;        df.columns = col_names[0:col_len]&#xd;&#xa;        if len(col_names) > col_len:  # if missing vals in inp-data&#xd;&#xa;            for i in col_names[col_len:]:&#xd;&#xa;                df[i] = np.nan&#xd;&#xa;    return df&#xd;&#xa;    &#xd;&#xa;def find_rpt_section_position(i, rpt_line, rpt_text):&#xd;&#xa;    &quot;&quot;&quot;&#xd;&#xa;    finds report sections in a list of text lines&#xd;&#xa;    :param int i: index of the current text line&#xd;&#xa;    :param str rpt_line: current text line&#xd;&#xa;    :param list rpt_text&#xd;&#xa;    &quot;&quot;&quot;&#xd;&#xa;    line_list = rpt_line.split()&#xd;&#xa;    if i &lt;= (len(rpt_text)-2):&#xd;&#xa;        if line_list[0].startswith('**') and line_list[0].endswith('**'):&#xd;&#xa;            line_list_2 = rpt_text[i+2].split()&#xd;&#xa;            if line_list_2[0].startswith('**') and line_list_2[0].endswith('**'):&#xd;&#xa;                return (i+1)&#xd;&#xa;            else:&#xd;&#xa;                return 'NA'&#xd;&#xa;        else:&#xd;&#xa;            return 'NA'&#xd;&#xa;    else:&#xd;&#xa;        return 'NA'&#xd;&#xa;&#xd;&#xa;def get_rpt_df(topic, readfile):&#xd;&#xa;    rpt_section_title = dict_report_line_sects[topic]&#xd;&#xa;    rpt_text = get_rpt_txt(readfile)&#xd;&#xa;    if rpt_section_title in rpt_text:&#xd;&#xa;        startpos = rpt_text.index(rpt_section_title)&#xd;&#xa;        rpt_text_trimmed = rpt_text[startpos:]&#xd;&#xa;        separation_lines_0 = [i for i, l in enumerate(rpt_text_trimmed) if l.startswith('**') and l.endswith('**')]&#xd;&#xa;        if len(separation_lines_0) != 1:&#xd;&#xa;            #last item&#xd;&#xa;            endpos = separation_lines_0[1]&#xd;&#xa;            sect_lines = rpt_text_trimmed[:endpos]&#xd;&#xa;        else:&#xd;&#xa;            sect_lines = rpt_text_trimmed&#xd;&#xa;        separation_lines = [i for i, l in enumerate(sect_lines) if l.startswith('--') and l.endswith('--')]&#xd;&#xa;        if len(separation_lines) == 2:&#xd;&#xa;            # without Summary&#xd;&#xa;            separation_lines = separation_lines+[len(sect_lines)]&#xd;&#xa;        sect_lines_vals = sect_lines[(separation_lines[1]+1):separation_lines[2]]&#xd;&#xa;        sect_lines_vals = [x.split() for x in sect_lines_vals]&#xd;&#xa;        header_lines = sect_lines[(separation_lines[0]+1):separation_lines[1]]&#xd;&#xa;        col_names = get_dict_report_cols(topic, header_lines)&#xd;&#xa;        df = build_df_from_vals_list(&#xd;&#xa;            sect_lines_vals,&#xd;&#xa;            col_names&#xd;&#xa;        )&#xd;&#xa;        return df&#xd;&#xa;    else:&#xd;&#xa;        return(pd.DataFrame())&#xd;&#xa;&#xd;&#xa;&#xd;&#xa;# candidate encodings in the order of preference&#xd;&#xa;def_encodings = ('utf-8', 'windows-1250', 'windows-1252')&#xd;&#xa;&#xd;&#xa;&#xd;&#xa;def get_file_encoding(file_path, encodings=def_encodings, sample_size=2**16):&#xd;&#xa;    &quot;&quot;&quot;&#xd;&#xa;    detects the encoding of a text file from a sample at the beginning&#xd;&#xa;    of the file; the first candidate which decodes the sample is returned&#xd;&#xa;    (same as get_file_encoding in g_s_inp_sections.py)&#xd;&#xa;    &quot;&quot;&quot;&#xd;&#xa;    with open(file_path, 'rb') as f:&#xd;&#xa;        sample = f.read(sample_size)&#xd;&#xa;    # a character may be cut at the end of the sample&#xd;&#xa;    is_whole_file = os.path.getsize(file_path) &lt;= sample_size&#xd;&#xa;    for encoding in encodings:&#xd;&#xa;        try:&#xd;&#xa;            codecs.getincrementaldecoder(encoding)().decode(sample, final=is_whole_file)&#xd;&#xa;        except UnicodeDecodeError:&#xd;&#xa;            continue&#xd;&#xa;        return encoding&#xd;&#xa;    return None&#xd;&#xa;&#xd;&#xa;&#xd;&#xa;def get_next_encoding(encoding, encodings=def_encodings):&#xd;&#xa;    &quot;&quot;&quot;&#xd;&#xa;    returns the candidate after encoding or None&#xd;&#xa;    (same as get_next_encoding in g_s_inp_sections.py)&#xd;&#xa;    &quot;&quot;&quot;&#xd;&#xa;    if encoding not in encodings:&#xd;&#xa;        return None&#xd;&#xa;    encoding_pos = encodings.index(encoding)&#xd;&#xa;    if encoding_pos + 1 == len(encodings):&#xd;&#xa;        return None&#xd;&#xa;    return encodings[encoding_pos + 1]&#xd;&#xa;&#xd;&#xa;&#xd;&#xa;def get_rpt_txt(readfile):&#xd;&#xa;    # the encoding is detected from the beginning of the file; if a later&#xd;&#xa;    # line can not be decoded, the next candidate is used from there on&#xd;&#xa;    rpt_encoding = get_file_encoding(readfile)&#xd;&#xa;    if rpt_encoding is None:&#xd;&#xa;        raise ValueError('The encoding of the report file could not be detected')&#xd;&#xa;    rpt_text = []&#xd;&#xa;    with open(readfile, 'rb') as f:&#xd;&#xa;        for rpt_line in f:&#xd;&#xa;            while True:&#xd;&#xa;                try:&#xd;&#xa;                    rpt_line_text = rpt_line.decode(rpt_encoding).strip()&#xd;&#xa;                    break&#xd;&#xa;                except UnicodeDecodeError:&#xd;&#xa;                    rpt_encoding = get_next_encoding(rpt_encoding)&#xd;&#xa;                    if rpt_encoding is None:&#xd;&#xa;                        raise&#xd;&#xa;            if len(rpt_line_text) > 0:&#xd;&#xa;                rpt_text.append(rpt_line_text)&#xd;&#xa;    # delete last three lines of the file (information on start and end time)&#xd;&#xa;    rpt_text = rpt_text[:-3]&#xd;&#xa;    return rpt_text&#xd;&#xa;&#xd;&#xa;# third dialog&#xd;&#xa;class saveCsvDialog(QDialog):&#xd;&#xa;    def __init__(self, parent):&#xd;&#xa;        QDialog.__init__(self, parent)&#xd;&#xa;        self.setWindowTitle('Save table section as CSV')&#xd;&#xa;        self.df = parent.df&#xd;&#xa;        self.topic = parent.topic&#xd;&#xa;        self.layout = QVBoxLayout()&#xd;&#xa;&#xd;&#xa;        # path&#xd;&#xa;        self.label_CsvFile = QLabel('Resulting CSV file')&#xd;&#xa;        self.layout.addWidget(self.label_CsvFile)&#xd;&#xa;        self.CsvFile = QgsFileWidget()&#xd;&#xa;        self.CsvFile.setFilter('CSV files (*.csv)')&#xd;&#xa;        self.CsvFile.setStorageMode(3)&#xd;&#xa;        self.layout.addWidget(self.CsvFile)&#xd;&#xa;&#xd;&#xa;        # checkbox&#xd;&#xa;        self.addcheckbox = QCheckBox('add resulting CSV file to Project')&#xd;&#xa;        self.addcheckbox.setChecked(True)&#xd;&#xa;&#xd;&#xa;        # OK/Cancel-Buttons&#xd;&#xa;        btn2 = QDialogButtonBox.Ok | QDialogButtonBox.Cancel&#xd;&#xa;        self.buttonBox = QDialogButtonBox(btn2)&#xd;&#xa;        self.buttonBox.accepted.connect(self.save_csv_action)&#xd;&#xa;        self.buttonBox.rejected.connect(self.close)&#xd;&#xa;&#xd;&#xa;        self.layout.addWidget(self.addcheckbox)&#xd;&#xa;        self.layout.addWidget(self.buttonBox)&#xd;&#xa;        self.setLayout(self.layout)&#xd;&#xa;&#xd;&#xa;    def closeaction(self):&#xd;&#xa;        self.close()&#xd;&#xa;&#xd;&#xa;    def save_csv_action(self):&#xd;&#xa;        csvpath = self.CsvFile.filePath()&#xd;&#xa;        if csvpath=='':&#xd;&#xa;            QtWidgets.QMessageBox.information(&#xd;&#xa;                None,&#xd;&#xa;                &quot;Warning&quot;,&#xd;&#xa;                'Resulting CSV file can`t be empty. Please select a file'&#xd;&#xa;            )&#xd;&#xa;        else:&#xd;&#xa;            self.df.to_csv(csvpath, index=False)&#xd;&#xa;            self.add_to_project = self.addcheckbox.isChecked()&#xd;&#xa;            if self.add_to_project:&#xd;&#xa;                showname = self.topic+' ('+os.path.split(csvpath)[1]+')'&#xd;&#xa;                csv_layer = QgsVectorLayer(csvpath, showname , 'ogr')&#xd;&#xa;                QgsProject.instance().addMapLayer(csv_layer)&#xd;&#xa;            QtWidgets.QMessageBox.information(&#xd;&#xa;                None,&#xd;&#xa;                &quot;Info&quot;,&#xd;&#xa;                'Report data was saved in '+ csvpath&#xd;&#xa;            )&#xd;&#xa;            self.closeaction()&#xd;&#xa;&#xd;&#xa;&#xd;&#xa;# second dialog&#xd;&#xa;class showTableDialog(QDialog):&#xd;&#xa;    def __init__(self, parent):&#xd;&#xa;        QDialog.__init__(self, parent)&#xd;&#xa;        self.topic = parent.topic&#xd;&#xa;        self.setWindowTitle(self.topic)&#xd;&#xa;        self.df = parent.df&#xd;&#xa;        self.layout = QVBoxLayout()&#xd;&#xa;        self.tableWidget = QTableWidget()&#xd;&#xa;        self.tableWidget.setColumnCount(&#xd;&#xa;            len(self.df.columns)&#xd;&#xa;        )&#xd;&#xa;        self.tableWidget.setRowCount(&#xd;&#xa;            len(self.df.index)&#xd;&#xa;        )&#xd;&#xa;        self.tableWidget.setSortingEnabled(True)&#xd;&#xa;        if any([x in feat_names for x in self.df['Name']]):&#xd;&#xa;            self.infotext = QLabel(&#xd;&#xa;                'Features of the current layer are highlighted in yellow'&#xd;&#xa;            )&#xd;&#xa;        else:&#xd;&#xa;            self.infotext = QLabel(&#xd;&#xa;                'No features of current layer were found in this report section!'&#xd;&#xa;            )&#xd;&#xa;        self.layout.addWidget(self.infotext)&#xd;&#xa;        for i in self.df.index:&#xd;&#xa;            val0 = self.df['Name'][i]&#xd;&#xa;            for j, col in enumerate(self.df.columns):&#xd;&#xa;                val = self.df[col][i]&#xd;&#xa;                item1 = QTableWidgetItem(str(val))&#xd;&#xa;                item1.setFlags(Qt.ItemIsEditable)&#xd;&#xa;                if val0 in feat_names:&#xd;&#xa;                    item1.setBackground(QColor('yellow'))&#xd;&#xa;                self.tableWidget.setItem(i, j, item1)&#xd;&#xa;        self.tableWidget.setHorizontalHeaderLabels(&#xd;&#xa;            list(self.df.columns)&#xd;&#xa;        )&#xd;&#xa;&#xd;&#xa;        # button to save csv&#xd;&#xa;        self.button_save = QPushButton('Close and save table as CSV')&#xd;&#xa;        self.button_save.clicked.connect(self.open_save_csv)&#xd;&#xa;        self.layout.addWidget(self.button_save)&#xd;&#xa;        self.layout.addWidget(self.tableWidget)&#xd;&#xa;        self.setLayout(self.layout)&#xd;&#xa;&#xd;&#xa;    def open_save_csv(self):&#xd;&#xa;        self.w3 = saveCsvDialog(self)&#xd;&#xa;        self.w3.show()&#xd;&#xa;        self.close()&#xd;&#xa;&#xd;&#xa;# main dialog&#xd;&#xa;class joinSwmmReportDialog(QDialog):&#xd;&#xa;    def __init__(self, parent=None):&#xd;&#xa;        &quot;&quot;&quot;Constructor.&quot;&quot;&quot;&#xd;&#xa;        super(joinSwmmReportDialog, self).__init__(parent)&#xd;&#xa;        # Drop-down-Listen und Labels&#xd;&#xa;        QDialog.__init__(self, parent)&#xd;&#xa;        self.layout = QVBoxLayout()&#xd;&#xa;        self.setWindowTitle('Get results from SWMM report file')&#xd;&#xa;&#xd;&#xa;        # swmm rpt file&#xd;&#xa;        self.label_SwmmRptFile = QLabel('SWMM report File')&#xd;&#xa;        self.swmmRptFile = QgsFileWidget() #rpt&#xd;&#xa;        self.swmmRptFile.setFilter('SWMM report files (*.rpt)')&#xd;&#xa;        self.layout.addWidget(self.label_SwmmRptFile)&#xd;&#xa;        self.layout.addWidget(self.swmmRptFile)&#xd;&#xa;        &#xd;&#xa;        if swmm_type in ['NODES','LINKS']:&#xd;&#xa;            #swmm obj type&#xd;&#xa;            self.label_swmmobj_selBox = QLabel('SWMM layer type')&#xd;&#xa;            self.swmmobj_selBox = QComboBox()&#xd;&#xa;            self.swmmobj_list = list(select_dict[swmm_type].keys())&#xd;&#xa;            self.swmmobj_selBox.addItems(self.swmmobj_list)&#xd;&#xa;            self.swmmobj_selBox.setCurrentIndex(0)&#xd;&#xa;            self.swmm_obj = self.swmmobj_selBox.currentText()&#xd;&#xa;            self.swmmobj_selBox.currentIndexChanged.connect(self.update_topic_box)&#xd;&#xa;            self.layout.addWidget(self.label_swmmobj_selBox)&#xd;&#xa;            self.layout.addWidget(self.swmmobj_selBox)&#xd;&#xa;&#xd;&#xa;            &#xd;&#xa;            self.label_topic_selBox = QLabel('SWMM report topic')&#xd;&#xa;            self.topic_selBox = QComboBox()&#xd;&#xa;            self.topic_list = list(select_dict[swmm_type][self.swmm_obj])&#xd;&#xa;            self.topic_selBox.addItems(self.topic_list)&#xd;&#xa;            self.topic_selBox.setCurrentIndex(0)&#xd;&#xa;            self.layout.addWidget(self.label_topic_selBox)&#xd;&#xa;            self.layout.addWidget(self.topic_selBox)&#xd;&#xa;        elif swmm_type == 'SUBCATCHMENTS':&#xd;&#xa;            self.label_topic_selBox = QLabel('SWMM report topic')&#xd;&#xa;            self.topic_selBox = QComboBox()&#xd;&#xa;            self.topic_list = list(select_dict[swmm_type])&#xd;&#xa;            self.topic_selBox.addItems(self.topic_list)&#xd;&#xa;            self.topic_selBox.setCurrentIndex(0)&#xd;&#xa;            self.layout.addWidget(self.label_topic_selBox)&#xd;&#xa;            self.layout.addWidget(self.topic_selBox)&#xd;&#xa;        else:&#xd;&#xa;            QtWidgets.QMessageBox.information(&#xd;&#xa;                None,&#xd;&#xa;                &quot;Warning&quot;,&#xd;&#xa;                'No suitable data can be accessed'&#xd;&#xa;            )&#xd;&#xa;            self.close()&#xd;&#xa;        &#xd;&#xa;        # OK/Cancel-Buttons&#xd;&#xa;        btn = QDialogButtonBox.Ok | QDialogButtonBox.Cancel&#xd;&#xa;        self.buttonBox = QDialogButtonBox(btn)&#xd;&#xa;        self.buttonBox.accepted.connect(self.join_report_vals)&#xd;&#xa;        self.buttonBox.rejected.connect(self.close)&#xd;&#xa;        self.buttonBox.clicked.connect(self.close)&#xd;&#xa;        self.layout.addWidget(self.buttonBox)&#xd;&#xa;        self.setLayout(self.layout)&#xd;&#xa;&#xd;&#xa;    def update_topic_box(self):&#xd;&#xa;        self.topic_selBox.clear()&#xd;&#xa;        self.swmm_obj = self.swmmobj_selBox.currentText()&#xd;&#xa;        self.topic_list_neu = list(select_dict[swmm_type][self.swmm_obj])&#xd;&#xa;        self.topic_selBox.addItems(self.topic_list_neu)&#xd;&#xa;        self.topic_selBox.setCurrentIndex(0)&#xd;&#xa;    &#xd;&#xa;    def join_report_vals(self):&#xd;&#xa;        self.topic = self.topic_selBox.currentText()&#xd;&#xa;        readfile = self.swmmRptFile.filePath()&#xd;&#xa;        if readfile=='':&#xd;&#xa;            QtWidgets.QMessageBox.information(&#xd;&#xa;                None,&#xd;&#xa;                &quot;Warning&quot;,&#xd;&#xa;                'SWMM report file can`t be empty. Please select a file'&#xd;&#xa;            )&#xd;&#xa;            w.show()&#xd;&#xa;        else:&#xd;&#xa;            self.df = get_rpt_df(self.topic, readfile)&#xd;&#xa;            if len(self.df) == 0:&#xd;&#xa;                QtWidgets.QMessageBox.information(&#xd;&#xa;                None,&#xd;&#xa;                &quot;Warning&quot;,&#xd;&#xa;                'This report section is not available in the chosen report file. Please select another report file or topic'&#xd;&#xa;                )&#xd;&#xa;                w.show()&#xd;&#xa;            else:&#xd;&#xa;                w2 = showTableDialog(self)&#xd;&#xa;                w2.show()&#xd;&#xa;&#xd;&#xa;if layer_geom in swmm_geom_types.keys():&#xd;&#xa;    swmm_type = swmm_geom_types[layer_geom]&#xd;&#xa;    w = joinSwmmReportDialog()&#xd;&#xa;    w.show()&#xd;&#xa;else:&#xd;&#xa;    QtWidgets.QMessageBox.information(None,&quot;Info&quot;, 'Cannot show results for this data type')" type="1" capture="0" shortTitle="Get results from report file" isEnabledOnlyWhenEditable="0" id="{c1a5565f-ccac-4086-a6b2-621ef3e8b795}" name="get_report" icon="" notificationMessage="">
       <actionScope id="Layer"/>
       <actionScope id="Canvas"/>
       <actionScope id="Form"/>